@@ -13,12 +13,18 @@ import sys
 import os
 import re
 import csv
+import hashlib
 import io
 import logging
 import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain, compress, islice
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
 import streamlit as st
 
 # Add orchestrator to path so imports work when run from project root
@@ -26,8 +32,18 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 import json
 
+try:
+    import orjson  # optional: faster parsing of large AI responses
+except ImportError:
+    orjson = None
+
 from config import OUTPUT_DIR, DATA_DIR, PROJECT_ROOT, HUNTER_API_KEY, FINDYMAIL_API_KEY
 import db
+from agent import CompanyListingAgent, ResearcherFinderAgent, EmailFinderAgent, ColdMailAgent
+from claude_client import ClaudeClient
+from findymail_client import FindymailClient
+from hunter_client import HunterClient, _KNOWN_DOMAINS, _KNOWN_DOMAINS_RE
+from research_client import ResearchClient
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -35,35 +51,99 @@ logger = logging.getLogger(__name__)
 _TARGET_FEEDBACK_PATH = DATA_DIR / "target_feedback_log.md"
 
 
-def _append_target_feedback(feedback: str, product_summary: str = ""):
-    """Append target-finding feedback to persistent log file."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    entry = f"\n- [{timestamp}] "
-    if product_summary:
-        entry += f"({product_summary}) "
-    entry += feedback.strip()
-    with open(_TARGET_FEEDBACK_PATH, "a", encoding="utf-8") as f:
-        f.write(entry + "\n")
+def _queue_feedback_delete(entry: str):
+    """Button callback: mark a file-log feedback entry for deletion on the next pass."""
+    st.session_state.setdefault("_pending_fb_deletes", set()).add(entry)
 
 
 def _rewrite_feedback_log(entries: list[str]):
     """Rewrite the feedback log with the given entries (for delete/clear)."""
+    global _run_feedback_hash
+    _run_feedback_hash = None
     header = "# 타겟 발굴 피드백 로그\n\n이 파일에 누적된 피드백은 AI 타겟 추천 시 항상 반영됩니다.\n"
     body = "\n".join(entries) + "\n" if entries else ""
     with open(_TARGET_FEEDBACK_PATH, "w", encoding="utf-8") as f:
         f.write(header + body)
 
 
-def _get_feedback_hash() -> str:
-    """Return a short hash of the current feedback log content."""
-    import hashlib
+_EMPTY_FEEDBACK_HASH = hashlib.md5(b"").hexdigest()[:12]
+
+
+# Every feedback write makes a new (mtime_ns, size) key; only the latest ones
+# can be looked up again, so keep a handful rather than one entry per write.
+@st.cache_data(max_entries=8, show_spinner=False)
+def _feedback_hash_for(mtime_ns: int, size: int) -> str:
+    """Hash the feedback log; (mtime_ns, size) is the cache key, so reruns skip the read."""
     try:
         content = _TARGET_FEEDBACK_PATH.read_text(encoding="utf-8").strip()
     except FileNotFoundError:
-        content = ""
+        return _EMPTY_FEEDBACK_HASH
     return hashlib.md5(content.encode()).hexdigest()[:12]
 
 
+# Module globals are reset on every script run, so this memo lives for one rerun
+_run_feedback_hash: str | None = None
+
+
+def _get_feedback_hash() -> str:
+    """Return a short hash of the current feedback log content."""
+    global _run_feedback_hash
+    if _run_feedback_hash is None:
+        try:
+            stat = _TARGET_FEEDBACK_PATH.stat()
+        except FileNotFoundError:
+            _run_feedback_hash = _EMPTY_FEEDBACK_HASH
+        else:
+            _run_feedback_hash = _feedback_hash_for(stat.st_mtime_ns, stat.st_size)
+    return _run_feedback_hash
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _file_feedback_for(mtime_ns: int, size: int) -> list[str]:
+    """Parse '- [...]' entries from the feedback log; keyed like _feedback_hash_for."""
+    try:
+        raw = _TARGET_FEEDBACK_PATH.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    return [s for s in (line.strip() for line in raw.splitlines()) if s.startswith("- [")]
+
+
+def _load_file_feedback() -> list[str]:
+    """Entries of the legacy file-based feedback log (a fresh list per call)."""
+    try:
+        stat = _TARGET_FEEDBACK_PATH.stat()
+    except FileNotFoundError:
+        return []
+    return _file_feedback_for(stat.st_mtime_ns, stat.st_size)
+
+
+@st.cache_resource(show_spinner=False)
+def _agent_log_dir() -> Path:
+    """Create the agent log directory once per process."""
+    log_dir = Path(__file__).resolve().parent.parent / "output"
+    log_dir.mkdir(exist_ok=True)
+    return log_dir
+
+
+# Tool-name → input keys used for the status/log detail, first non-empty wins
+_DETAIL_KEYS = {
+    "search_queries": ("queries",),
+    "search_web": ("query",),
+    "fetch_webpage": ("url",),
+    "read_file": ("filename",),
+    "findymail_search": ("name", "domain"),
+    "findymail_linkedin": ("linkedin_url",),
+    "hunter_domain_search": ("domain", "company_name"),
+    "hunter_find_email": ("domain",),
+    "hunter_verify_email": ("email",),
+    "whois_lookup": ("domain",),
+    "save_draft_email": ("contact_name", "company"),
+    "finalize_campaign": ("campaign_name",),
+    "upload_to_sheets": ("campaign_name",),
+}
+_DEFAULT_DETAIL_KEYS = ("query", "company", "name", "domain", "contact_name", "url", "filename")
+
+
 class AgentProgressTracker:
     """Tracks agent progress via tool call callbacks and renders st.progress()."""
 
@@ -100,27 +180,31 @@ class AgentProgressTracker:
         },
     }
 
+    LOG_TAIL = 12  # lines shown in the live log area
+    LOG_KEEP = 2000  # lines kept in memory for tool_log; the log file has them all
+
     def __init__(self, agent_type: str, total_items: int = 0):
         self.agent_type = agent_type
         self.total_items = total_items  # companies or contacts
         self.tool_calls = 0
         self.item_count = 0  # tracks save_draft_email / per-company tools
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self._items_fmt = f" ({{}}/{total_items})" if total_items > 0 else None
         self.stage_map = self.STAGE_MAP.get(agent_type, {})
         self._progress_bar = st.progress(0)
         self._status = st.empty()
         self._log_area = st.empty()
-        self._tool_log: list[str] = []
-        self._current_progress = 0.0
+        self._tool_log: deque[str] = deque(maxlen=self.LOG_KEEP)  # exposed via tool_log
+        self._recent_log: deque[str] = deque(maxlen=self.LOG_TAIL)
+        # Callbacks only mutate `state`; _render() pushes the fields that changed
+        self.state = {"progress": 0.0, "status": "", "log_tail": ""}
+        self._rendered = dict(self.state)
+        self._visible = True  # False → state/log still update, widgets don't
 
         # File-based logging
-        from pathlib import Path
-        log_dir = Path(__file__).resolve().parent.parent / "output"
-        log_dir.mkdir(exist_ok=True)
-        self._log_file = log_dir / f"{agent_type}_{time.strftime('%y%m%d_%H%M%S')}.log"
-        self._log_fh = open(self._log_file, "w", encoding="utf-8")
-        self._log_fh.write(f"=== {agent_type} started at {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-        self._log_fh.flush()
+        self._log_file = _agent_log_dir() / f"{agent_type}_{time.strftime('%y%m%d_%H%M%S')}.log"
+        self._log_header = f"=== {agent_type} started at {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n"
+        self._log_fh = None  # opened on first write
 
     def on_tool_call(self, name: str, input_data: dict):
         self.tool_calls += 1
@@ -150,70 +234,100 @@ class AgentProgressTracker:
         else:
             pct = min(0.05 + self.tool_calls * 0.04, 0.88)
 
-        self._current_progress = max(self._current_progress, pct)
-        self._progress_bar.progress(self._current_progress)
+        self.state["progress"] = max(self.state["progress"], pct)
 
         # Status text
-        detail = (
-            input_data.get("query")
-            or input_data.get("company")
-            or input_data.get("name")
-            or input_data.get("domain")
-            or input_data.get("contact_name")
-            or input_data.get("url", "")[:60]
-            or input_data.get("filename")
-            or str(input_data)[:50]
+        keys = _DETAIL_KEYS.get(name, _DEFAULT_DETAIL_KEYS)
+        detail = next(
+            (str(input_data[k])[:60] for k in keys if input_data.get(k)),
+            str(input_data)[:50],
         )
-        elapsed = int(time.time() - self.start_time)
-        items_text = ""
-        if self.total_items > 0 and self.item_count > 0:
-            items_text = f" ({self.item_count}/{self.total_items})"
-        self._status.info(f"⏱ {elapsed}초 | {label}{items_text} — {detail}")
+        elapsed = int(time.monotonic() - self.start_time)
+        items_text = self._items_fmt.format(self.item_count) if self._items_fmt and self.item_count else ""
+        self.state["status"] = f"⏱ {elapsed}초 | {label}{items_text} — {detail}"
 
         # Tool log
-        log_line = f"[{elapsed:>3}s] {label}: {detail}"
-        self._tool_log.append(log_line)
-        self._write_log(log_line)
-        self._log_area.code("\n".join(self._tool_log[-12:]), language=None)
+        self._append_log(f"[{elapsed:>3}s] {label}: {detail}")
 
     def on_tool_result(self, name: str, result_preview: str):
-        log_line = f"       ✓ {name} → {result_preview[:150]}"
-        self._tool_log.append(log_line)
-        self._write_log(log_line)
-        self._log_area.code("\n".join(self._tool_log[-12:]), language=None)
+        self._append_log(f"       ✓ {name} → {result_preview[:150]}")
 
     def on_text(self, text: str):
         if text.strip():
-            log_line = f"  💬 {text[:200]}"
-            self._tool_log.append(log_line)
-            self._write_log(log_line)
-            self._log_area.code("\n".join(self._tool_log[-12:]), language=None)
+            self._append_log(f"  💬 {text[:200]}")
+
+    def attach(self):
+        """Create fresh widgets in the current (fragment) run and draw the latest state.
+
+        Used when the agent runs on a worker thread and a later rerun polls it;
+        the widgets made by __init__ belong to the run that started it.
+        """
+        self._progress_bar = st.progress(self.state["progress"])
+        self._status = st.empty()
+        self._log_area = st.empty()
+        self._rendered = {"progress": self.state["progress"], "status": "", "log_tail": ""}
+        self._render()
+
+    def pause_rendering(self):
+        """Stop pushing widget updates; progress and logs keep accumulating."""
+        self._visible = False
+
+    def resume_rendering(self):
+        """Resume widget updates and redraw the latest state once."""
+        self._visible = True
+        self._render()
+
+    def _append_log(self, line: str):
+        """Record a log line and redraw if visible."""
+        self._tool_log.append(line)
+        self._recent_log.append(line)
+        self._write_log(line)
+        self.state["log_tail"] = "\n".join(self._recent_log)
+        if self._visible:
+            self._render()
+
+    def _render(self):
+        """Push only the state fields that changed since the last render."""
+        state, rendered = self.state, self._rendered
+        if state["progress"] != rendered["progress"]:
+            self._progress_bar.progress(state["progress"])
+        if state["status"] and state["status"] != rendered["status"]:
+            self._status.info(state["status"])
+        if state["log_tail"] != rendered["log_tail"]:
+            self._log_area.code(state["log_tail"], language=None)
+        self._rendered = dict(state)
 
     def _write_log(self, line: str):
-        """Write to log file."""
+        """Write to log file (buffered; flushed on complete/fail)."""
         try:
+            if self._log_fh is None:
+                self._log_fh = open(self._log_file, "w", encoding="utf-8", buffering=65536)
+                self._log_fh.write(self._log_header)
             self._log_fh.write(line + "\n")
-            self._log_fh.flush()
         except Exception:
             pass
 
     def complete(self, message: str):
-        elapsed = int(time.time() - self.start_time)
+        elapsed = int(time.monotonic() - self.start_time)
+        self._visible = True
+        self._render()
         self._progress_bar.progress(1.0)
         self._status.success(f"✅ {message} (⏱ {elapsed}초, 도구 {self.tool_calls}회)")
         self._write_log(f"=== COMPLETED: {message} ({elapsed}s, {self.tool_calls} tool calls) ===")
-        try:
-            self._log_fh.close()
-        except Exception:
-            pass
+        self._close_log()
 
     def fail(self, error: str):
-        elapsed = int(time.time() - self.start_time)
-        self._progress_bar.progress(self._current_progress)
+        elapsed = int(time.monotonic() - self.start_time)
+        self._visible = True
+        self._render()
         self._status.error(f"❌ {error} (⏱ {elapsed}초)")
         self._write_log(f"=== FAILED: {error} ({elapsed}s) ===")
+        self._close_log()
+
+    def _close_log(self):
         try:
-            self._log_fh.close()
+            if self._log_fh is not None:
+                self._log_fh.close()
         except Exception:
             pass
 
@@ -226,6 +340,84 @@ class AgentProgressTracker:
         return list(self._tool_log)
 
 
+# Cross-check verdict / external verification status → display strings
+_VERDICT_ICON = {"confirmed": "+", "partial": "~", "unverified": "?", "wrong": "X"}
+_VERDICT_LABEL = {"confirmed": "확인됨", "partial": "일부 확인", "unverified": "미검증", "wrong": "불일치"}
+_VERDICT_EMOJI = {"confirmed": "✅", "partial": "⚠️", "unverified": "❓", "wrong": "❌"}
+_VERIF_ICON = {"verified": "+", "partial": "~", "no_data": "-"}
+_VERIF_LABEL = {"verified": "검증됨", "partial": "일부 확인", "no_data": "데이터 없음"}
+
+
+def _log_text(state_key: str) -> str:
+    """Stored agent log (list of lines) joined for display, memoized on the list's identity."""
+    lines = st.session_state.get(state_key) or []
+    memo = st.session_state.setdefault("_log_text_memo", {})
+    hit = memo.get(state_key)
+    if hit is None or hit[0] is not lines:
+        hit = memo[state_key] = (lines, "\n".join(lines))
+    return hit[1]
+
+
+def _queue_tier_op(parsed_key: str, src: str, dst: str | None, name: str):
+    """Button callback: queue moving `name` from tier list src to dst (None = delete).
+
+    Ops run before the next script pass, so a click costs one rerun, and they
+    match by name so rapid clicks can't act on a shifted index. A repeat of an
+    op that is already queued (double click) is dropped.
+    """
+    ops = st.session_state.setdefault("_pending_tier_ops", [])
+    op = (parsed_key, src, dst, name)
+    if op not in ops:
+        ops.append(op)
+
+
+def _apply_tier_ops(parsed_key: str):
+    """Apply queued tier ops for the parsed result stored at session key parsed_key.
+
+    The dict is mutated in place, so anything holding st.session_state[parsed_key]
+    (including a fragment's bound argument) sees the new tiers without a re-parse.
+    """
+    ops = st.session_state.get("_pending_tier_ops")
+    if not ops:
+        return
+    parsed = st.session_state.get(parsed_key) or {}
+    remaining = []
+    applied = False
+    for op in ops:
+        if op[0] != parsed_key:
+            remaining.append(op)
+            continue
+        applied = True
+        _, src, dst, name = op
+        src_list = parsed.get(src, [])
+        idx = next((i for i, item in enumerate(src_list) if item.get("name") == name), None)
+        if idx is not None:
+            item = src_list.pop(idx)
+            if dst:
+                parsed.setdefault(dst, []).append(item)
+    st.session_state._pending_tier_ops = remaining
+    if applied:
+        versions = st.session_state.setdefault("_tier_versions", {})
+        versions[parsed_key] = versions.get(parsed_key, 0) + 1
+
+
+def _verification_by_name(state_key: str) -> dict:
+    """Name -> verification data for the list stored at session key state_key.
+
+    The index is kept in session state next to the list it was built from and
+    rebuilt only when that list object is replaced (new run, memo restore, reset).
+    """
+    entries = st.session_state.get(state_key)
+    if not entries:
+        return {}
+    cache = st.session_state.setdefault("_verification_index", {})
+    hit = cache.get(state_key)
+    if hit is None or hit[0] is not entries:
+        hit = (entries, {e.get("name", ""): e.get("verification", {}) for e in entries})
+        cache[state_key] = hit
+    return hit[1]
+
+
 def _render_company_card(company: dict, verification: dict | None, verdict: dict | None = None):
     """Render a company card with optional verification data and cross-check verdict."""
     name = company["name"]
@@ -234,32 +426,31 @@ def _render_company_card(company: dict, verification: dict | None, verdict: dict
     # Status icon based on verdict (if available) or verification
     if verdict:
         v_status = verdict.get("verdict", "unverified")
-        icon = {"confirmed": "+", "partial": "~", "unverified": "?", "wrong": "X"}.get(v_status, "?")
-        label = {"confirmed": "확인됨", "partial": "일부 확인", "unverified": "미검증", "wrong": "불일치"}.get(v_status, "?")
+        icon = _VERDICT_ICON.get(v_status, "?")
+        label = _VERDICT_LABEL.get(v_status, "?")
         header = f"[{icon}] **{name}** — {reason}  `{label}`"
     elif verification:
         status = verification.get("status", "no_data")
-        icon = {"verified": "+", "partial": "~", "no_data": "-"}.get(status, "?")
-        label = {"verified": "검증됨", "partial": "일부 확인", "no_data": "데이터 없음"}.get(status, "?")
+        icon = _VERIF_ICON.get(status, "?")
+        label = _VERIF_LABEL.get(status, "?")
         header = f"[{icon}] **{name}** — {reason}  `{label}`"
     else:
         header = f"**{name}** — {reason}"
 
     with st.expander(header, expanded=False):
-        # AI's claimed evidence
-        st.markdown(f"**AI 근거:** {company.get('evidence', reason)}")
+        # AI evidence, tier reason and cross-check verdict go out as one markdown element
+        lines = [f"**AI 근거:** {company.get('evidence', reason)}"]
 
-        # Tier classification reason
         _tier_reason = company.get("tier_reason", "")
         if _tier_reason:
-            st.markdown(f"**Tier 산정:** {_tier_reason}")
+            lines.append(f"**Tier 산정:** {_tier_reason}")
 
-        # Cross-check verdict (the key new feature)
         if verdict and verdict.get("explanation"):
             v_status = verdict.get("verdict", "unverified")
-            color = {"confirmed": "green", "partial": "orange", "unverified": "gray", "wrong": "red"}.get(v_status, "gray")
-            emoji = {"confirmed": "✅", "partial": "⚠️", "unverified": "❓", "wrong": "❌"}.get(v_status, "❓")
-            st.markdown(f"{emoji} **교차검증:** {verdict['explanation']}")
+            emoji = _VERDICT_EMOJI.get(v_status, "❓")
+            lines.append(f"{emoji} **교차검증:** {verdict['explanation']}")
+
+        st.markdown("\n\n".join(lines))
 
         # Verification data
         if verification:
@@ -269,10 +460,10 @@ def _render_company_card(company: dict, verification: dict | None, verdict: dict
                 # Web search results
                 web_results = verification.get("web_results", [])
                 if web_results:
-                    st.markdown("**웹 검색:**")
-                    for wr in web_results[:3]:
-                        st.markdown(f"- [{wr['title'][:60]}]({wr['url']})  \n"
-                                    f"  {wr['snippet'][:150]}")
+                    st.markdown("**웹 검색:**\n\n" + "\n".join([
+                        f"- [{wr['title'][:60]}]({wr['url']})  \n  {wr['snippet'][:150]}"
+                        for wr in web_results[:3]
+                    ]))
 
                 # ClinicalTrials + PubMed — only shown for pharma/biotech
                 if verification.get("is_pharma"):
@@ -293,18 +484,22 @@ def _render_company_card(company: dict, verification: dict | None, verdict: dict
 
                     trial_details = verification.get("trial_details", [])
                     if trial_details:
-                        for td in trial_details:
-                            st.markdown(
-                                f"- **{td['nct_id']}** ({td['status']}) — "
-                                f"{td['title']} | {', '.join(td['conditions'][:3])}"
-                            )
+                        st.markdown("\n".join([
+                            f"- **{td['nct_id']}** ({td['status']}) — "
+                            f"{td['title']} | {', '.join(td['conditions'][:3])}"
+                            for td in trial_details
+                        ]))
 
                 if not web_results and not verification.get("is_pharma"):
                     st.warning("외부 소스에서 관련 데이터를 찾지 못했습니다.")
 
 
-def _render_researcher_card(researcher: dict, verdict: dict | None = None):
-    """Render a researcher card with institution and research details."""
+def _render_researcher_card(researcher: dict, verdict: dict | None = None,
+                            verification: dict | None = None):
+    """Render a researcher card with institution and research details.
+
+    verification overrides any "verification" already on the researcher dict.
+    """
     name = researcher.get("name", "")
     institution = researcher.get("institution", "")
     dept = researcher.get("department", "")
@@ -314,8 +509,8 @@ def _render_researcher_card(researcher: dict, verdict: dict | None = None):
     # Status icon based on verdict
     if verdict:
         v_status = verdict.get("verdict", "unverified")
-        icon = {"confirmed": "+", "partial": "~", "unverified": "?", "wrong": "X"}.get(v_status, "?")
-        label = {"confirmed": "확인됨", "partial": "일부 확인", "unverified": "미검증", "wrong": "불일치"}.get(v_status, "?")
+        icon = _VERDICT_ICON.get(v_status, "?")
+        label = _VERDICT_LABEL.get(v_status, "?")
     else:
         icon = None
 
@@ -337,11 +532,12 @@ def _render_researcher_card(researcher: dict, verdict: dict | None = None):
         # Cross-check verdict
         if verdict and verdict.get("explanation"):
             v_status = verdict.get("verdict", "unverified")
-            emoji = {"confirmed": "✅", "partial": "⚠️", "unverified": "❓", "wrong": "❌"}.get(v_status, "❓")
+            emoji = _VERDICT_EMOJI.get(v_status, "❓")
             st.markdown(f"{emoji} **교차검증:** {verdict['explanation']}")
 
         # Verification data summary
-        verification = researcher.get("verification", {})
+        if verification is None:
+            verification = researcher.get("verification", {})
         if verification:
             vparts = []
             pubs_found = verification.get("publications_found", 0)
@@ -356,182 +552,1220 @@ def _render_researcher_card(researcher: dict, verdict: dict | None = None):
             if vparts:
                 st.caption(f"외부 데이터: {' | '.join(vparts)}")
 
-        research_area = researcher.get("research_area", "")
-        if research_area:
-            st.markdown(f"**연구 분야:** {research_area}")
+        # Detail fields go out as one markdown element
+        lines = [
+            f"**{field_label}:** {researcher[key]}"
+            for key, field_label in (
+                ("research_area", "연구 분야"),
+                ("key_publications", "주요 연구"),
+                ("evidence", "추천 근거"),
+                ("tier_reason", "Tier 산정"),
+                ("contact_clues", "연락처 단서"),
+            )
+            if researcher.get(key)
+        ]
+        if lines:
+            st.markdown("\n\n".join(lines))
 
-        pubs = researcher.get("key_publications", "")
-        if pubs:
-            st.markdown(f"**주요 연구:** {pubs}")
 
-        evidence = researcher.get("evidence", "")
-        if evidence:
-            st.markdown(f"**추천 근거:** {evidence}")
+_JSON_BLOCK_RE = re.compile(r"```json\s*\n(.*?)```", re.DOTALL)
+_FENCED_OBJECT_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_CSV_BLOCK_RE = re.compile(r"```csv\s*\n(.*?)```", re.DOTALL)
+_SKILL_DESC_RE = re.compile(r'description:\s*["\'](.+?)["\']')
+# str.translate table deleting whitespace (company name → guessed domain stem)
+_DROP_WHITESPACE = str.maketrans("", "", " \t\r\n")
 
-        tier_reason = researcher.get("tier_reason", "")
-        if tier_reason:
-            st.markdown(f"**Tier 산정:** {tier_reason}")
 
-        clues = researcher.get("contact_clues", "")
-        if clues:
-            st.markdown(f"**연락처 단서:** {clues}")
+def _loads(s: str | bytes):
+    """json.loads, via orjson when installed (orjson.JSONDecodeError subclasses json's)."""
+    if orjson is None:
+        return json.loads(s)
+    return orjson.loads(s)
 
 
-def _auto_verify(result_text: str, feedback: str = ""):
-    """Parse AI result → external verification → Claude cross-check."""
-    import re as _re
-    json_match = _re.search(r"```json\s*\n(.*?)```", result_text, _re.DOTALL)
+@st.cache_data(show_spinner=False)
+def _extract_json_block(text: str) -> dict | None:
+    """Parse the ```json block of an AI response, falling back to the whole text."""
     parsed = None
-    if json_match:
+    # Bare JSON output needs no fence search at all
+    if text.lstrip()[:1] == "{":
         try:
-            parsed = json.loads(json_match.group(1))
+            parsed = _loads(text)
         except json.JSONDecodeError:
             pass
-    if not parsed:
+        if isinstance(parsed, dict):
+            return parsed
+    # Cheap prefilter: only run the regex when a fence exists, starting from it
+    fence = text.find("```json")
+    json_match = _JSON_BLOCK_RE.search(text, fence) if fence >= 0 else None
+    if json_match:
         try:
-            parsed = json.loads(result_text)
+            parsed = _loads(json_match.group(1))
         except json.JSONDecodeError:
             pass
+    # No whole-text retry: text not starting with "{" can never decode to a dict
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _stable_key(obj) -> str:
+    """Stable digest of a JSON-serializable value (dict keys sorted), used as a cache key."""
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+# Shared clients: st.cache_resource keeps one instance per server process, which
+# (unlike a module global) survives Streamlit re-executing this script on rerun.
+@st.cache_resource(show_spinner=False)
+def _rc() -> ResearchClient:
+    return ResearchClient()
+
+
+@st.cache_resource(show_spinner=False)
+def _claude() -> ClaudeClient:
+    return ClaudeClient()
+
+
+@st.cache_resource(show_spinner=False)
+def _agent_pool() -> ThreadPoolExecutor:
+    """Worker threads for long agent runs, so the script thread stays free to poll."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+@st.cache_resource(show_spinner=False)
+def _enrich_pool() -> ThreadPoolExecutor:
+    """Worker threads for manual-mode enrichment, separate so it never queues behind agent runs."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def _cross_checker(method_name: str, feedback: str):
+    """Bind a ClaudeClient cross-check method for use on worker threads.
+
+    The client is resolved here, on the script thread; if that fails the
+    error is raised per chunk so it is reported like any cross-check failure.
+    """
+    try:
+        method = getattr(_claude(), method_name)
+    except Exception as e:
+        err = e
+
+        def _fail(chunk):
+            raise err
+        return _fail
+    return lambda chunk: method(chunk, feedback=feedback)
+
+
+_CROSS_CHECK_CHUNK = 5    # verified items per Claude cross-check call
+_CROSS_CHECK_WORKERS = 3  # concurrent cross-check calls
+_COMPANY_LOOKUP_WORKERS = 5  # company domains searched concurrently in manual mode
+_FINDYMAIL_PER_DOMAIN = 2    # Findymail lookups per domain; at most 10 in flight overall
+
+
+def _lookup_domain_contacts(hunter, fm, domain: str) -> list[dict]:
+    """Hunter domain search + Findymail check for one domain (runs on a worker thread).
+
+    The caller groups companies by domain first, so each (name, domain) is sent
+    to Findymail at most once per search. Returns add_prospect keyword dicts
+    without search_id or company; the caller fills those in and writes them to
+    the DB on the script thread.
+    """
+    rows = []
+    if hunter is None:
+        return rows
+    # Use Hunter domain search to find people at this domain (cached per domain for a week)
+    domain_result = db.get_cached_hunter_domain(domain)
+    if domain_result is None:
+        domain_result = hunter.search_domain(domain, limit=5)
+        db.put_cached_hunter_domain(domain, domain_result)
+    emails_data = domain_result.get("data", {}).get("emails", [])
+
+    # Hunter can list the same person twice; look each name up once
+    people, pending = [], {}
+    for person in emails_data:
+        name = f"{person.get('first_name', '')} {person.get('last_name', '')}".strip()
+        if person.get("value") and name:
+            people.append((name.lower(), name, person))
+            pending.setdefault(name.lower(), name)
+    if not people:
+        return rows
+
+    # Verify everyone at the domain with Findymail in one concurrent batch
+    try:
+        found = fm.batch_find_emails(
+            [{"contact_name": name, "domain": domain} for name in pending.values()],
+            max_concurrent=_FINDYMAIL_PER_DOMAIN,
+        )
+    except Exception:
+        found = []
+    by_name = {r["contact_name"].lower(): r for r in found}
+
+    for key, name, person in people:
+        fm_result = by_name.get(key, {})
+        is_verified = fm_result.get("verified", False)
+        rows.append(dict(
+            contact_name=name,
+            email=fm_result.get("email") or person["value"],
+            title=person.get("position", ""),
+            email_confidence="verified" if is_verified else "high",
+            source="findymail+hunter",
+            source_data=json.dumps(person, ensure_ascii=False),
+        ))
+    return rows
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _iter_json_array(raw: str):
+    """Yield the elements of a JSON array one at a time, stopping at the first
+    incomplete element (e.g. when the response was cut off mid-array)."""
+    pos = raw.index("[") + 1
+    end = len(raw)
+    while pos < end:
+        while pos < end and raw[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= end or raw[pos] == "]":
+            return
+        try:
+            item, pos = _JSON_DECODER.raw_decode(raw, pos)
+        except json.JSONDecodeError:
+            return
+        yield item
+
 
-    if parsed:
-        all_companies = (parsed.get("tier1_companies", [])
-                         + parsed.get("tier2_companies", []))
-        if all_companies:
-            n = len(all_companies)
-            verify_bar = st.progress(0)
-            verify_status = st.empty()
-
-            # Step 2/3: External data collection
-            verify_status.info(f"⏱ 2/3 — 외부 데이터 수집 중 ({n}개 회사: 웹 + ClinicalTrials + PubMed)...")
-            verify_bar.progress(0.1)
-            from research_client import ResearchClient
-            rc = ResearchClient()
-            verified_companies = rc.verify_companies_batch(all_companies)
-            st.session_state.ai_target_verification = verified_companies
-            verify_bar.progress(0.6)
-
-            # Step 3/3: Claude cross-check (AI evidence vs external data)
-            verify_status.info("⏱ 3/3 — AI 근거 교차검증 중 (Claude 분석)...")
+def _parse_verdicts(raw: str) -> list[dict]:
+    """Parse a cross-check verdict array, recovering complete entries if truncated."""
+    try:
+        return _loads(raw)
+    except json.JSONDecodeError:
+        raw = raw.strip()
+        if not raw.startswith("["):
+            raise
+        verdicts = list(_iter_json_array(raw))
+        if not verdicts:
+            raise
+        logger.info(f"Recovered {len(verdicts)} verdicts from truncated JSON")
+        return verdicts
+
+
+def _verify_and_cross_check(n: int, verified_stream, cross_check, verify_bar, verify_status, step3_msg: str):
+    """Cross-check verified items in chunks while the rest are still being collected.
+
+    verified_stream yields (index, item) as external verification finishes;
+    every _CROSS_CHECK_CHUNK items are handed to cross_check on a worker pool.
+    Returns (verified items in input order, verdicts, cross-check errors).
+    """
+    n_chunks = -(-n // _CROSS_CHECK_CHUNK)
+    verified = [None] * n
+    verdicts, errors = [], []
+    n_verified = n_checked = 0
+
+    def _tick():
+        verify_bar.progress(0.1 + 0.5 * n_verified / n + 0.4 * n_checked / n_chunks)
+
+    with ThreadPoolExecutor(max_workers=_CROSS_CHECK_WORKERS) as pool:
+        futures, chunk = [], []
+        for i, item in verified_stream:
+            verified[i] = item
+            chunk.append(item)
+            n_verified += 1
+            if len(chunk) == _CROSS_CHECK_CHUNK or n_verified == n:
+                futures.append(pool.submit(cross_check, chunk))
+                chunk = []
+            _tick()
+
+        verify_status.info(step3_msg)
+        for future in as_completed(futures):
             try:
-                from claude_client import ClaudeClient
-                claude = ClaudeClient()
-                cross_check_raw = claude.cross_check_evidence(verified_companies, feedback=feedback)
-                # Parse the verdict JSON (with truncation recovery)
-                try:
-                    verdicts = json.loads(cross_check_raw)
-                except json.JSONDecodeError:
-                    # Truncated JSON — try to recover complete entries
-                    raw = cross_check_raw.strip()
-                    if raw.startswith("["):
-                        last_brace = raw.rfind("}")
-                        if last_brace > 0:
-                            raw = raw[:last_brace + 1] + "]"
-                            verdicts = json.loads(raw)
-                            logger.info(f"Recovered {len(verdicts)} verdicts from truncated JSON")
-                        else:
-                            raise
-                    else:
-                        raise
-                # Build lookup by company name
-                verdict_map = {v["company"]: v for v in verdicts if "company" in v}
-                st.session_state.ai_target_verdicts = verdict_map
-                verify_bar.progress(1.0)
-                n_done = len(verdict_map)
-                if n_done < n:
-                    verify_status.warning(f"⚠️ {n_done}/{n}개 회사 검증 완료 (일부 잘림)")
-                else:
-                    verify_status.success(f"✅ {n}개 회사 검증 완료!")
+                verdicts.extend(_parse_verdicts(future.result()))
             except Exception as e:
-                logger.warning(f"Cross-check failed: {e}")
-                st.session_state.ai_target_verdicts = {}
-                verify_bar.progress(0.8)
-                verify_status.warning(f"교차검증 실패: {e}")
+                errors.append(e)
+            n_checked += 1
+            _tick()
+
+    return verified, verdicts, errors
+
+
+@st.cache_data(show_spinner=False)
+def _build_company_export_md(parsed_json: str, verdicts_json: str) -> str:
+    """Company-result Markdown, cached on the JSON-serialized result and verdicts."""
+    parsed, verdict_map = _loads(parsed_json), _loads(verdicts_json)
+    buf = io.StringIO()
+    w = buf.write
+    w("# 타겟 회사 추천 결과\n\n")
+    w(f"**제품 요약:** {parsed.get('product_summary', '')}\n\n")
+    analysis = parsed.get("analysis", "")
+    if analysis:
+        w(f"## 분석\n{analysis}\n\n")
+
+    for tier_label, tier_key in [
+        ("Tier 1 (핵심 타겟)", "tier1_companies"),
+        ("Tier 2 (잠재적 타겟)", "tier2_companies"),
+    ]:
+        tier_list = parsed.get(tier_key, [])
+        w(f"## {tier_label} — {len(tier_list)}개\n\n")
+        for i, c in enumerate(tier_list, 1):
+            c_name = c.get("name", "")
+            w(f"### {i}. {c_name}\n")
+            if c.get("reason"):
+                w(f"- **요약:** {c['reason']}\n")
+            if c.get("evidence"):
+                w(f"- **근거:** {c['evidence']}\n")
+            if c.get("tier_reason"):
+                w(f"- **Tier 산정:** {c['tier_reason']}\n")
+            # Add verdict if available
+            v = verdict_map.get(c_name, {})
+            if v:
+                emoji = _VERDICT_EMOJI.get(v.get("verdict", ""), "")
+                w(f"- **교차검증:** {emoji} {v.get('verdict', '')} — {v.get('explanation', '')}\n")
+            w("\n")
+
+    dm = parsed.get("decision_makers", [])
+    eu = parsed.get("end_users", [])
+    if dm or eu:
+        w("## 추천 직종\n\n")
+        if dm:
+            w(f"**의사결정자:** {', '.join(dm)}\n")
+        if eu:
+            w(f"**실제 사용자:** {', '.join(eu)}\n")
+    return buf.getvalue()
+
+
+_RESEARCHER_EXPORT_FIELDS = (
+    ("research_area", "연구 분야"),
+    ("key_publications", "주요 연구"),
+    ("reason", "요약"),
+    ("evidence", "근거"),
+    ("tier_reason", "Tier 산정"),
+    ("contact_clues", "연락처 단서"),
+)
+
+
+@st.cache_data(show_spinner=False)
+def _build_researcher_export_md(parsed_json: str, verdicts_json: str) -> str:
+    """Researcher-result Markdown, cached on the JSON-serialized result and verdicts."""
+    parsed, verdict_map = _loads(parsed_json), _loads(verdicts_json)
+    buf = io.StringIO()
+    w = buf.write
+    w("# 타겟 연구자 추천 결과\n\n")
+    w(f"**제품 요약:** {parsed.get('product_summary', '')}\n\n")
+    analysis = parsed.get("analysis", "")
+    if analysis:
+        w(f"## 분석\n{analysis}\n\n")
+
+    for tier_label, tier_key in [
+        ("Tier 1 (핵심 타겟)", "tier1_researchers"),
+        ("Tier 2 (잠재적 타겟)", "tier2_researchers"),
+    ]:
+        tier_list = parsed.get(tier_key, [])
+        w(f"## {tier_label} — {len(tier_list)}명\n\n")
+        for i, r in enumerate(tier_list, 1):
+            r_name = r.get("name", "")
+            r_inst = r.get("institution", "")
+            r_dept = r.get("department", "")
+            r_title = r.get("title", "")
+            header = f"### {i}. {r_name}"
+            if r_title:
+                header += f" — {r_title}"
+            if r_inst:
+                header += f", {r_inst}"
+                if r_dept:
+                    header += f" ({r_dept})"
+            # Header plus every non-empty field in one write
+            parts = [header]
+            parts.extend(
+                f"- **{label}:** {r[key]}"
+                for key, label in _RESEARCHER_EXPORT_FIELDS
+                if r.get(key)
+            )
+            v = verdict_map.get(r_name, {})
+            if v:
+                emoji = _VERDICT_EMOJI.get(v.get("verdict", ""), "")
+                parts.append(f"- **교차검증:** {emoji} {v.get('verdict', '')} — {v.get('explanation', '')}")
+            w("\n".join(parts))
+            w("\n\n")
+
+    areas = parsed.get("target_research_areas", [])
+    if areas:
+        w("## 타겟 연구 분야\n\n")
+        w("".join([f"- {a}\n" for a in areas]))
+    return buf.getvalue()
+
+
+def _researcher_preset_names(parsed: dict) -> tuple[list[str], list[str], list[str], list[str]]:
+    """(tier1, tier2, tier1+tier2) "name (institution)" labels and ordered institutions.
+
+    Memoized like _export_md_for: on the parsed result's identity plus its
+    _tier_versions entry, so the preset-save section reuses them across reruns.
+    """
+    version = st.session_state.get("_tier_versions", {}).get("ai_researcher_parsed", 0)
+    memo = st.session_state.get("_r_preset_names_memo")
+    if memo and memo[0] is parsed and memo[1] == version:
+        return memo[2]
+    tier1 = parsed.get("tier1_researchers", [])
+    tier2 = parsed.get("tier2_researchers", [])
+    tier1_names = [f"{r['name']} ({r.get('institution', '')})" for r in tier1]
+    tier2_names = [f"{r['name']} ({r.get('institution', '')})" for r in tier2]
+    # Ordered dedupe so the 기관 preview and saved string are stable across reruns
+    institutions = list(dict.fromkeys(
+        r["institution"] for r in chain(tier1, tier2) if r.get("institution")
+    ))
+    names = (tier1_names, tier2_names, tier1_names + tier2_names, institutions)
+    st.session_state._r_preset_names_memo = (parsed, version, names)
+    return names
+
+
+def _export_md_for(parsed_key: str, verdict_map: dict, builder) -> str:
+    """Markdown export for the result at session key parsed_key, memoized per session.
+
+    Reused until the parsed dict or verdict map is replaced or a tier op bumps
+    _tier_versions, so reruns skip even serializing the cache key for builder.
+    """
+    parsed = st.session_state.get(parsed_key)
+    version = st.session_state.get("_tier_versions", {}).get(parsed_key, 0)
+    memo = st.session_state.setdefault("_export_md_memo", {})
+    hit = memo.get(parsed_key)
+    if hit and hit[0] is parsed and hit[1] is verdict_map and hit[2] == version:
+        return hit[3]
+    md = builder(
+        json.dumps(parsed, ensure_ascii=False, sort_keys=True),
+        json.dumps(verdict_map, ensure_ascii=False, sort_keys=True),
+    )
+    memo[parsed_key] = (parsed, verdict_map, version, md)
+    return md
+
+
+# st.fragment (1.37+, experimental_ before that) reruns only the decorated
+# function on widget interaction inside it; older Streamlit runs it inline.
+_FRAGMENT_IMPL = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+_fragment = _FRAGMENT_IMPL or (lambda f: f)
+# Same, re-running itself every 2s; without fragments the caller sleeps + reruns
+_poll_fragment = _FRAGMENT_IMPL(run_every=2) if _FRAGMENT_IMPL else (lambda f: f)
+
+
+def _render_company_tier(companies: list[dict], src: str, dst: str, buttons: tuple[str, str, str, str],
+                         vmap: dict, verdict_map: dict):
+    """Render one tier's company cards, each with move / delete buttons beside it.
+
+    buttons is (move label, move help, move key prefix, delete key prefix).
+    """
+    move_label, move_help, move_key, del_key = buttons
+    for idx, c in enumerate(companies):
+        col_card, col_actions = st.columns([5, 1])
+        with col_card:
+            _render_company_card(c, vmap.get(c["name"]), verdict_map.get(c["name"]))
+        with col_actions:
+            st.button(move_label, key=f"{move_key}_{idx}", help=move_help,
+                      on_click=_queue_tier_op, args=("ai_target_parsed", src, dst, c["name"]))
+            st.button("삭제", key=f"{del_key}_{idx}", help="목록에서 제거",
+                      on_click=_queue_tier_op, args=("ai_target_parsed", src, None, c["name"]))
+
+
+def _render_company_preset_save(parsed: dict, product_desc: str, hint: str, region: str):
+    """Scope picker, preview, preset-name inputs and save button for a company result.
+
+    Called from _render_company_results so the preview follows tier moves/deletes.
+    """
+    st.divider()
+    st.subheader("프리셋으로 저장")
+    st.caption("추천 결과를 프리셋으로 저장하면 '컨택 서칭' 페이지에서 바로 사용할 수 있습니다.")
+
+    rec = parsed.get("recommended_search_params", {})
+    tier1_names = [c["name"] for c in parsed.get("tier1_companies", [])]
+    tier2_names = [c["name"] for c in parsed.get("tier2_companies", [])]
+    # Combine all recommended titles (decision_makers + end_users)
+    # dict.fromkeys drops titles listed under both groups, keeping order
+    _all_titles = dict.fromkeys(parsed.get("decision_makers", []))
+    _all_titles.update(dict.fromkeys(parsed.get("end_users", [])))
+    _all_titles_str = ", ".join(_all_titles) if _all_titles else rec.get("titles", "")
+
+    save_scope = st.radio(
+        "저장할 회사 범위",
+        ["Tier 1 + Tier 2 전체", "Tier 1만", "Tier 2만", "Tier 1 / Tier 2 각각 (2개 프리셋)"],
+        horizontal=True,
+        key="ai_save_scope",
+    )
+
+    if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
+        _save_groups = [("_T1", tier1_names), ("_T2", tier2_names)]
+        companies_to_save = None  # previewed per tier
+    elif save_scope == "Tier 2만":
+        companies_to_save = tier2_names
+    elif save_scope == "Tier 1만":
+        companies_to_save = tier1_names
+    else:
+        companies_to_save = tier1_names + tier2_names
+    if companies_to_save is not None:
+        _save_groups = [("", companies_to_save)]
+
+    # Preview what will be saved
+    with st.expander("저장될 프리셋 내용 미리보기", expanded=False):
+        _preview = [
+            f"**산업:** {rec.get('industry', '')}",
+            f"**직함:** {_all_titles_str}",
+            f"**키워드:** {rec.get('keywords', '')}",
+        ]
+        if companies_to_save is None:
+            _preview.append(f"**Tier 1 ({len(tier1_names)}개):** {_names_preview(tier1_names)}")
+            _preview.append(f"**Tier 2 ({len(tier2_names)}개):** {_names_preview(tier2_names)}")
         else:
-            st.session_state.ai_target_verification = None
-            st.session_state.ai_target_verdicts = {}
+            _preview.append(f"**회사 ({len(companies_to_save)}개):** {_names_preview(companies_to_save)}")
+        st.markdown("\n\n".join(_preview))
+
+    _today_tag = datetime.now().strftime("%y%m%d")
+    if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
+        _ncol1, _ncol2 = st.columns(2)
+        with _ncol1:
+            preset_name_t1 = st.text_input(
+                "Tier 1 프리셋 이름",
+                value=f"AI_{_today_tag}_T1",
+                key="ai_preset_name_t1",
+            )
+        with _ncol2:
+            preset_name_t2 = st.text_input(
+                "Tier 2 프리셋 이름",
+                value=f"AI_{_today_tag}_T2",
+                key="ai_preset_name_t2",
+            )
+        # Override _save_groups with individual names
+        _save_groups = [(preset_name_t1, tier1_names), (preset_name_t2, tier2_names)]
+        _can_save = bool(preset_name_t1 and preset_name_t2)
     else:
+        preset_name = st.text_input(
+            "프리셋 이름",
+            value=f"AI_{_today_tag}",
+            key="ai_preset_name",
+        )
+        # Use preset_name directly as the full name
+        _save_groups = [(preset_name, c) for _, c in _save_groups]
+        _can_save = bool(preset_name)
+
+    if st.button("💾 프리셋 저장 → 컨택 서칭", type="primary", disabled=not _can_save):
+        _fb_hash = _get_feedback_hash()
+        db.save_presets([
+            dict(
+                name=_name,
+                industry=rec.get("industry", ""),
+                titles=_all_titles_str,
+                locations=region or "",
+                companies=", ".join(_companies),
+                keywords=rec.get("keywords", ""),
+                max_results=100,
+                feedback_hash=_fb_hash,
+                product_description=product_desc or "",
+                target_hint=hint or "",
+                target_region=region or "",
+            )
+            for _name, _companies in _save_groups if _companies
+        ])
+        _invalidate_presets()
+        _saved_names = ", ".join([f"'{n}'" for n, c in _save_groups if c])
+        _reset_results("ai_target", ai_web_context="")
+        st.session_state.active_page = "🔍 컨택 서칭"
+        st.session_state.contact_search_mode = "manual"
+        st.session_state.prospect_step = "search"
+        st.success(f"프리셋 {_saved_names} 저장 완료! 컨택 서칭으로 이동합니다.")
+        st.rerun()
+
+
+@_fragment
+def _render_company_results(parsed: dict, product_desc: str, hint: str, region: str):
+    """Tier cards, verification summary, export and preset save for a company result.
+
+    Runs as a fragment so tier moves/deletes rerun only this section; parsed is
+    the session-state dict, so queued ops applied here persist for the page.
+    """
+    _apply_tier_ops("ai_target_parsed")
+    tier1 = parsed.get("tier1_companies", [])
+    tier2 = parsed.get("tier2_companies", [])
+
+    # Build verification + verdict lookups
+    _vmap = _verification_by_name("ai_target_verification")
+    _verdict_map = st.session_state.get("ai_target_verdicts", {})
+
+    _tab_labels = {
+        "tier1": f"Tier 1 ({len(tier1)}개)",
+        "tier2": f"Tier 2 ({len(tier2)}개)",
+        "titles": "추천 직종",
+    }
+    _tier_tab = st.radio(
+        "결과 보기",
+        list(_tab_labels),
+        format_func=_tab_labels.__getitem__,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="ai_target_tier_tab",
+    )
+
+    if _tier_tab == "tier1":
+        if tier1:
+            _render_company_tier(tier1, "tier1_companies", "tier2_companies",
+                                 ("→ T2", "Tier 2로 이동", "t1to2", "del_t1"), _vmap, _verdict_map)
+        else:
+            st.info("Tier 1 회사 없음")
+
+    elif _tier_tab == "tier2":
+        if tier2:
+            _render_company_tier(tier2, "tier2_companies", "tier1_companies",
+                                 ("→ T1", "Tier 1으로 이동", "t2to1", "del_t2"), _vmap, _verdict_map)
+        else:
+            st.info("Tier 2 회사 없음")
+
+    else:  # titles
+        dm = parsed.get("decision_makers", [])
+        eu = parsed.get("end_users", [])
+        if dm:
+            st.markdown("**의사결정자 (Decision Makers):**")
+            for t in dm:
+                st.markdown(f"- {t}")
+        if eu:
+            st.markdown("**실제 사용자 (End Users):**")
+            for t in eu:
+                st.markdown(f"- {t}")
+
+    # ── Verification Summary ──────────────
+    if _verdict_map:
+        st.divider()
+        st.subheader("근거 교차검증 결과")
+        st.caption("외부 데이터(웹 + ClinicalTrials + PubMed) 수집 후 Claude가 AI 근거와 비교 분석")
+
+        total_v = len(_verdict_map)
+        _vc = Counter(v.get("verdict", "") for v in _verdict_map.values())
+        confirmed, v_partial, unverified, wrong = (
+            _vc["confirmed"], _vc["partial"], _vc["unverified"], _vc["wrong"])
+
+        vcol1, vcol2, vcol3, vcol4 = st.columns(4)
+        vcol1.metric("✅ 확인됨", f"{confirmed}/{total_v}")
+        vcol2.metric("⚠️ 일부 확인", f"{v_partial}/{total_v}")
+        vcol3.metric("❓ 미검증", f"{unverified}/{total_v}")
+        vcol4.metric("❌ 불일치", f"{wrong}/{total_v}")
+
+        if wrong > 0:
+            st.error(f"{wrong}개 회사의 AI 근거가 외부 데이터와 불일치합니다. 해당 회사를 확인하세요.")
+        if unverified > 0:
+            st.warning(f"{unverified}개 회사는 외부 데이터가 부족하여 검증 불가합니다.")
+    elif st.session_state.ai_target_verification:
+        st.divider()
+        st.subheader("근거 검증 결과")
+        st.caption("외부 데이터 수집 완료 (교차검증 미완료)")
+
+        total_v = len(st.session_state.ai_target_verification)
+        _sc = Counter(v.get("verification", {}).get("status", "")
+                      for v in st.session_state.ai_target_verification)
+        verified, partial, no_data = _sc["verified"], _sc["partial"], _sc["no_data"]
+
+        vcol1, vcol2, vcol3 = st.columns(3)
+        vcol1.metric("검증됨", f"{verified}/{total_v}")
+        vcol2.metric("일부 확인", f"{partial}/{total_v}")
+        vcol3.metric("데이터 없음", f"{no_data}/{total_v}")
+
+    # ── Export Results as Markdown ─────────
+    st.divider()
+    st.subheader("결과 내보내기")
+
+    _export_md = _export_md_for("ai_target_parsed", _verdict_map, _build_company_export_md)
+    st.download_button(
+        "📥 Markdown으로 내보내기",
+        data=_export_md,
+        file_name="target_companies_result.md",
+        mime="text/markdown",
+        key="export_company_md",
+    )
+
+    # ── Save as Preset ─────────────────────
+    _render_company_preset_save(parsed, product_desc, hint, region)
+
+
+def _render_researcher_tier(researchers: list[dict], src: str, dst: str, buttons: tuple[str, str, str, str],
+                            vmap: dict, verdict_map: dict):
+    """Researcher counterpart of _render_company_tier: cards with move / delete buttons."""
+    move_label, move_help, move_key, del_key = buttons
+    for idx, r in enumerate(researchers):
+        r_name = r.get("name", "")
+        col_card, col_actions = st.columns([5, 1])
+        with col_card:
+            _render_researcher_card(r, verdict_map.get(r_name), vmap.get(r_name))
+        with col_actions:
+            st.button(move_label, key=f"{move_key}_{idx}", help=move_help,
+                      on_click=_queue_tier_op, args=("ai_researcher_parsed", src, dst, r_name))
+            st.button("삭제", key=f"{del_key}_{idx}", help="목록에서 제거",
+                      on_click=_queue_tier_op, args=("ai_researcher_parsed", src, None, r_name))
+
+
+@_fragment
+def _render_researcher_results(parsed: dict, product_desc: str, areas: str, region: str):
+    """Tier cards, verification summary, export and preset save for a researcher result.
+
+    Fragment twin of _render_company_results: tier moves/deletes and the export
+    rerun only this section.
+    """
+    _apply_tier_ops("ai_researcher_parsed")
+    tier1 = parsed.get("tier1_researchers", [])
+    tier2 = parsed.get("tier2_researchers", [])
+
+    # Build verification + verdict lookups
+    _r_vmap = _verification_by_name("ai_researcher_verification")
+    _r_verdict_map = st.session_state.get("ai_researcher_verdicts", {})
+
+    _tab_labels = {
+        "tier1": f"Tier 1 ({len(tier1)}명)",
+        "tier2": f"Tier 2 ({len(tier2)}명)",
+        "areas": "연구 분야",
+    }
+    _tier_tab = st.radio(
+        "결과 보기",
+        list(_tab_labels),
+        format_func=_tab_labels.__getitem__,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="researcher_tier_tab",
+    )
+
+    if _tier_tab == "tier1":
+        if tier1:
+            _render_researcher_tier(tier1, "tier1_researchers", "tier2_researchers",
+                                    ("→ T2", "Tier 2로 이동", "r_t1to2", "r_del_t1"), _r_vmap, _r_verdict_map)
+        else:
+            st.info("Tier 1 연구자 없음")
+
+    elif _tier_tab == "tier2":
+        if tier2:
+            _render_researcher_tier(tier2, "tier2_researchers", "tier1_researchers",
+                                    ("→ T1", "Tier 1으로 이동", "r_t2to1", "r_del_t2"), _r_vmap, _r_verdict_map)
+        else:
+            st.info("Tier 2 연구자 없음")
+
+    else:  # areas
+        areas = parsed.get("target_research_areas", [])
+        if areas:
+            st.markdown("**타겟 연구 분야:**")
+            for a in areas:
+                st.markdown(f"- {a}")
+        else:
+            st.info("연구 분야 정보 없음")
+
+    # ── Verification Summary ──────────────
+    if _r_verdict_map:
+        st.divider()
+        st.subheader("근거 교차검증 결과")
+        st.caption("외부 데이터(웹 + PubMed + ClinicalTrials) 수집 후 Claude가 AI 근거와 비교 분석")
+
+        _vc = Counter(v.get("verdict", "") for v in _r_verdict_map.values())
+        confirmed, v_partial, unverified, wrong = (
+            _vc["confirmed"], _vc["partial"], _vc["unverified"], _vc["wrong"])
+
+        vcol1, vcol2, vcol3, vcol4 = st.columns(4)
+        vcol1.metric("✅ 확인됨", confirmed)
+        vcol2.metric("⚠️ 일부 확인", v_partial)
+        vcol3.metric("❓ 미검증", unverified)
+        vcol4.metric("❌ 불일치", wrong)
+
+    # ── Export Results as Markdown ─────────
+    st.divider()
+    st.subheader("결과 내보내기")
+
+    _export_md = _export_md_for("ai_researcher_parsed", _r_verdict_map, _build_researcher_export_md)
+    st.download_button(
+        "📥 Markdown으로 내보내기",
+        data=_export_md,
+        file_name="target_researchers_result.md",
+        mime="text/markdown",
+        key="export_researcher_md",
+    )
+
+    # ── Save as Preset ─────────────────────
+    _render_researcher_preset_save(parsed, product_desc, areas, region)
+
+
+def _render_researcher_preset_save(parsed: dict, product_desc: str, areas: str, region: str):
+    """Scope picker, preview, preset-name inputs and save button for a researcher result.
+
+    Called from _render_researcher_results so the preview follows tier moves/deletes.
+    """
+    st.divider()
+    st.subheader("프리셋으로 저장")
+    st.caption("추천 결과를 프리셋으로 저장하면 '컨택 서칭' 페이지에서 바로 사용할 수 있습니다.")
+
+    rec = parsed.get("recommended_search_params", {})
+    tier1_names, tier2_names, all_names, all_institutions = _researcher_preset_names(parsed)
+    all_areas = parsed.get("target_research_areas", [])
+
+    save_scope = st.radio(
+        "저장할 범위",
+        ["Tier 1 + Tier 2 전체", "Tier 1만", "Tier 2만", "Tier 1 / Tier 2 각각 (2개 프리셋)"],
+        horizontal=True,
+        key="researcher_save_scope",
+    )
+
+    if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
+        _save_groups = [("_T1", tier1_names), ("_T2", tier2_names)]
+    elif save_scope == "Tier 2만":
+        _save_groups = [("", tier2_names)]
+    elif save_scope == "Tier 1만":
+        _save_groups = [("", tier1_names)]
+    else:
+        _save_groups = [("", all_names)]
+
+    # Preview
+    with st.expander("저장될 프리셋 내용 미리보기", expanded=False):
+        st.markdown(f"**연구 분야:** {', '.join(all_areas)}")
+        st.markdown(f"**기관:** {', '.join(all_institutions[:10])}")
+        st.markdown(f"**검색 키워드:** {rec.get('research_keywords', '')}")
+
+    _today_tag = datetime.now().strftime("%y%m%d")
+    if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
+        _nc1, _nc2 = st.columns(2)
+        with _nc1:
+            r_preset_name_t1 = st.text_input(
+                "Tier 1 프리셋 이름",
+                value=f"연구자_{_today_tag}_T1",
+                key="r_preset_name_t1",
+            )
+        with _nc2:
+            r_preset_name_t2 = st.text_input(
+                "Tier 2 프리셋 이름",
+                value=f"연구자_{_today_tag}_T2",
+                key="r_preset_name_t2",
+            )
+        _save_groups = [(r_preset_name_t1, tier1_names), (r_preset_name_t2, tier2_names)]
+        _r_can_save = bool(r_preset_name_t1 and r_preset_name_t2)
+    else:
+        r_preset_name = st.text_input(
+            "프리셋 이름",
+            value=f"연구자_{_today_tag}",
+            key="r_preset_name",
+        )
+        _save_groups = [(r_preset_name, c) for _, c in _save_groups]
+        _r_can_save = bool(r_preset_name)
+
+    if st.button("💾 프리셋 저장 → 컨택 서칭", type="primary",
+                 disabled=not _r_can_save, key="save_researcher_preset"):
+        _fb_hash = _get_feedback_hash()
+        _areas_str = ", ".join(all_areas)
+        _institutions_str = ", ".join(all_institutions)
+        db.save_presets([
+            dict(
+                name=_name,
+                industry=_areas_str,
+                titles="Professor, Associate Professor, PI, Lab Director",
+                locations=region or "",
+                companies=", ".join(_researchers),
+                keywords=rec.get("research_keywords", ""),
+                max_results=100,
+                feedback_hash=_fb_hash,
+                product_description=product_desc or "",
+                target_hint=areas or "",
+                target_region=region or "",
+                preset_type="researcher",
+                institutions=_institutions_str,
+                research_areas=_areas_str,
+            )
+            for _name, _researchers in _save_groups if _researchers
+        ])
+        _invalidate_presets()
+        _saved = ", ".join([f"'{n}'" for n, r in _save_groups if r])
+        _reset_results("ai_researcher")
+        st.session_state.active_page = "🔍 컨택 서칭"
+        st.session_state.contact_search_mode = "manual"
+        st.session_state.prospect_step = "search"
+        st.success(f"프리셋 {_saved} 저장 완료! 컨택 서칭으로 이동합니다.")
+        st.rerun()
+
+
+@_fragment
+def _render_agent2_results(result: dict):
+    """Deduped contacts, metrics, table and export for an Agent 2 result (fragment).
+
+    The download reruns only this section, so the dedupe and table are not
+    rebuilt by unrelated widgets elsewhere on the page.
+    """
+    ss = st.session_state
+    credits, search_id = ss.agent2_credits or {}, ss.get("agent2_search_id")
+    contacts_raw = result.get("contacts", [])
+
+    # Deduplicate by (email, company) — matches DB UNIQUE constraint;
+    # contacts without an email fall back to (name, company)
+    contacts, df = [], None
+    if contacts_raw:
+        df = pd.DataFrame(contacts_raw)
+        _keys = (
+            df.reindex(columns=["email", "contact_name", "company"])
+            .fillna("").astype(str)
+            .apply(lambda col: col.str.strip().str.lower())
+        )
+        _has_email = _keys["email"] != ""
+        _keep = ~pd.DataFrame({
+            "has_email": _has_email,
+            "who": _keys["email"].where(_has_email, _keys["contact_name"]),
+            "company": _keys["company"],
+        }).duplicated()
+        contacts = list(compress(contacts_raw, _keep))
+        df = df[_keep].reset_index(drop=True)
+
+    dupes_removed = len(contacts_raw) - len(contacts)
+    msg = f"✅ {len(contacts)}명의 연락처 발견"
+    if dupes_removed > 0:
+        msg += f" (중복 {dupes_removed}건 제거)"
+    st.success(msg)
+
+    # Metrics
+    m1, m2, m3, m4 = st.columns(4)
+    _with_email, _companies = 0, set()
+    for c in contacts:
+        if c.get("email"):
+            _with_email += 1
+        if c.get("company"):
+            _companies.add(c["company"])
+    m1.metric("총 연락처", len(contacts))
+    m2.metric("이메일 확보", _with_email)
+    m3.metric("회사 수", len(_companies))
+    m4.metric("크레딧 사용", f"F:{credits.get('findymail', 0)} H:{credits.get('hunter', 0)}")
+
+    # Contacts table
+    if contacts:
+        display_cols = [c for c in ["contact_name", "email", "email_confidence", "company", "title", "source", "location"] if c in df.columns]
+        st.dataframe(df[display_cols], use_container_width=True, height=400)
+
+        # Export
+        st.divider()
+        exp1, exp2 = st.columns(2)
+        with exp1:
+            # Serialize once per Agent 2 result; reruns reuse the string
+            _csv_memo = st.session_state.get("_a2_csv_memo")
+            if _csv_memo and _csv_memo[0] is result:
+                csv_data = _csv_memo[1]
+            else:
+                csv_data = df[display_cols].to_csv(index=False)
+                st.session_state._a2_csv_memo = (result, csv_data)
+            st.download_button(
+                "📥 CSV 다운로드",
+                csv_data,
+                f"contacts_{time.strftime('%y%m%d')}.csv",
+                "text/csv",
+            )
+        with exp2:
+            if st.button("📧 콜드메일 캠페인으로 보내기"):
+                st.session_state.csv_data = csv_data
+                st.session_state.a3_from_agent2 = search_id
+                st.session_state.active_page = "📝 콜드메일"
+                st.rerun()
+
+
+@_poll_fragment
+def _poll_enrich_job():
+    """Wait for the manual-mode enrichment on the worker pool; apply it when done."""
+    job = st.session_state.get("_enrich_job")
+    if job is None:
+        return
+    future = job["future"]
+    if not future.done():
+        if future.running():
+            st.status("Claude가 이메일 추론 + 적합도 평가 중... (1~2분 소요)", state="running")
+        else:
+            st.status("다른 인리치먼트 작업 대기 중...", state="running")
+        if _FRAGMENT_IMPL is None:
+            time.sleep(2)
+            st.rerun()
+        return
+
+    del st.session_state["_enrich_job"]
+    try:
+        from main import _apply_enrichment
+        _apply_enrichment(job["search_id"], future.result())
+        db.update_prospect_search(job["search_id"], total_enriched=job["count"])
+    except Exception as e:
+        # Shown by the enrich step on the rerun below
+        st.session_state._enrich_error = str(e)
+        logger.error(f"Enrichment failed: {e}")
+    st.rerun()
+
+
+@_poll_fragment
+def _poll_agent1_job():
+    """Show Agent 1 progress while it runs on the worker pool; store the result when done."""
+    job = st.session_state.get("_agent1_job")
+    if job is None:
+        return
+    tracker = job["tracker"]
+    future = job["future"]
+    if not future.done():
+        # _agent_pool is shared across sessions; say so while this run waits its turn
+        if future.running():
+            tracker.attach()
+        else:
+            st.status("다른 Agent 작업 대기 중...", state="running")
+        if _FRAGMENT_IMPL is None:
+            time.sleep(2)
+            st.rerun()
+        return
+
+    del st.session_state["_agent1_job"]
+    tracker.attach()
+    try:
+        agent_output = future.result()
+
+        st.session_state.agent_log = tracker.tool_log
+
+        # Use saved JSON result if available, otherwise try parsing agent output
+        result_json = job["agent"].result_json
+        if result_json:
+            st.session_state.ai_target_result = result_json
+        else:
+            st.session_state.ai_target_result = agent_output
+
+        st.session_state.ai_target_parsed = None
         st.session_state.ai_target_verification = None
         st.session_state.ai_target_verdicts = {}
 
+        tracker.complete("타겟 탐색 완료! 근거 검증 시작...")
 
-def _auto_verify_researchers(result_text: str, feedback: str = ""):
-    """Parse AI researcher result → external verification → Claude cross-check."""
-    import re as _re
-    json_match = _re.search(r"```json\s*\n(.*?)```", result_text, _re.DOTALL)
-    parsed = None
-    if json_match:
-        try:
-            parsed = json.loads(json_match.group(1))
-        except json.JSONDecodeError:
-            pass
-    if not parsed:
-        try:
-            parsed = json.loads(result_text)
-        except json.JSONDecodeError:
-            pass
+        # Auto-verify immediately after agent completes
+        _auto_verify(st.session_state.ai_target_result, feedback=job["feedback"])
 
-    if parsed:
-        all_researchers = (parsed.get("tier1_researchers", [])
-                           + parsed.get("tier2_researchers", []))
-        if all_researchers:
-            n = len(all_researchers)
-            verify_bar = st.progress(0)
-            verify_status = st.empty()
-
-            # Step 2/3: External data collection
-            verify_status.info(f"⏱ 2/3 — 외부 데이터 수집 중 ({n}명 연구자: 웹 + PubMed + ClinicalTrials)...")
-            verify_bar.progress(0.1)
-            from research_client import ResearchClient
-            rc = ResearchClient()
-            verified_researchers = rc.verify_researchers_batch(all_researchers)
-            st.session_state.ai_researcher_verification = verified_researchers
-            verify_bar.progress(0.6)
-
-            # Step 3/3: Claude cross-check
-            verify_status.info("⏱ 3/3 — AI 근거 교차검증 중 (Claude 분석)...")
-            try:
-                from claude_client import ClaudeClient
-                claude = ClaudeClient()
-                cross_check_raw = claude.cross_check_researcher_evidence(
-                    verified_researchers, feedback=feedback
-                )
-                try:
-                    verdicts = json.loads(cross_check_raw)
-                except json.JSONDecodeError:
-                    raw = cross_check_raw.strip()
-                    if raw.startswith("["):
-                        last_brace = raw.rfind("}")
-                        if last_brace > 0:
-                            raw = raw[:last_brace + 1] + "]"
-                            verdicts = json.loads(raw)
-                            logger.info(f"Recovered {len(verdicts)} researcher verdicts from truncated JSON")
-                        else:
-                            raise
-                    else:
-                        raise
-                verdict_map = {v["researcher"]: v for v in verdicts if "researcher" in v}
-                st.session_state.ai_researcher_verdicts = verdict_map
-                verify_bar.progress(1.0)
-                n_done = len(verdict_map)
-                if n_done < n:
-                    verify_status.warning(f"⚠️ {n_done}/{n}명 연구자 검증 완료 (일부 잘림)")
-                else:
-                    verify_status.success(f"✅ {n}명 연구자 검증 완료!")
-            except Exception as e:
-                logger.warning(f"Researcher cross-check failed: {e}")
-                st.session_state.ai_researcher_verdicts = {}
-                verify_bar.progress(0.8)
-                verify_status.warning(f"교차검증 실패: {e}")
+    except Exception as e:
+        tracker.fail(f"AI 타겟 추천 실패: {e}")
+        st.code("".join(traceback.format_exception(type(e), e, e.__traceback__)))
+    st.rerun()
+
+
+def _delete_preset(preset_id: int):
+    """Button callback: delete a saved preset."""
+    db.delete_preset(preset_id)
+    _invalidate_presets()
+
+
+@_fragment
+def _render_preset_list():
+    """Saved preset rows with regenerate / delete buttons (fragment)."""
+    current_fb_hash = _get_feedback_hash()
+    for sp in _load_presets():
+        companies_count = sp.get("company_count") or 0
+        stale = sp.get("feedback_hash") and sp["feedback_hash"] != current_fb_hash
+        stale_tag = " ⚠️ _피드백 변경됨_" if stale else ""
+        has_product_desc = bool((sp.get("product_description") or "").strip())
+        sp_col1, sp_col2, sp_col3 = st.columns([5, 1, 1])
+        with sp_col1:
+            st.markdown(
+                f"- **{sp['name']}** — {sp.get('industry', '')} | "
+                f"직함: {sp.get('titles', '')[:30]} | "
+                f"회사: {companies_count}개{stale_tag}"
+            )
+        with sp_col2:
+            regen_disabled = not has_product_desc
+            regen_help = "제품 설명 미저장 — 새 프리셋부터 재생성 가능" if regen_disabled else "현재 피드백으로 타겟 재탐색"
+            if st.button("재생성", key=f"regen_preset_{sp['id']}", disabled=regen_disabled or st.session_state.get("agent_running") or "_agent1_job" in st.session_state, help=regen_help):
+                st.session_state._regen_preset = sp
+                st.session_state.agent_running = True
+                st.rerun()
+        with sp_col3:
+            st.button("삭제", key=f"del_preset_{sp['id']}", on_click=_delete_preset, args=(sp["id"],))
+
+
+def _delete_target_feedback(feedback_id: int):
+    """Button callback: delete one target feedback row."""
+    db.delete_target_feedback(feedback_id)
+    _invalidate_feedback()
+
+
+def _add_manual_feedback(active_pid: int | None):
+    """Button callback: store the manual feedback input for the checked scopes."""
+    text = st.session_state.get("manual_fb_unified", "")
+    scopes = []
+    if st.session_state.get("uf_scope_global"):
+        scopes.append(None)
+    if st.session_state.get("uf_scope_profile") and active_pid:
+        scopes.append(active_pid)
+    db.add_target_feedback_scopes(text, scopes, product_summary="수동 입력")
+    _invalidate_feedback()
+
+
+@_fragment
+def _render_feedback_manager(active_pid: int | None, active_profile_name: str):
+    """Global / profile feedback tabs plus the manual input (fragment).
+
+    Deletes and adds run as button callbacks, so a click reruns only this
+    section; the feedback caches are invalidated for the rest of the page.
+    """
+    fb_tab_global, fb_tab_profile = st.tabs([
+        "글로벌 (모든 프로필 공통)",
+        f"프로필 전용 ({active_profile_name})" if active_profile_name else "프로필 전용 (미선택)",
+    ])
+
+    with fb_tab_global:
+        st.caption("여기에 누적된 피드백은 **모든** 타겟 추천 시 자동 반영됩니다.")
+        # Read and parse file-based global feedback entries
+        feedback_entries = _load_file_feedback()
+        # Flush deletes queued by the x buttons in a single rewrite
+        _fb_deletes = st.session_state.pop("_pending_fb_deletes", None)
+        if _fb_deletes:
+            feedback_entries = [e for e in feedback_entries if e not in _fb_deletes]
+            _rewrite_feedback_log(feedback_entries)
+
+        # Also show DB-based global feedback
+        db_global_fb = _target_feedback(None)
+
+        if feedback_entries:
+            st.markdown("**파일 기반 (레거시)**")
+            for i, entry in enumerate(feedback_entries):
+                col_text, col_del = st.columns([9, 1])
+                with col_text:
+                    st.markdown(entry)
+                with col_del:
+                    st.button("x", key=f"del_fb_{i}", on_click=_queue_feedback_delete, args=(entry,))
+
+        if db_global_fb:
+            for fb in db_global_fb:
+                col_text, col_del = st.columns([9, 1])
+                ts = fb["created_at"][:16] if fb.get("created_at") else ""
+                ps = f"({fb['product_summary']}) " if fb.get("product_summary") else ""
+                with col_text:
+                    st.markdown(f"- [{ts}] {ps}{fb['feedback']}")
+                with col_del:
+                    st.button("x", key=f"del_dbfb_g_{fb['id']}",
+                              on_click=_delete_target_feedback, args=(fb["id"],))
+
+        total_global = len(feedback_entries) + len(db_global_fb)
+        if total_global:
+            st.caption(f"총 {total_global}건")
         else:
-            st.session_state.ai_researcher_verification = None
-            st.session_state.ai_researcher_verdicts = {}
+            st.info("글로벌 피드백이 없습니다.")
+
+    with fb_tab_profile:
+        if not active_pid:
+            st.warning("캠페인 프로필을 먼저 활성화하세요. 이 탭은 활성 프로필 전용 피드백을 관리합니다.")
+        else:
+            st.caption(f"**{active_profile_name}** 프로필에서 타겟 추천할 때만 적용되는 피드백입니다.")
+            profile_fb = _target_feedback(active_pid)
+            if profile_fb:
+                for fb in profile_fb:
+                    col_text, col_del = st.columns([9, 1])
+                    ts = fb["created_at"][:16] if fb.get("created_at") else ""
+                    ps = f"({fb['product_summary']}) " if fb.get("product_summary") else ""
+                    with col_text:
+                        st.markdown(f"- [{ts}] {ps}{fb['feedback']}")
+                    with col_del:
+                        st.button("x", key=f"del_dbfb_p_{fb['id']}",
+                                  on_click=_delete_target_feedback, args=(fb["id"],))
+                st.caption(f"총 {len(profile_fb)}건")
+            else:
+                st.info(f"'{active_profile_name}' 프로필 전용 피드백이 없습니다.")
+
+    # ── Unified feedback input (below tabs) ──────────
+    st.markdown("#### 피드백 추가")
+    manual_fb = st.text_input(
+        "피드백 내용",
+        placeholder="예: CRO/CMO 회사는 항상 제외, 바이오텍만 남겨줘",
+        key="manual_fb_unified",
+    )
+    _uf_c1, _uf_c2, _uf_c3 = st.columns([1, 1, 1])
+    with _uf_c1:
+        _uf_global = st.checkbox("글로벌 (모든 프로필)", value=True, key="uf_scope_global")
+    with _uf_c2:
+        _uf_profile = st.checkbox(
+            f"프로필 전용 ({active_profile_name})" if active_profile_name else "프로필 전용 (미선택)",
+            value=bool(active_pid),
+            key="uf_scope_profile",
+            disabled=not active_pid,
+        )
+    with _uf_c3:
+        st.button("추가", key="add_fb_unified", disabled=not manual_fb or (not _uf_global and not _uf_profile),
+                  on_click=_add_manual_feedback, args=(active_pid,))
+
+
+def _auto_verify_generic(result_text: str, feedback: str, *, tier_keys: tuple[str, str],
+                         verify_iter: str, cross_check_method: str,
+                         state_verification_key: str, state_verdict_key: str,
+                         verdict_id_key: str, entity_label: str, sources: str):
+    """Parse AI result → external verification → Claude cross-check.
+
+    Shared by the company and researcher flows; the keyword arguments name the
+    JSON tier keys, the ResearchClient/ClaudeClient methods, the session-state
+    keys and the verdict id field for each.
+    """
+    parsed = _extract_json_block(result_text)
+    items = (parsed.get(tier_keys[0], []) + parsed.get(tier_keys[1], [])) if parsed else []
+    if not items:
+        st.session_state[state_verification_key] = None
+        st.session_state[state_verdict_key] = {}
+        return
+
+    n = len(items)
+    verify_bar = st.progress(0)
+    verify_status = st.empty()
+
+    # Step 2/3 + 3/3: External data collection, cross-checked in chunks as it arrives
+    verify_status.info(f"⏱ 2/3 — 외부 데이터 수집 중 ({n}{entity_label}: {sources})...")
+    verify_bar.progress(0.1)
+    # Memoize successful runs so a rerun on the same result skips the network
+    memo = st.session_state.setdefault("_verify_memo", {})
+    input_key = _stable_key([verdict_id_key, items, feedback])
+    if input_key in memo:
+        verified, verdicts, errors = memo[input_key]
+    else:
+        verified, verdicts, errors = _verify_and_cross_check(
+            n, getattr(_rc(), verify_iter)(items),
+            _cross_checker(cross_check_method, feedback),
+            verify_bar, verify_status, "⏱ 3/3 — AI 근거 교차검증 중 (Claude 분석)...",
+        )
+        if not errors:
+            memo[input_key] = (verified, verdicts, errors)
+    st.session_state[state_verification_key] = verified
+
+    # Build lookup by company / researcher name
+    verdict_map = {v[verdict_id_key]: v for v in verdicts if verdict_id_key in v}
+    st.session_state[state_verdict_key] = verdict_map
+    n_done = len(verdict_map)
+    if errors:
+        logger.warning(f"{verdict_id_key} cross-check failed for {len(errors)} chunk(s): {errors[0]}")
+    if errors and not verdict_map:
+        verify_bar.progress(0.8)
+        verify_status.warning(f"교차검증 실패: {errors[0]}")
+    elif n_done < n:
+        verify_bar.progress(1.0)
+        verify_status.warning(f"⚠️ {n_done}/{n}{entity_label} 검증 완료 (일부 잘림)")
     else:
-        st.session_state.ai_researcher_verification = None
-        st.session_state.ai_researcher_verdicts = {}
+        verify_bar.progress(1.0)
+        verify_status.success(f"✅ {n}{entity_label} 검증 완료!")
+
+
+def _auto_verify(result_text: str, feedback: str = ""):
+    """Parse AI result → external verification → Claude cross-check."""
+    _auto_verify_generic(
+        result_text, feedback,
+        tier_keys=("tier1_companies", "tier2_companies"),
+        verify_iter="iter_verify_companies",
+        cross_check_method="cross_check_evidence",
+        state_verification_key="ai_target_verification",
+        state_verdict_key="ai_target_verdicts",
+        verdict_id_key="company",
+        entity_label="개 회사",
+        sources="웹 + ClinicalTrials + PubMed",
+    )
+
+
+def _auto_verify_researchers(result_text: str, feedback: str = ""):
+    """Parse AI researcher result → external verification → Claude cross-check."""
+    _auto_verify_generic(
+        result_text, feedback,
+        tier_keys=("tier1_researchers", "tier2_researchers"),
+        verify_iter="iter_verify_researchers",
+        cross_check_method="cross_check_researcher_evidence",
+        state_verification_key="ai_researcher_verification",
+        state_verdict_key="ai_researcher_verdicts",
+        verdict_id_key="researcher",
+        entity_label="명 연구자",
+        sources="웹 + PubMed + ClinicalTrials",
+    )
 
 
 # ── Initialize DB ────────────────────────────────────────
-db.init_db()
+@st.cache_resource(show_spinner=False)
+def _init_db_once() -> bool:
+    """Create/migrate the schema once per process instead of on every rerun."""
+    db.init_db()
+    return True
+
+
+_init_db_once()
 
 # ── Page Config ──────────────────────────────────────────
 st.set_page_config(
@@ -542,24 +1776,18 @@ st.set_page_config(
 )
 
 # ── Session State Initialization ─────────────────────────
-if "generated_md" not in st.session_state:
-    st.session_state.generated_md = None
-if "generated_csv" not in st.session_state:
-    st.session_state.generated_csv = None
-if "review_result" not in st.session_state:
-    st.session_state.review_result = None
-if "csv_data" not in st.session_state:
-    st.session_state.csv_data = None
-if "step" not in st.session_state:
-    st.session_state.step = "input"  # input → generate → review → preview → send
+st.session_state.setdefault("generated_md", None)
+st.session_state.setdefault("generated_csv", None)
+st.session_state.setdefault("review_result", None)
+st.session_state.setdefault("csv_data", None)
+st.session_state.setdefault("step", "input")  # input → generate → review → preview → send
 
 
 # ── Helper Functions ─────────────────────────────────────
 
 def extract_csv_block(text: str) -> str | None:
     """Extract CSV block from Claude's markdown output."""
-    pattern = r"```csv\s*\n(.*?)```"
-    match = re.search(pattern, text, re.DOTALL)
+    match = _CSV_BLOCK_RE.search(text)
     if match:
         csv_text = match.group(1).strip()
         if csv_text.startswith("contact_name,"):
@@ -573,6 +1801,256 @@ def parse_csv_string(csv_string: str) -> list[dict]:
     return list(reader)
 
 
+def _csv_data_rows() -> list[dict]:
+    """Rows of st.session_state.csv_data, parsed once per stored string (identity memo)."""
+    text = st.session_state.get("csv_data") or ""
+    memo = st.session_state.get("_csv_data_rows_memo")
+    if memo is None or memo[0] is not text:
+        memo = st.session_state._csv_data_rows_memo = (text, parse_csv_string(text))
+    return memo[1]
+
+
+_SENDER_FIELD_MAP = {
+    "이름 (영문)": "name_en", "이름 (일본어)": "name_ja",
+    "직함 (영문)": "title_en", "직함 (일본어)": "title_ja",
+    "회사명 (영문)": "company_en", "회사명 (일본어)": "company_ja",
+    "이메일": "email", "전화번호": "phone",
+}
+_SENDER_FIELD_PATTERNS = {
+    key: re.compile(rf"\*\*{re.escape(label)}\*\*:\s*(.+)")
+    for label, key in _SENDER_FIELD_MAP.items()
+}
+_SIG_RE = re.compile(r"## 서명 \((.+?)\)\s*\n+```\n(.*?)```", re.DOTALL)
+
+
+def parse_sender_profile_md(md_text: str) -> dict:
+    """Parse sender_profile.md into sender-profile fields (incl. signature_ja/en)."""
+    parsed = {}
+    for key, pattern in _SENDER_FIELD_PATTERNS.items():
+        m = pattern.search(md_text)
+        if m:
+            parsed[key] = m.group(1).strip()
+    for sig_label, sig_body in _SIG_RE.findall(md_text):
+        if "일본어" in sig_label:
+            parsed["signature_ja"] = sig_body.strip()
+        elif "영문" in sig_label:
+            parsed["signature_en"] = sig_body.strip()
+    return parsed
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_senders() -> list[dict]:
+    """Sender profiles, cached across reruns; call _load_senders.clear() after writes."""
+    return db.get_sender_profiles()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_campaign_profile(profile_id: int) -> dict | None:
+    """One campaign profile, cached; call _load_campaign_profile.clear() after writes."""
+    return db.get_campaign_profile(profile_id)
+
+
+@st.cache_data(ttl=30, max_entries=8, show_spinner=False)
+def _cached_prospects(search_id: int, version: tuple) -> list[dict]:
+    return db.get_prospects(search_id=search_id)
+
+
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def _cached_export_csv(search_id: int, version: tuple) -> str:
+    return db.export_prospects_to_csv(search_id)
+
+
+def _search_prospects(search_id: int | None) -> list[dict]:
+    """Prospects of a search, re-read only when db.get_prospects_version changes."""
+    if not search_id:
+        return []
+    return _cached_prospects(search_id, db.get_prospects_version(search_id))
+
+
+@st.cache_data(ttl=30, max_entries=8, show_spinner=False)
+def _cached_research_contexts(search_id: int, version: tuple) -> dict[str, dict]:
+    contexts = {}
+    for p in db.get_prospects(search_id=search_id):
+        if p.get("research_context") and p["company"] not in contexts:
+            contexts[p["company"]] = _loads(p["research_context"])
+    return contexts
+
+
+def _company_research_contexts(search_id: int | None) -> dict[str, dict]:
+    """First parsed research context per company of a search, in prospect order.
+
+    Parsed once per db.get_prospects_version, like _search_prospects.
+    """
+    if not search_id:
+        return {}
+    return _cached_research_contexts(search_id, db.get_prospects_version(search_id))
+
+
+@st.cache_data(ttl=30, max_entries=8, show_spinner=False)
+def _cached_prospects_df(search_id: int, version: tuple):
+    return pd.DataFrame(db.get_prospects(search_id=search_id))
+
+
+def _search_prospects_df(search_id: int | None):
+    """_search_prospects as a DataFrame, for step metrics and tables."""
+    if not search_id:
+        return pd.DataFrame()
+    return _cached_prospects_df(search_id, db.get_prospects_version(search_id))
+
+
+def _filled(df, col: str):
+    """Rows whose col is set and non-empty: the vectorized `p.get(col)` truth test."""
+    s = df.reindex(columns=[col])[col]
+    return s.notna() & s.ne("")
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _combined_feedback(profile_id: int | None) -> str:
+    """Combined target feedback text, cached; call _invalidate_feedback() after writes."""
+    return db.get_combined_feedback_text(profile_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _target_feedback(profile_id: int | None) -> list[dict]:
+    """Target feedback rows for one scope, cached; call _invalidate_feedback() after writes."""
+    return db.get_target_feedback(profile_id=profile_id)
+
+
+def _invalidate_feedback():
+    """Drop target-feedback caches; call after any target feedback write."""
+    _combined_feedback.clear()
+    _target_feedback.clear()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_presets() -> list[dict]:
+    """Saved search presets, cached; call _invalidate_presets() after writes."""
+    return db.get_presets()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _presets_by_label() -> dict[str, dict]:
+    """Saved presets keyed by selectbox label ("🎓"/"🏢" + name), in _load_presets() order."""
+    return {
+        f"{'🎓' if sp.get('preset_type') == 'researcher' else '🏢'} {sp['name']}": sp
+        for sp in _load_presets()
+    }
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _preset_company_set() -> frozenset[str]:
+    """All company names across saved presets (for the exclusion checkbox)."""
+    return frozenset(
+        c.strip()
+        for p in _load_presets()
+        for c in (p.get("companies") or "").split(",")
+        if c.strip()
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _preset_company_help() -> str:
+    """Help text for the preset exclusion checkbox (first 8 names)."""
+    companies = _preset_company_set()
+    more = "..." if len(companies) > 8 else ""
+    return f"저장된 프리셋: {', '.join(islice(companies, 8))}{more}"
+
+
+def _names_preview(names: list[str], limit: int = 10) -> str:
+    """First `limit` names joined for a preview, with '...' when truncated."""
+    more = "..." if len(names) > limit else ""
+    return f"{', '.join(islice(names, limit))}{more}"
+
+
+def _invalidate_presets():
+    """Drop preset-derived caches; call after any preset write."""
+    _load_presets.clear()
+    _presets_by_label.clear()
+    _preset_company_set.clear()
+    _preset_company_help.clear()
+
+
+def _reset_results(prefix: str, **extra):
+    """Clear one AI result set (<prefix>_result/_parsed/_verification/_verdicts) in a single update.
+
+    extra are further session keys to set alongside, e.g. ai_web_context="".
+    """
+    st.session_state.update({
+        f"{prefix}_result": None,
+        f"{prefix}_parsed": None,
+        f"{prefix}_verification": None,
+        f"{prefix}_verdicts": {},  # fresh dict per call, never shared
+        **extra,
+    })
+
+
+def _release_heavy_state(*keys: str):
+    """Drop large session-state entries so they are freed now, not at session end.
+
+    Pages re-create their defaults via setdefault on the next run, so callers
+    should rerun (or be on their way to another page) after releasing.
+    """
+    for key in keys:
+        st.session_state.pop(key, None)
+
+
+# ── Agent 2 request builders (called only when the run button is clicked) ──
+# Each returns (request text, number of companies/researchers in it).
+def _a2_request_from_manual(companies_text: str, titles: str, region: str) -> tuple[str, int]:
+    """Agent 2 request from the 직접 입력 tab's newline-separated company list."""
+    companies = [c.strip() for c in companies_text.strip().split("\n") if c.strip()]
+    parts = [f"다음 {len(companies)}개 회사에서 이메일을 찾아줘 (전부 빠짐없이 처리할 것): {', '.join(companies)}"]
+    if titles.strip():
+        parts.append(f"타겟 직함: {titles}")
+    if region.strip():
+        parts.append(f"지역: {region}")
+    return "\n".join(parts), len(companies)
+
+
+def _a2_request_from_agent1(tier1: list[dict], tier2: list[dict], use_tier1: bool, use_tier2: bool,
+                            dm_titles: list[str]) -> tuple[str, int]:
+    """Agent 2 request from the selected tiers of the Agent 1 result."""
+    selected_companies = []
+    tier_label = []
+    if use_tier1:
+        selected_companies.extend([c["name"] for c in tier1])
+        tier_label.append(f"Tier 1 {len(tier1)}개")
+    if use_tier2:
+        selected_companies.extend([c["name"] for c in tier2])
+        tier_label.append(f"Tier 2 {len(tier2)}개")
+    parts = [
+        f"다음 {len(selected_companies)}개 회사에서 이메일을 찾아줘 ({', '.join(tier_label)}, 전부 빠짐없이 처리할 것):",
+        ", ".join(selected_companies),
+    ]
+    if dm_titles:
+        parts.append(f"타겟 직함: {', '.join(dm_titles[:5])}")
+    return "\n".join(parts), len(selected_companies)
+
+
+def _a2_request_from_preset(sel: dict) -> tuple[str, int]:
+    """Agent 2 request from a saved company or researcher preset."""
+    is_researcher = sel.get("preset_type") == "researcher"
+    companies_list = [c.strip() for c in (sel.get("companies") or "").split(",") if c.strip()]
+    if is_researcher:
+        parts = [f"다음 {len(companies_list)}명의 연구자 이메일을 찾아줘 (전부 빠짐없이 처리할 것): {', '.join(companies_list)}"]
+    else:
+        parts = [f"다음 {len(companies_list)}개 회사에서 이메일을 찾아줘 (전부 빠짐없이 처리할 것): {', '.join(companies_list)}"]
+    if sel.get("titles"):
+        parts.append(f"타겟 직함: {sel['titles']}")
+    if sel.get("locations"):
+        parts.append(f"지역: {sel['locations']}")
+    if sel.get("keywords"):
+        parts.append(f"키워드: {sel['keywords']}")
+    if sel.get("industry"):
+        _label = "연구 분야" if is_researcher else "산업"
+        parts.append(f"{_label}: {sel['industry']}")
+    if is_researcher:
+        if sel.get("institutions"):
+            parts.append(f"참고 기관: {sel['institutions']}")
+        parts.append("이 사람들은 학술 연구자입니다. 대학/연구기관 도메인에서 이메일을 찾아주세요.")
+    return "\n".join(parts), len(companies_list)
+
+
 def load_products() -> dict[int, str]:
     """Deprecated: product info now comes from campaign profile.
     Kept for backward compatibility but returns empty dict."""
@@ -583,20 +2061,32 @@ def get_all_campaigns() -> list[dict]:
     """Get all campaigns from the database."""
     conn = db.get_connection()
     rows = conn.execute("SELECT * FROM campaigns ORDER BY id DESC").fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
+def _output_csv_version() -> int:
+    """Return the newest mtime among output CSVs (0 if none) for cache invalidation."""
+    try:
+        return max((f.stat().st_mtime_ns for f in OUTPUT_DIR.glob("*.csv")), default=0)
+    except OSError:
+        return 0
+
+
 def _find_sent_email_body(email_address: str) -> str:
     """Find the original email body we sent to this address from output CSVs or DB."""
-    # 1. Try local DB first
+    return _lookup_sent_email_body(email_address, _output_csv_version())
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _lookup_sent_email_body(email_address: str, csv_version: int) -> str:
+    """Cached body of _find_sent_email_body; csv_version only keys the cache."""
+    # 1. Try local DB first (indexed on recipients.email)
     try:
         conn = db.get_connection()
         row = conn.execute(
             "SELECT subject, body FROM recipients WHERE email = ? ORDER BY created_at DESC LIMIT 1",
             (email_address,),
         ).fetchone()
-        conn.close()
         if row and row["body"]:
             return f"Subject: {row['subject']}\n\n{row['body']}"
     except Exception:
@@ -607,13 +2097,20 @@ def _find_sent_email_body(email_address: str) -> str:
         csv_files = sorted(OUTPUT_DIR.glob("*final*.csv"), reverse=True)
         csv_files += sorted(OUTPUT_DIR.glob("*mailmerge*.csv"), reverse=True)
         for csv_file in csv_files:
-            content = csv_file.read_text(encoding="utf-8-sig")
-            rows = parse_csv_string(content)
-            for row in rows:
-                if row.get("email", "") == email_address:
-                    subject = row.get("subject", "")
-                    body = row.get("body", "").replace("<br>", "\n")
-                    return f"Subject: {subject}\n\n{body}"
+            # Stream rows and stop at the first hit instead of building a dict per row
+            with csv_file.open("r", encoding="utf-8-sig", newline="") as f:
+                rdr = csv.reader(f)
+                header = next(rdr, None)
+                if not header or "email" not in header:
+                    continue
+                ei = header.index("email")
+                si = header.index("subject") if "subject" in header else None
+                bi = header.index("body") if "body" in header else None
+                for row in rdr:
+                    if len(row) > ei and row[ei] == email_address:
+                        subject = row[si] if si is not None and si < len(row) else ""
+                        body = row[bi] if bi is not None and bi < len(row) else ""
+                        return f"Subject: {subject}\n\n{body.replace('<br>', chr(10))}"
     except Exception:
         pass
 
@@ -644,13 +2141,25 @@ def build_campaign_context(profile: dict | None) -> str:
     return "\n".join(parts)
 
 
+# Campaign profile / outreach selectbox options
+_CTA_OPTIONS = (
+    "자동 선택",
+    "담당자 추천 요청 (기본)",
+    "15분 대화 요청 (탐색형)",
+    "피드백/의견 요청 (Design Partner)",
+    "자료/인사이트 공유 제안",
+    "Zoom/Web 미팅 제안",
+    "직접 입력",
+)
+_TONE_OPTIONS = ("professional", "casual", "formal", "friendly")
+_LANG_OPTIONS = ("en", "ja", "ko")
+_TARGET_MODE_LABELS = {"company": "🏢 회사 타겟", "researcher": "🎓 연구자 타겟"}
+
+
 # ── Session state for reply context ──────────────────────
-if "reply_context" not in st.session_state:
-    st.session_state.reply_context = None
-if "active_page" not in st.session_state:
-    st.session_state.active_page = None
-if "agent_running" not in st.session_state:
-    st.session_state.agent_running = False
+st.session_state.setdefault("reply_context", None)
+st.session_state.setdefault("active_page", None)
+st.session_state.setdefault("agent_running", False)
 
 # ── Sidebar: Navigation ─────────────────────────────────
 st.sidebar.title("Cold Email Manager")
@@ -677,9 +2186,16 @@ page = st.sidebar.radio(
     label_visibility="collapsed",
 )
 
+# Verification memo is only consulted by a re-run on the same page; it holds a
+# full copy of every verified result, so let it go when the user leaves.
+if st.session_state.get("_last_page") != page:
+    _release_heavy_state("_verify_memo")
+    st.session_state._last_page = page
+
 # ── Agent running lock (CSS overlay via 2-phase rerun) ──────────
-# On the rerun where agent_running=True, this CSS renders BEFORE the blocking
-# agent.run() call, so the overlay is visible during execution.
+# For the agents that still run inline: on the rerun where agent_running=True,
+# this CSS renders BEFORE their blocking agent.run() call, so the overlay is
+# visible during execution. Agent 1 runs on _agent_pool and never sets it.
 if st.session_state.get("agent_running"):
     st.markdown("""
     <style>
@@ -702,18 +2218,14 @@ if st.session_state.get("agent_running"):
     """, unsafe_allow_html=True)
 
 # ── Sidebar: Active campaign profile indicator ─────────
-if "active_profile_id" not in st.session_state:
-    st.session_state.active_profile_id = None
-if "active_profile" not in st.session_state:
-    st.session_state.active_profile = None
-if "active_sender_id" not in st.session_state:
-    st.session_state.active_sender_id = None
-if "active_sender" not in st.session_state:
-    st.session_state.active_sender = None
+st.session_state.setdefault("active_profile_id", None)
+st.session_state.setdefault("active_profile", None)
+st.session_state.setdefault("active_sender_id", None)
+st.session_state.setdefault("active_sender", None)
 
 # Load active profile
 if st.session_state.active_profile_id:
-    _ap = db.get_campaign_profile(st.session_state.active_profile_id)
+    _ap = _load_campaign_profile(st.session_state.active_profile_id)
     if _ap:
         st.session_state.active_profile = _ap
         st.sidebar.divider()
@@ -766,6 +2278,7 @@ if page == "⚙️ 캠페인 설정":
             with pcol3:
                 if st.button("삭제", key=f"del_profile_{p['id']}"):
                     db.delete_campaign_profile(p["id"])
+                    _load_campaign_profile.clear()
                     if st.session_state.active_profile_id == p["id"]:
                         st.session_state.active_profile_id = None
                         st.session_state.active_profile = None
@@ -811,7 +2324,7 @@ if page == "⚙️ 캠페인 설정":
                 "제품/서비스 이름",
                 placeholder="예: AI Drug Discovery Platform",
             )
-            cp_language = st.selectbox("언어", ["en", "ja", "ko"], index=0)
+            cp_language = st.selectbox("언어", _LANG_OPTIONS, index=0)
 
         with cp_col2:
             cp_target_region = st.text_input(
@@ -820,21 +2333,13 @@ if page == "⚙️ 캠페인 설정":
             )
             cp_cta_type = st.selectbox(
                 "CTA 유형",
-                [
-                    "자동 선택",
-                    "담당자 추천 요청 (기본)",
-                    "15분 대화 요청 (탐색형)",
-                    "피드백/의견 요청 (Design Partner)",
-                    "자료/인사이트 공유 제안",
-                    "Zoom/Web 미팅 제안",
-                    "직접 입력",
-                ],
+                _CTA_OPTIONS,
             )
             if cp_cta_type == "직접 입력":
                 cp_cta_type = st.text_input("CTA (직접 입력)", placeholder="예: 3월 도쿄 방문 시 30분 미팅 가능 여부 확인")
             cp_tone = st.selectbox(
                 "톤",
-                ["professional", "casual", "formal", "friendly"],
+                _TONE_OPTIONS,
                 index=0,
             )
 
@@ -848,29 +2353,13 @@ if page == "⚙️ 캠페인 설정":
             height=120,
         )
 
-        _existing_senders = db.get_sender_profiles()
-        # Auto-import sender_profile.md if no profiles exist yet
-        if not _existing_senders:
+        _existing_senders = _load_senders()
+        # Auto-import sender_profile.md if no profiles exist yet (once per session)
+        if not _existing_senders and not st.session_state.setdefault("_sender_md_imported", False):
+            st.session_state._sender_md_imported = True
             _sp_md_path = DATA_DIR / "sender_profile.md"
             if _sp_md_path.exists():
-                _md_text = _sp_md_path.read_text(encoding="utf-8")
-                _field_map = {
-                    "이름 (영문)": "name_en", "이름 (일본어)": "name_ja",
-                    "직함 (영문)": "title_en", "직함 (일본어)": "title_ja",
-                    "회사명 (영문)": "company_en", "회사명 (일본어)": "company_ja",
-                    "이메일": "email", "전화번호": "phone",
-                }
-                _parsed = {}
-                for _label, _key in _field_map.items():
-                    _m = re.search(rf"\*\*{re.escape(_label)}\*\*:\s*(.+)", _md_text)
-                    if _m:
-                        _parsed[_key] = _m.group(1).strip()
-                _sig_blocks = re.findall(r"## 서명 \((.+?)\)\s*\n+```\n(.*?)```", _md_text, re.DOTALL)
-                for _sig_label, _sig_body in _sig_blocks:
-                    if "일본어" in _sig_label:
-                        _parsed["signature_ja"] = _sig_body.strip()
-                    elif "영문" in _sig_label:
-                        _parsed["signature_en"] = _sig_body.strip()
+                _parsed = parse_sender_profile_md(_sp_md_path.read_text(encoding="utf-8"))
                 _pname = f"{_parsed.get('name_en', '')} ({_parsed.get('company_en', '')})".strip()
                 if not _pname or _pname == "()":
                     _pname = "Default Profile"
@@ -888,20 +2377,22 @@ if page == "⚙️ 캠페인 설정":
                         signature_ja=_parsed.get("signature_ja", ""),
                         signature_en=_parsed.get("signature_en", ""),
                     )
-                    _existing_senders = db.get_sender_profiles()
+                    _load_senders.clear()
+                    _existing_senders = _load_senders()
                 except Exception:
                     pass
-        _sender_options = ["직접 입력"] + [f"{s['name']} ({s.get('name_en', '')})" for s in _existing_senders]
-        _sender_choice = st.selectbox("발신자 프로필", _sender_options)
-        if _sender_choice == "직접 입력":
+        _sender_labels = ["직접 입력", *(f"{s['name']} ({s.get('name_en', '')})" for s in _existing_senders)]
+        # Option values are indices into _sender_labels (0 = 직접 입력), so no reverse lookup
+        _sender_choice = st.selectbox("발신자 프로필", range(len(_sender_labels)),
+                                      format_func=_sender_labels.__getitem__)
+        if _sender_choice == 0:
             cp_sender_context = st.text_area(
                 "발신자 소개 (직접 입력)",
                 placeholder="예: RISORIUS Inc. 공동창업자, AI/ML 기반 제약 솔루션 전문",
                 height=60,
             )
         else:
-            _sender_idx = _sender_options.index(_sender_choice) - 1
-            _selected_sender = _existing_senders[_sender_idx]
+            _selected_sender = _existing_senders[_sender_choice - 1]
             cp_sender_context = f"{_selected_sender.get('name_en', '')} | {_selected_sender.get('title_en', '')} | {_selected_sender.get('company_en', '')} | {_selected_sender.get('email', '')}"
             st.caption(f"선택됨: {cp_sender_context}")
 
@@ -930,6 +2421,7 @@ if page == "⚙️ 캠페인 설정":
                     sender_context=cp_sender_context.strip(),
                     extra_notes=cp_extra.strip(),
                 )
+                _load_campaign_profile.clear()
                 st.session_state.active_profile_id = new_id
                 st.success(f"프로필 '{cp_name}' 저장 완료! 자동으로 활성화되었습니다.")
                 st.rerun()
@@ -944,25 +2436,19 @@ elif page == "🎯 타겟 발굴":
 
     target_mode = st.radio(
         "타겟 유형", ["company", "researcher"],
-        format_func={"company": "🏢 회사 타겟", "researcher": "🎓 연구자 타겟"}.__getitem__,
+        format_func=_TARGET_MODE_LABELS.__getitem__,
         horizontal=True, key="target_mode", label_visibility="collapsed",
     )
 
     if target_mode == "company":
         st.caption("제품 설명을 입력하면 AI가 적합한 회사와 직종을 추천하고, 프리셋으로 저장합니다.")
 
-        if "ai_target_result" not in st.session_state:
-            st.session_state.ai_target_result = None
-        if "ai_target_verification" not in st.session_state:
-            st.session_state.ai_target_verification = None
-        if "ai_target_verdicts" not in st.session_state:
-            st.session_state.ai_target_verdicts = {}
-        if "agent_log" not in st.session_state:
-            st.session_state.agent_log = []
-        if "ai_target_parsed" not in st.session_state:
-            st.session_state.ai_target_parsed = None
-        if "_regen_preset" not in st.session_state:
-            st.session_state._regen_preset = None
+        st.session_state.setdefault("ai_target_result", None)
+        st.session_state.setdefault("ai_target_verification", None)
+        st.session_state.setdefault("ai_target_verdicts", {})
+        st.session_state.setdefault("agent_log", [])
+        st.session_state.setdefault("ai_target_parsed", None)
+        st.session_state.setdefault("_regen_preset", None)
 
         # ── Input Section ─────────────────────────────
         st.subheader("제품/서비스 정보")
@@ -989,32 +2475,31 @@ elif page == "🎯 타겟 발굴":
             )
 
         # Collect companies for exclusion option (from presets + current results)
-        _existing_presets = db.get_presets()
-        _preset_companies = set()
-        for p in _existing_presets:
-            for c in (p.get("companies") or "").split(","):
-                c = c.strip()
-                if c:
-                    _preset_companies.add(c)
+        _preset_companies = _preset_company_set()
 
         _current_companies = set()
-        if st.session_state.ai_target_parsed:
-            for c in st.session_state.ai_target_parsed.get("tier1_companies", []):
-                _current_companies.add(c.get("name", ""))
-            for c in st.session_state.ai_target_parsed.get("tier2_companies", []):
-                _current_companies.add(c.get("name", ""))
-            _current_companies.discard("")
-
-        _all_excludable = _preset_companies | _current_companies
+        _tp = st.session_state.ai_target_parsed
+        if _tp:
+            _t1, _t2 = _tp.get("tier1_companies", []), _tp.get("tier2_companies", [])
+            # Memoized on the result's identity (held, not its id(), so a freed
+            # dict's address can't match a new parse); tier moves keep the union
+            # unchanged, deletes change a length
+            _cc_lens = (len(_t1), len(_t2))
+            _cc_cache = st.session_state.get("_current_companies_cache")
+            if _cc_cache and _cc_cache[0] is _tp and _cc_cache[1] == _cc_lens:
+                _current_companies = _cc_cache[2]
+            else:
+                _current_companies = {c.get("name", "") for c in chain(_t1, _t2)} - {""}
+                st.session_state._current_companies_cache = (_tp, _cc_lens, _current_companies)
 
         exclude_companies_set = set()
-        if _all_excludable:
+        if _preset_companies or _current_companies:
             ecol1, ecol2 = st.columns(2)
             with ecol1:
                 if _preset_companies:
                     if st.checkbox(
                         f"프리셋 회사 제외 ({len(_preset_companies)}개)",
-                        help=f"저장된 프리셋: {', '.join(list(_preset_companies)[:8])}{'...' if len(_preset_companies) > 8 else ''}",
+                        help=_preset_company_help(),
                     ):
                         exclude_companies_set |= _preset_companies
             with ecol2:
@@ -1025,7 +2510,7 @@ elif page == "🎯 타겟 발굴":
                     ):
                         exclude_companies_set |= _current_companies
 
-        if st.button("🤖 AI 타겟 추천 실행", type="primary", disabled=not ai_product_desc or st.session_state.get("agent_running")):
+        if st.button("🤖 AI 타겟 추천 실행", type="primary", disabled=not ai_product_desc or st.session_state.get("agent_running") or "_agent1_job" in st.session_state):
             # Combine product desc with hint
             full_desc = ai_product_desc
             if ai_target_hint:
@@ -1037,7 +2522,7 @@ elif page == "🎯 타겟 발굴":
             if exclude_companies:
                 exclude_section = (
                     f"\n\n제외 대상 회사 (절대 추천하지 말 것): "
-                    f"{', '.join(exclude_companies[:30])}"
+                    f"{', '.join(islice(exclude_companies, 30))}"
                 )
 
             region_line = f"\n지역 제한: {ai_region}" if ai_region else ""
@@ -1052,22 +2537,15 @@ elif page == "🎯 타겟 발굴":
                 f"결과를 Tier 1/Tier 2로 분류하고 save_results로 저장해줘."
             )
 
-            # Phase 1: save params and rerun to show overlay
+            # Start Agent 1 on a worker thread; the page stays usable while it runs
             _run_profile_id = st.session_state.get("active_profile_id")
-            st.session_state._pending_agent1 = {
+            _task = {
                 "request": agent_request,
-                "feedback": db.get_combined_feedback_text(_run_profile_id),
+                "feedback": _combined_feedback(_run_profile_id),
             }
-            st.session_state.agent_running = True
-            st.rerun()
-
-        # Phase 2: execute pending Agent 1 task (overlay is already visible)
-        if st.session_state.get("_pending_agent1"):
-            _task = st.session_state.pop("_pending_agent1")
             try:
-                from agent import CompanyListingAgent
-
                 tracker = AgentProgressTracker("agent1")
+                tracker.pause_rendering()  # the worker only updates tracker.state
 
                 agent = CompanyListingAgent(
                     extra_feedback=_task["feedback"],
@@ -1075,37 +2553,21 @@ elif page == "🎯 타겟 발굴":
                     on_tool_result=tracker.on_tool_result,
                     on_text=tracker.on_text,
                 )
-
-                agent_output = agent.run(_task["request"])
-
-                st.session_state.agent_log = tracker.tool_log
-
-                # Use saved JSON result if available, otherwise try parsing agent output
-                result_json = agent.result_json
-                if result_json:
-                    st.session_state.ai_target_result = result_json
-                else:
-                    st.session_state.ai_target_result = agent_output
-
-                st.session_state.ai_target_parsed = None
-                st.session_state.ai_target_verification = None
-                st.session_state.ai_target_verdicts = {}
-
-                tracker.complete("타겟 탐색 완료! 근거 검증 시작...")
-
-                # Auto-verify immediately after agent completes
-                _auto_verify(st.session_state.ai_target_result, feedback=_task["feedback"])
-
+                st.session_state._agent1_job = {
+                    "future": _agent_pool().submit(agent.run, _task["request"]),
+                    "agent": agent,
+                    "tracker": tracker,
+                    "feedback": _task["feedback"],
+                }
             except Exception as e:
-                if 'tracker' in dir():
-                    tracker.fail(f"AI 타겟 추천 실패: {e}")
-                else:
-                    st.error(f"AI 타겟 추천 실패: {e}")
-                import traceback
+                st.error(f"AI 타겟 추천 실패: {e}")
                 st.code(traceback.format_exc())
-            finally:
-                st.session_state.agent_running = False
-            st.rerun()
+            else:
+                st.rerun()
+
+        # Poll the running Agent 1 task until it finishes
+        if st.session_state.get("_agent1_job"):
+            _poll_agent1_job()
 
         # ── Results Section ───────────────────────────
         if st.session_state.ai_target_result:
@@ -1114,19 +2576,7 @@ elif page == "🎯 타겟 발굴":
 
             # Parse JSON on first load, then use editable copy
             if st.session_state.ai_target_parsed is None:
-                json_match = re.search(r"```json\s*\n(.*?)```", result_text, re.DOTALL)
-                parsed = None
-                if json_match:
-                    try:
-                        parsed = json.loads(json_match.group(1))
-                    except json.JSONDecodeError:
-                        pass
-                if not parsed:
-                    try:
-                        parsed = json.loads(result_text)
-                    except json.JSONDecodeError:
-                        pass
-                st.session_state.ai_target_parsed = parsed
+                st.session_state.ai_target_parsed = _extract_json_block(result_text)
 
             parsed = st.session_state.ai_target_parsed
 
@@ -1137,176 +2587,14 @@ elif page == "🎯 타겟 발굴":
                 # Show agent activity log
                 if st.session_state.agent_log:
                     with st.expander(f"Agent 활동 로그 ({len(st.session_state.agent_log)}건)", expanded=False):
-                        st.code("\n".join(st.session_state.agent_log), language=None)
+                        st.code(_log_text("agent_log"), language=None)
 
                 # Show analysis if present
                 if parsed.get("analysis"):
                     with st.expander("제품 분석", expanded=True):
                         st.markdown(parsed["analysis"])
 
-                tier1 = parsed.get("tier1_companies", [])
-                tier2 = parsed.get("tier2_companies", [])
-
-                # Build verification + verdict lookups
-                _vmap = {}
-                if st.session_state.ai_target_verification:
-                    for v in st.session_state.ai_target_verification:
-                        _vmap[v.get("name", "")] = v.get("verification", {})
-                _verdict_map = st.session_state.get("ai_target_verdicts", {})
-
-                _tier_tab = st.radio(
-                    "결과 보기",
-                    ["tier1", "tier2", "titles"],
-                    format_func=lambda x: {
-                        "tier1": f"Tier 1 ({len(tier1)}개)",
-                        "tier2": f"Tier 2 ({len(tier2)}개)",
-                        "titles": "추천 직종",
-                    }[x],
-                    horizontal=True,
-                    label_visibility="collapsed",
-                    key="ai_target_tier_tab",
-                )
-
-                if _tier_tab == "tier1":
-                    if tier1:
-                        for idx, c in enumerate(tier1):
-                            col_card, col_actions = st.columns([5, 1])
-                            with col_card:
-                                _render_company_card(c, _vmap.get(c["name"]), _verdict_map.get(c["name"]))
-                            with col_actions:
-                                st.write("")  # spacing
-                                if st.button("→ T2", key=f"t1to2_{idx}", help="Tier 2로 이동"):
-                                    company = tier1.pop(idx)
-                                    tier2.append(company)
-                                    st.rerun()
-                                if st.button("삭제", key=f"del_t1_{idx}", help="목록에서 제거"):
-                                    tier1.pop(idx)
-                                    st.rerun()
-                    else:
-                        st.info("Tier 1 회사 없음")
-
-                elif _tier_tab == "tier2":
-                    if tier2:
-                        for idx, c in enumerate(tier2):
-                            col_card, col_actions = st.columns([5, 1])
-                            with col_card:
-                                _render_company_card(c, _vmap.get(c["name"]), _verdict_map.get(c["name"]))
-                            with col_actions:
-                                st.write("")  # spacing
-                                if st.button("→ T1", key=f"t2to1_{idx}", help="Tier 1으로 이동"):
-                                    company = tier2.pop(idx)
-                                    tier1.append(company)
-                                    st.rerun()
-                                if st.button("삭제", key=f"del_t2_{idx}", help="목록에서 제거"):
-                                    tier2.pop(idx)
-                                    st.rerun()
-                    else:
-                        st.info("Tier 2 회사 없음")
-
-                else:  # titles
-                    dm = parsed.get("decision_makers", [])
-                    eu = parsed.get("end_users", [])
-                    if dm:
-                        st.markdown("**의사결정자 (Decision Makers):**")
-                        for t in dm:
-                            st.markdown(f"- {t}")
-                    if eu:
-                        st.markdown("**실제 사용자 (End Users):**")
-                        for t in eu:
-                            st.markdown(f"- {t}")
-
-                # ── Verification Summary ──────────────
-                if _verdict_map:
-                    st.divider()
-                    st.subheader("근거 교차검증 결과")
-                    st.caption("외부 데이터(웹 + ClinicalTrials + PubMed) 수집 후 Claude가 AI 근거와 비교 분석")
-
-                    total_v = len(_verdict_map)
-                    confirmed = sum(1 for v in _verdict_map.values() if v.get("verdict") == "confirmed")
-                    v_partial = sum(1 for v in _verdict_map.values() if v.get("verdict") == "partial")
-                    unverified = sum(1 for v in _verdict_map.values() if v.get("verdict") == "unverified")
-                    wrong = sum(1 for v in _verdict_map.values() if v.get("verdict") == "wrong")
-
-                    vcol1, vcol2, vcol3, vcol4 = st.columns(4)
-                    vcol1.metric("✅ 확인됨", f"{confirmed}/{total_v}")
-                    vcol2.metric("⚠️ 일부 확인", f"{v_partial}/{total_v}")
-                    vcol3.metric("❓ 미검증", f"{unverified}/{total_v}")
-                    vcol4.metric("❌ 불일치", f"{wrong}/{total_v}")
-
-                    if wrong > 0:
-                        st.error(f"{wrong}개 회사의 AI 근거가 외부 데이터와 불일치합니다. 해당 회사를 확인하세요.")
-                    if unverified > 0:
-                        st.warning(f"{unverified}개 회사는 외부 데이터가 부족하여 검증 불가합니다.")
-                elif st.session_state.ai_target_verification:
-                    st.divider()
-                    st.subheader("근거 검증 결과")
-                    st.caption("외부 데이터 수집 완료 (교차검증 미완료)")
-
-                    total_v = len(st.session_state.ai_target_verification)
-                    verified = sum(1 for v in st.session_state.ai_target_verification
-                                   if v.get("verification", {}).get("status") == "verified")
-                    partial = sum(1 for v in st.session_state.ai_target_verification
-                                  if v.get("verification", {}).get("status") == "partial")
-                    no_data = sum(1 for v in st.session_state.ai_target_verification
-                                  if v.get("verification", {}).get("status") == "no_data")
-
-                    vcol1, vcol2, vcol3 = st.columns(3)
-                    vcol1.metric("검증됨", f"{verified}/{total_v}")
-                    vcol2.metric("일부 확인", f"{partial}/{total_v}")
-                    vcol3.metric("데이터 없음", f"{no_data}/{total_v}")
-
-                # ── Export Results as Markdown ─────────
-                st.divider()
-                st.subheader("결과 내보내기")
-
-                def _build_company_export_md():
-                    lines = [f"# 타겟 회사 추천 결과\n"]
-                    lines.append(f"**제품 요약:** {parsed.get('product_summary', '')}\n")
-                    _exp_analysis = parsed.get("analysis", "")
-                    if _exp_analysis:
-                        lines.append(f"## 분석\n{_exp_analysis}\n")
-
-                    for tier_label, tier_list, tier_name in [
-                        ("Tier 1 (핵심 타겟)", tier1, "tier1"),
-                        ("Tier 2 (잠재적 타겟)", tier2, "tier2"),
-                    ]:
-                        lines.append(f"## {tier_label} — {len(tier_list)}개\n")
-                        for i, c in enumerate(tier_list, 1):
-                            c_name = c.get("name", "")
-                            lines.append(f"### {i}. {c_name}")
-                            if c.get("reason"):
-                                lines.append(f"- **요약:** {c['reason']}")
-                            if c.get("evidence"):
-                                lines.append(f"- **근거:** {c['evidence']}")
-                            if c.get("tier_reason"):
-                                lines.append(f"- **Tier 산정:** {c['tier_reason']}")
-                            # Add verdict if available
-                            _v = _verdict_map.get(c_name, {})
-                            if _v:
-                                _emoji = {"confirmed": "✅", "partial": "⚠️", "unverified": "❓", "wrong": "❌"}.get(_v.get("verdict", ""), "")
-                                lines.append(f"- **교차검증:** {_emoji} {_v.get('verdict', '')} — {_v.get('explanation', '')}")
-                            lines.append("")
-
-                    dm = parsed.get("decision_makers", [])
-                    eu = parsed.get("end_users", [])
-                    if dm or eu:
-                        lines.append("## 추천 직종\n")
-                        if dm:
-                            lines.append(f"**의사결정자:** {', '.join(dm)}")
-                        if eu:
-                            lines.append(f"**실제 사용자:** {', '.join(eu)}")
-                        lines.append("")
-
-                    return "\n".join(lines)
-
-                _export_md = _build_company_export_md()
-                st.download_button(
-                    "📥 Markdown으로 내보내기",
-                    data=_export_md,
-                    file_name="target_companies_result.md",
-                    mime="text/markdown",
-                    key="export_company_md",
-                )
+                _render_company_results(parsed, ai_product_desc, ai_target_hint, ai_region)
 
                 # ── Feedback Section ───────────────────
                 st.divider()
@@ -1331,21 +2619,20 @@ elif page == "🎯 타겟 발굴":
                         help="활성 프로필에서만 적용",
                     )
                 with fcol2:
-                    if st.button("🔄 피드백 반영 재추천", type="primary", disabled=not ai_feedback or st.session_state.get("agent_running")):
+                    if st.button("🔄 피드백 반영 재추천", type="primary", disabled=not ai_feedback or st.session_state.get("agent_running") or "_agent1_job" in st.session_state):
                         # Save feedback to DB — global and/or profile-specific
                         _active_pid = st.session_state.get("active_profile_id")
+                        _fb_scopes = []
                         if _fb_global:
-                            db.add_target_feedback(
-                                ai_feedback,
-                                product_summary=parsed.get("product_summary", ""),
-                                profile_id=None,
-                            )
+                            _fb_scopes.append(None)
                         if _fb_profile and _active_pid:
-                            db.add_target_feedback(
-                                ai_feedback,
-                                product_summary=parsed.get("product_summary", ""),
-                                profile_id=_active_pid,
-                            )
+                            _fb_scopes.append(_active_pid)
+                        db.add_target_feedback_scopes(
+                            ai_feedback,
+                            _fb_scopes,
+                            product_summary=parsed.get("product_summary", ""),
+                        )
+                        _invalidate_feedback()
                         prev_json = json.dumps(parsed, ensure_ascii=False)
                         full_desc = ai_product_desc or ""
                         if ai_target_hint:
@@ -1364,17 +2651,20 @@ elif page == "🎯 타겟 발굴":
                                 f"필요하면 추가 웹 리서치를 해도 좋아. "
                                 f"최종 결과는 반드시 save_results로 저장해줘."
                             ),
-                            "feedback": db.get_combined_feedback_text(_fb_run_pid),
+                            "feedback": _combined_feedback(_fb_run_pid),
                         }
                         st.session_state.agent_running = True
                         st.rerun()
+                with fcol3:
+                    if st.button("🗑️ 결과 초기화"):
+                        _reset_results("ai_target", agent_log=[])
+                        st.rerun()
 
                 # Phase 2: execute pending feedback re-recommendation
                 if st.session_state.get("_pending_fb_rerun"):
                     _task = st.session_state.pop("_pending_fb_rerun")
+                    fb_tracker = None
                     try:
-                        from agent import CompanyListingAgent
-
                         fb_tracker = AgentProgressTracker("agent1")
                         agent = CompanyListingAgent(
                             extra_feedback=_task["feedback"],
@@ -1391,120 +2681,13 @@ elif page == "🎯 타겟 발굴":
                         st.session_state.ai_target_verdicts = {}
                         fb_tracker.complete("피드백 반영 완료!")
                     except Exception as e:
-                        if 'fb_tracker' in dir():
+                        if fb_tracker is not None:
                             fb_tracker.fail(f"재추천 실패: {e}")
                         else:
                             st.error(f"재추천 실패: {e}")
                     finally:
                         st.session_state.agent_running = False
                     st.rerun()
-                with fcol2:
-                    if st.button("🗑️ 결과 초기화"):
-                        st.session_state.ai_target_result = None
-                        st.session_state.ai_target_parsed = None
-                        st.session_state.ai_target_verification = None
-                        st.session_state.ai_target_verdicts = {}
-                        st.session_state.agent_log = []
-                        st.rerun()
-
-                # ── Save as Preset ─────────────────────
-                st.divider()
-                st.subheader("프리셋으로 저장")
-                st.caption("추천 결과를 프리셋으로 저장하면 '컨택 서칭' 페이지에서 바로 사용할 수 있습니다.")
-
-                rec = parsed.get("recommended_search_params", {})
-                tier1_names = [c["name"] for c in parsed.get("tier1_companies", [])]
-                tier2_names = [c["name"] for c in parsed.get("tier2_companies", [])]
-                # Combine all recommended titles (decision_makers + end_users)
-                _all_titles = parsed.get("decision_makers", []) + parsed.get("end_users", [])
-                _all_titles_str = ", ".join(_all_titles) if _all_titles else rec.get("titles", "")
-
-                save_scope = st.radio(
-                    "저장할 회사 범위",
-                    ["Tier 1 + Tier 2 전체", "Tier 1만", "Tier 2만", "Tier 1 / Tier 2 각각 (2개 프리셋)"],
-                    horizontal=True,
-                    key="ai_save_scope",
-                )
-
-                if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
-                    _save_groups = [("_T1", tier1_names), ("_T2", tier2_names)]
-                    companies_to_save = tier1_names + tier2_names  # for preview
-                elif save_scope == "Tier 2만":
-                    _save_groups = [("", tier2_names)]
-                    companies_to_save = tier2_names
-                elif save_scope == "Tier 1만":
-                    _save_groups = [("", tier1_names)]
-                    companies_to_save = tier1_names
-                else:
-                    _save_groups = [("", tier1_names + tier2_names)]
-                    companies_to_save = tier1_names + tier2_names
-
-                # Preview what will be saved
-                with st.expander("저장될 프리셋 내용 미리보기", expanded=False):
-                    st.markdown(f"**산업:** {rec.get('industry', '')}")
-                    st.markdown(f"**직함:** {_all_titles_str}")
-                    st.markdown(f"**키워드:** {rec.get('keywords', '')}")
-                    if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
-                        st.markdown(f"**Tier 1 ({len(tier1_names)}개):** {', '.join(tier1_names[:10])}{'...' if len(tier1_names) > 10 else ''}")
-                        st.markdown(f"**Tier 2 ({len(tier2_names)}개):** {', '.join(tier2_names[:10])}{'...' if len(tier2_names) > 10 else ''}")
-                    else:
-                        st.markdown(f"**회사 ({len(companies_to_save)}개):** {', '.join(companies_to_save[:10])}{'...' if len(companies_to_save) > 10 else ''}")
-
-                if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
-                    _ncol1, _ncol2 = st.columns(2)
-                    with _ncol1:
-                        preset_name_t1 = st.text_input(
-                            "Tier 1 프리셋 이름",
-                            value=f"AI_{datetime.now().strftime('%y%m%d')}_T1",
-                            key="ai_preset_name_t1",
-                        )
-                    with _ncol2:
-                        preset_name_t2 = st.text_input(
-                            "Tier 2 프리셋 이름",
-                            value=f"AI_{datetime.now().strftime('%y%m%d')}_T2",
-                            key="ai_preset_name_t2",
-                        )
-                    # Override _save_groups with individual names
-                    _save_groups = [(preset_name_t1, tier1_names), (preset_name_t2, tier2_names)]
-                    _can_save = bool(preset_name_t1 and preset_name_t2)
-                else:
-                    preset_name = st.text_input(
-                        "프리셋 이름",
-                        value=f"AI_{datetime.now().strftime('%y%m%d')}",
-                        key="ai_preset_name",
-                    )
-                    # Use preset_name directly as the full name
-                    _save_groups = [(preset_name, c) for _, c in _save_groups]
-                    _can_save = bool(preset_name)
-
-                if st.button("💾 프리셋 저장 → 컨택 서칭", type="primary", disabled=not _can_save):
-                        for _name, _companies in _save_groups:
-                            if not _companies:
-                                continue
-                            db.save_preset(
-                                name=_name,
-                                industry=rec.get("industry", ""),
-                                titles=_all_titles_str,
-                                locations=ai_region or "",
-                                companies=", ".join(_companies),
-                                keywords=rec.get("keywords", ""),
-                                max_results=100,
-                                feedback_hash=_get_feedback_hash(),
-                                product_description=ai_product_desc or "",
-                                target_hint=ai_target_hint or "",
-                                target_region=ai_region or "",
-                            )
-                        _saved_names = ", ".join(f"'{n}'" for n, c in _save_groups if c)
-                        st.session_state.ai_target_result = None
-                        st.session_state.ai_target_parsed = None
-                        st.session_state.ai_target_verification = None
-                        st.session_state.ai_target_verdicts = {}
-                        st.session_state.ai_web_context = ""
-                        st.session_state.active_page = "🔍 컨택 서칭"
-                        st.session_state.contact_search_mode = "manual"
-                        st.session_state.prospect_step = "search"
-                        st.success(f"프리셋 {_saved_names} 저장 완료! 컨택 서칭으로 이동합니다.")
-                        st.rerun()
             else:
                 # Couldn't parse JSON, show raw
                 st.warning("JSON 파싱 실패. 원본 결과:")
@@ -1512,43 +2695,14 @@ elif page == "🎯 타겟 발굴":
                 if len(result_text) > 3000:
                     st.caption("... (출력이 길어 일부만 표시)")
                 if st.button("🗑️ 결과 초기화"):
-                    st.session_state.ai_target_result = None
-                    st.session_state.ai_target_parsed = None
-                    st.session_state.ai_target_verification = None
-                    st.session_state.ai_target_verdicts = {}
-                    st.session_state.ai_web_context = ""
+                    _reset_results("ai_target", ai_web_context="")
                     st.rerun()
 
         # ── Previous presets (for reference) ──────────
         st.divider()
         st.subheader("저장된 프리셋 목록")
-        saved_presets = db.get_presets()
-        current_fb_hash = _get_feedback_hash()
-        if saved_presets:
-            for sp in saved_presets:
-                companies_preview = sp.get("companies", "")
-                companies_count = len([c for c in companies_preview.split(",") if c.strip()]) if companies_preview else 0
-                stale = sp.get("feedback_hash") and sp["feedback_hash"] != current_fb_hash
-                stale_tag = " ⚠️ _피드백 변경됨_" if stale else ""
-                has_product_desc = bool((sp.get("product_description") or "").strip())
-                sp_col1, sp_col2, sp_col3 = st.columns([5, 1, 1])
-                with sp_col1:
-                    st.markdown(
-                        f"- **{sp['name']}** — {sp.get('industry', '')} | "
-                        f"직함: {sp.get('titles', '')[:30]} | "
-                        f"회사: {companies_count}개{stale_tag}"
-                    )
-                with sp_col2:
-                    regen_disabled = not has_product_desc
-                    regen_help = "제품 설명 미저장 — 새 프리셋부터 재생성 가능" if regen_disabled else "현재 피드백으로 타겟 재탐색"
-                    if st.button("재생성", key=f"regen_preset_{sp['id']}", disabled=regen_disabled or st.session_state.get("agent_running"), help=regen_help):
-                        st.session_state._regen_preset = sp
-                        st.session_state.agent_running = True
-                        st.rerun()
-                with sp_col3:
-                    if st.button("삭제", key=f"del_preset_{sp['id']}"):
-                        db.delete_preset(sp["id"])
-                        st.rerun()
+        if _load_presets():
+            _render_preset_list()
 
             # Phase 2: handle preset regeneration (overlay already visible)
             if st.session_state.get("_regen_preset") and st.session_state.get("agent_running"):
@@ -1558,16 +2712,15 @@ elif page == "🎯 타겟 발굴":
                 regen_hint = rp.get("target_hint", "")
                 regen_region = rp.get("target_region", "")
 
-                full_desc = regen_desc
+                _desc_parts = [regen_desc]
                 if regen_hint:
-                    full_desc += f"\n\n희망 대상/관련 직종: {regen_hint}"
+                    _desc_parts.append(f"희망 대상/관련 직종: {regen_hint}")
+                full_desc = "\n\n".join(_desc_parts)
 
                 region_line = f"\n지역 제한: {regen_region}" if regen_region else ""
 
-                existing_companies = [c.strip() for c in rp.get("companies", "").split(",") if c.strip()]
-
                 _profile_id = st.session_state.get("active_profile_id")
-                _profile_fb = db.get_combined_feedback_text(_profile_id)
+                _profile_fb = _combined_feedback(_profile_id)
 
                 _ctx = build_campaign_context(st.session_state.get("active_profile"))
                 _ctx_section = f"\n\n{_ctx}" if _ctx else ""
@@ -1581,8 +2734,6 @@ elif page == "🎯 타겟 발굴":
                 )
 
                 try:
-                    from agent import CompanyListingAgent
-
                     regen_tracker = AgentProgressTracker("agent1")
                     agent = CompanyListingAgent(
                         extra_feedback=_profile_fb,
@@ -1608,7 +2759,6 @@ elif page == "🎯 타겟 발굴":
                         _auto_verify(st.session_state.ai_target_result, feedback=_profile_fb)
                 except Exception as e:
                     st.error(f"재생성 실패: {e}")
-                    import traceback
                     st.code(traceback.format_exc())
                 finally:
                     st.session_state._regen_preset = None
@@ -1622,119 +2772,19 @@ elif page == "🎯 타겟 발굴":
         st.subheader("피드백 이력 관리")
 
         _active_pid = st.session_state.get("active_profile_id")
-        _active_profile_name = ""
-        if _active_pid:
-            _ap_data = db.get_campaign_profile(_active_pid)
-            _active_profile_name = _ap_data["name"] if _ap_data else ""
-
-        fb_tab_global, fb_tab_profile = st.tabs([
-            "글로벌 (모든 프로필 공통)",
-            f"프로필 전용 ({_active_profile_name})" if _active_profile_name else "프로필 전용 (미선택)",
-        ])
-
-        with fb_tab_global:
-            st.caption("여기에 누적된 피드백은 **모든** 타겟 추천 시 자동 반영됩니다.")
-            # Read and parse file-based global feedback entries
-            feedback_entries = []
-            if _TARGET_FEEDBACK_PATH.exists():
-                raw = _TARGET_FEEDBACK_PATH.read_text(encoding="utf-8")
-                for line in raw.splitlines():
-                    stripped = line.strip()
-                    if stripped.startswith("- ["):
-                        feedback_entries.append(stripped)
-
-            # Also show DB-based global feedback
-            db_global_fb = db.get_target_feedback(profile_id=None)
-
-            if feedback_entries:
-                st.markdown("**파일 기반 (레거시)**")
-                for i, entry in enumerate(feedback_entries):
-                    col_text, col_del = st.columns([9, 1])
-                    with col_text:
-                        st.markdown(entry)
-                    with col_del:
-                        if st.button("x", key=f"del_fb_{i}"):
-                            feedback_entries.pop(i)
-                            _rewrite_feedback_log(feedback_entries)
-                            st.rerun()
-
-            if db_global_fb:
-                for fb in db_global_fb:
-                    col_text, col_del = st.columns([9, 1])
-                    ts = fb["created_at"][:16] if fb.get("created_at") else ""
-                    ps = f"({fb['product_summary']}) " if fb.get("product_summary") else ""
-                    with col_text:
-                        st.markdown(f"- [{ts}] {ps}{fb['feedback']}")
-                    with col_del:
-                        if st.button("x", key=f"del_dbfb_g_{fb['id']}"):
-                            db.delete_target_feedback(fb["id"])
-                            st.rerun()
-
-            total_global = len(feedback_entries) + len(db_global_fb)
-            if total_global:
-                st.caption(f"총 {total_global}건")
-            else:
-                st.info("글로벌 피드백이 없습니다.")
-
-        with fb_tab_profile:
-            if not _active_pid:
-                st.warning("캠페인 프로필을 먼저 활성화하세요. 이 탭은 활성 프로필 전용 피드백을 관리합니다.")
-            else:
-                st.caption(f"**{_active_profile_name}** 프로필에서 타겟 추천할 때만 적용되는 피드백입니다.")
-                profile_fb = db.get_target_feedback(profile_id=_active_pid)
-                if profile_fb:
-                    for fb in profile_fb:
-                        col_text, col_del = st.columns([9, 1])
-                        ts = fb["created_at"][:16] if fb.get("created_at") else ""
-                        ps = f"({fb['product_summary']}) " if fb.get("product_summary") else ""
-                        with col_text:
-                            st.markdown(f"- [{ts}] {ps}{fb['feedback']}")
-                        with col_del:
-                            if st.button("x", key=f"del_dbfb_p_{fb['id']}"):
-                                db.delete_target_feedback(fb["id"])
-                                st.rerun()
-                    st.caption(f"총 {len(profile_fb)}건")
-                else:
-                    st.info(f"'{_active_profile_name}' 프로필 전용 피드백이 없습니다.")
-
-        # ── Unified feedback input (below tabs) ──────────
-        st.markdown("#### 피드백 추가")
-        manual_fb = st.text_input(
-            "피드백 내용",
-            placeholder="예: CRO/CMO 회사는 항상 제외, 바이오텍만 남겨줘",
-            key="manual_fb_unified",
-        )
-        _uf_c1, _uf_c2, _uf_c3 = st.columns([1, 1, 1])
-        with _uf_c1:
-            _uf_global = st.checkbox("글로벌 (모든 프로필)", value=True, key="uf_scope_global")
-        with _uf_c2:
-            _uf_profile = st.checkbox(
-                f"프로필 전용 ({_active_profile_name})" if _active_profile_name else "프로필 전용 (미선택)",
-                value=bool(_active_pid),
-                key="uf_scope_profile",
-                disabled=not _active_pid,
-            )
-        with _uf_c3:
-            if st.button("추가", key="add_fb_unified", disabled=not manual_fb or (not _uf_global and not _uf_profile)):
-                if _uf_global:
-                    db.add_target_feedback(manual_fb, product_summary="수동 입력", profile_id=None)
-                if _uf_profile and _active_pid:
-                    db.add_target_feedback(manual_fb, product_summary="수동 입력", profile_id=_active_pid)
-                st.rerun()
+        _ap_data = st.session_state.get("active_profile") if _active_pid else None
+        _active_profile_name = _ap_data["name"] if _ap_data else ""
 
+        _render_feedback_manager(_active_pid, _active_profile_name)
 
 
     elif target_mode == "researcher":
         st.caption("제품 설명을 입력하면 AI가 적합한 학술 연구자/교수를 추천합니다.")
 
-        if "ai_researcher_result" not in st.session_state:
-            st.session_state.ai_researcher_result = None
-        if "ai_researcher_parsed" not in st.session_state:
-            st.session_state.ai_researcher_parsed = None
-        if "ai_researcher_verification" not in st.session_state:
-            st.session_state.ai_researcher_verification = None
-        if "ai_researcher_verdicts" not in st.session_state:
-            st.session_state.ai_researcher_verdicts = {}
+        st.session_state.setdefault("ai_researcher_result", None)
+        st.session_state.setdefault("ai_researcher_parsed", None)
+        st.session_state.setdefault("ai_researcher_verification", None)
+        st.session_state.setdefault("ai_researcher_verdicts", {})
 
         # ── Input Section ─────────────────────────────
         st.subheader("제품/서비스 정보")
@@ -1742,13 +2792,16 @@ elif page == "🎯 타겟 발굴":
         _active_pid = st.session_state.get("active_profile_id")
         _run_profile_id = _active_pid
 
-        # Build campaign context if profile active
-        _r_campaign_ctx = ""
-        if _active_pid:
-            _r_campaign_ctx = build_campaign_context(st.session_state.get("active_profile"))
-            if _r_campaign_ctx:
-                with st.expander("활성 프로필 컨텍스트 (자동 포함)", expanded=False):
-                    st.text(_r_campaign_ctx[:500])
+        # Build campaign context if profile active (reused until the profile changes or is edited)
+        _r_profile = st.session_state.get("active_profile") if _active_pid else None
+        _ctx_key = (_active_pid, _r_profile.get("updated_at")) if _r_profile else None
+        if st.session_state.get("_r_campaign_ctx_key") != _ctx_key:
+            st.session_state._r_campaign_ctx = build_campaign_context(_r_profile)
+            st.session_state._r_campaign_ctx_key = _ctx_key
+        _r_campaign_ctx = st.session_state.get("_r_campaign_ctx", "")
+        if _r_campaign_ctx:
+            with st.expander("활성 프로필 컨텍스트 (자동 포함)", expanded=False):
+                st.text(_r_campaign_ctx[:500])
 
         researcher_product_desc = st.text_area(
             "제품/서비스 설명 (필수)",
@@ -1790,8 +2843,12 @@ elif page == "🎯 타겟 발굴":
 
             st.session_state._pending_researcher_agent = {
                 "request": agent_request,
-                "feedback": db.get_combined_feedback_text(_run_profile_id),
+                "feedback": _combined_feedback(_run_profile_id),
             }
+            # The run replaces these anyway; free them before it rather than after
+            _release_heavy_state("ai_researcher_result", "ai_researcher_parsed",
+                                 "ai_researcher_verification", "ai_researcher_verdicts",
+                                 "_r_preset_names_memo")
             st.session_state.agent_running = True
             st.rerun()
 
@@ -1812,7 +2869,6 @@ elif page == "🎯 타겟 발굴":
 
             _task = st.session_state.pop("_pending_researcher_agent")
             try:
-                from agent import ResearcherFinderAgent
                 tracker = AgentProgressTracker("agent1")
                 agent = ResearcherFinderAgent(
                     extra_feedback=_task["feedback"],
@@ -1839,33 +2895,34 @@ elif page == "🎯 타겟 발굴":
             except Exception as e:
                 logger.error(f"ResearcherFinderAgent failed: {e}")
                 st.error(f"AI 연구자 추천 실패: {e}")
-                import traceback
                 st.code(traceback.format_exc())
             finally:
                 st.session_state.agent_running = False
             st.rerun()
 
         # ── Results Display ───────────────────────────
-        if st.session_state.ai_researcher_result:
+        ss = st.session_state
+        r_result, parsed = ss.ai_researcher_result, ss.ai_researcher_parsed
+        if r_result:
             # Parse JSON from result
-            if st.session_state.ai_researcher_parsed is None:
-                _raw = st.session_state.ai_researcher_result
-                try:
-                    _parsed = json.loads(_raw)
-                except (json.JSONDecodeError, TypeError):
+            if parsed is None:
+                _raw = r_result
+                _parsed = None
+                # Only attempt a decode when the text can hold JSON (prose raises every time)
+                if _raw.lstrip()[:1] == "{":
+                    try:
+                        _parsed = _loads(_raw)
+                    except json.JSONDecodeError:
+                        pass
+                if _parsed is None and "```" in _raw:
                     # Try to extract JSON from markdown code block
-                    import re
-                    _m = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", _raw, re.DOTALL)
+                    _m = _FENCED_OBJECT_RE.search(_raw)
                     if _m:
                         try:
-                            _parsed = json.loads(_m.group(1))
+                            _parsed = _loads(_m.group(1))
                         except json.JSONDecodeError:
-                            _parsed = None
-                    else:
-                        _parsed = None
-                st.session_state.ai_researcher_parsed = _parsed
-
-            parsed = st.session_state.ai_researcher_parsed
+                            pass
+                ss.ai_researcher_parsed = parsed = _parsed
 
             if parsed:
                 st.subheader("추천 결과")
@@ -1876,166 +2933,8 @@ elif page == "🎯 타겟 발굴":
                     with st.expander("제품-연구 연결 분석", expanded=False):
                         st.markdown(_analysis)
 
-                tier1 = parsed.get("tier1_researchers", [])
-                tier2 = parsed.get("tier2_researchers", [])
-
-                # Build verification + verdict lookups
-                _r_vmap = {}
-                if st.session_state.ai_researcher_verification:
-                    for rv in st.session_state.ai_researcher_verification:
-                        _r_vmap[rv.get("name", "")] = rv
-                _r_verdict_map = st.session_state.get("ai_researcher_verdicts", {})
-
-                _tier_tab = st.radio(
-                    "결과 보기",
-                    ["tier1", "tier2", "areas"],
-                    format_func=lambda x: {
-                        "tier1": f"Tier 1 ({len(tier1)}명)",
-                        "tier2": f"Tier 2 ({len(tier2)}명)",
-                        "areas": "연구 분야",
-                    }[x],
-                    horizontal=True,
-                    label_visibility="collapsed",
-                    key="researcher_tier_tab",
-                )
-
-                if _tier_tab == "tier1":
-                    if tier1:
-                        for idx, r in enumerate(tier1):
-                            # Merge verification data into card
-                            r_name = r.get("name", "")
-                            r_with_v = {**r}
-                            if r_name in _r_vmap:
-                                r_with_v["verification"] = _r_vmap[r_name].get("verification", {})
-                            col_card, col_actions = st.columns([5, 1])
-                            with col_card:
-                                _render_researcher_card(r_with_v, _r_verdict_map.get(r_name))
-                            with col_actions:
-                                st.write("")
-                                if st.button("→ T2", key=f"r_t1to2_{idx}", help="Tier 2로 이동"):
-                                    researcher = tier1.pop(idx)
-                                    tier2.append(researcher)
-                                    st.rerun()
-                                if st.button("삭제", key=f"r_del_t1_{idx}", help="목록에서 제거"):
-                                    tier1.pop(idx)
-                                    st.rerun()
-                    else:
-                        st.info("Tier 1 연구자 없음")
-
-                elif _tier_tab == "tier2":
-                    if tier2:
-                        for idx, r in enumerate(tier2):
-                            r_name = r.get("name", "")
-                            r_with_v = {**r}
-                            if r_name in _r_vmap:
-                                r_with_v["verification"] = _r_vmap[r_name].get("verification", {})
-                            col_card, col_actions = st.columns([5, 1])
-                            with col_card:
-                                _render_researcher_card(r_with_v, _r_verdict_map.get(r_name))
-                            with col_actions:
-                                st.write("")
-                                if st.button("→ T1", key=f"r_t2to1_{idx}", help="Tier 1으로 이동"):
-                                    researcher = tier2.pop(idx)
-                                    tier1.append(researcher)
-                                    st.rerun()
-                                if st.button("삭제", key=f"r_del_t2_{idx}", help="목록에서 제거"):
-                                    tier2.pop(idx)
-                                    st.rerun()
-                    else:
-                        st.info("Tier 2 연구자 없음")
-
-                else:  # areas
-                    areas = parsed.get("target_research_areas", [])
-                    if areas:
-                        st.markdown("**타겟 연구 분야:**")
-                        for a in areas:
-                            st.markdown(f"- {a}")
-                    else:
-                        st.info("연구 분야 정보 없음")
-
-                # ── Verification Summary ──────────────
-                if _r_verdict_map:
-                    st.divider()
-                    st.subheader("근거 교차검증 결과")
-                    st.caption("외부 데이터(웹 + PubMed + ClinicalTrials) 수집 후 Claude가 AI 근거와 비교 분석")
-
-                    total_v = len(_r_verdict_map)
-                    confirmed = sum(1 for v in _r_verdict_map.values() if v.get("verdict") == "confirmed")
-                    v_partial = sum(1 for v in _r_verdict_map.values() if v.get("verdict") == "partial")
-                    unverified = sum(1 for v in _r_verdict_map.values() if v.get("verdict") == "unverified")
-                    wrong = sum(1 for v in _r_verdict_map.values() if v.get("verdict") == "wrong")
-
-                    vcol1, vcol2, vcol3, vcol4 = st.columns(4)
-                    vcol1.metric("✅ 확인됨", confirmed)
-                    vcol2.metric("⚠️ 일부 확인", v_partial)
-                    vcol3.metric("❓ 미검증", unverified)
-                    vcol4.metric("❌ 불일치", wrong)
-
-                # ── Export Results as Markdown ─────────
-                st.divider()
-                st.subheader("결과 내보내기")
-
-                def _build_researcher_export_md():
-                    lines = [f"# 타겟 연구자 추천 결과\n"]
-                    lines.append(f"**제품 요약:** {parsed.get('product_summary', '')}\n")
-                    _exp_analysis = parsed.get("analysis", "")
-                    if _exp_analysis:
-                        lines.append(f"## 분석\n{_exp_analysis}\n")
-
-                    for tier_label, tier_list in [
-                        ("Tier 1 (핵심 타겟)", tier1),
-                        ("Tier 2 (잠재적 타겟)", tier2),
-                    ]:
-                        lines.append(f"## {tier_label} — {len(tier_list)}명\n")
-                        for i, r in enumerate(tier_list, 1):
-                            r_name = r.get("name", "")
-                            r_inst = r.get("institution", "")
-                            r_dept = r.get("department", "")
-                            r_title = r.get("title", "")
-                            header = f"### {i}. {r_name}"
-                            if r_title:
-                                header += f" — {r_title}"
-                            if r_inst:
-                                header += f", {r_inst}"
-                                if r_dept:
-                                    header += f" ({r_dept})"
-                            lines.append(header)
-                            if r.get("research_area"):
-                                lines.append(f"- **연구 분야:** {r['research_area']}")
-                            if r.get("key_publications"):
-                                lines.append(f"- **주요 연구:** {r['key_publications']}")
-                            if r.get("reason"):
-                                lines.append(f"- **요약:** {r['reason']}")
-                            if r.get("evidence"):
-                                lines.append(f"- **근거:** {r['evidence']}")
-                            if r.get("tier_reason"):
-                                lines.append(f"- **Tier 산정:** {r['tier_reason']}")
-                            if r.get("contact_clues"):
-                                lines.append(f"- **연락처 단서:** {r['contact_clues']}")
-                            # Add verdict if available
-                            _v = _r_verdict_map.get(r_name, {})
-                            if _v:
-                                _emoji = {"confirmed": "✅", "partial": "⚠️", "unverified": "❓", "wrong": "❌"}.get(_v.get("verdict", ""), "")
-                                lines.append(f"- **교차검증:** {_emoji} {_v.get('verdict', '')} — {_v.get('explanation', '')}")
-                            lines.append("")
-
-                    _areas = parsed.get("target_research_areas", [])
-                    if _areas:
-                        lines.append("## 타겟 연구 분야\n")
-                        for a in _areas:
-                            lines.append(f"- {a}")
-                        lines.append("")
-
-                    return "\n".join(lines)
-
-                _export_md = _build_researcher_export_md()
-                st.download_button(
-                    "📥 Markdown으로 내보내기",
-                    data=_export_md,
-                    file_name="target_researchers_result.md",
-                    mime="text/markdown",
-                    key="export_researcher_md",
-                )
+                _render_researcher_results(parsed, researcher_product_desc,
+                                           researcher_areas, researcher_region)
 
                 # ── Feedback Section ──────────────────────
                 st.divider()
@@ -2060,7 +2959,7 @@ elif page == "🎯 타겟 발굴":
                         full_desc += f"\n\n타겟 연구 분야: {researcher_areas}"
                     region_line = f"\n지역 제한: {researcher_region}" if researcher_region else ""
 
-                    prev_result = st.session_state.ai_researcher_result
+                    prev_result = r_result
                     agent_request = (
                         f"아래 제품에 적합한 학술 연구자/교수를 찾아줘.\n\n"
                         f"## 제품 설명\n{full_desc}{region_line}\n\n"
@@ -2075,118 +2974,24 @@ elif page == "🎯 타겟 발굴":
                         product_summary="연구자 추천 피드백",
                         profile_id=_run_profile_id,
                     )
+                    _invalidate_feedback()
 
                     st.session_state._pending_researcher_agent = {
                         "request": agent_request,
-                        "feedback": db.get_combined_feedback_text(_run_profile_id),
+                        "feedback": _combined_feedback(_run_profile_id),
                     }
                     st.session_state.agent_running = True
                     st.rerun()
 
-                # ── Save as Preset ────────────────────────
-                st.divider()
-                st.subheader("프리셋으로 저장")
-                st.caption("추천 결과를 프리셋으로 저장하면 '컨택 서칭' 페이지에서 바로 사용할 수 있습니다.")
-
-                rec = parsed.get("recommended_search_params", {})
-                tier1_names = [f"{r['name']} ({r.get('institution', '')})" for r in tier1]
-                tier2_names = [f"{r['name']} ({r.get('institution', '')})" for r in tier2]
-                all_institutions = list(set(
-                    r.get("institution", "") for r in tier1 + tier2 if r.get("institution")
-                ))
-                all_areas = parsed.get("target_research_areas", [])
-
-                save_scope = st.radio(
-                    "저장할 범위",
-                    ["Tier 1 + Tier 2 전체", "Tier 1만", "Tier 2만", "Tier 1 / Tier 2 각각 (2개 프리셋)"],
-                    horizontal=True,
-                    key="researcher_save_scope",
-                )
-
-                if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
-                    _save_groups = [("_T1", tier1_names), ("_T2", tier2_names)]
-                elif save_scope == "Tier 2만":
-                    _save_groups = [("", tier2_names)]
-                elif save_scope == "Tier 1만":
-                    _save_groups = [("", tier1_names)]
-                else:
-                    _save_groups = [("", tier1_names + tier2_names)]
-
-                # Preview
-                with st.expander("저장될 프리셋 내용 미리보기", expanded=False):
-                    st.markdown(f"**연구 분야:** {', '.join(all_areas)}")
-                    st.markdown(f"**기관:** {', '.join(all_institutions[:10])}")
-                    st.markdown(f"**검색 키워드:** {rec.get('research_keywords', '')}")
-
-                if save_scope == "Tier 1 / Tier 2 각각 (2개 프리셋)":
-                    _nc1, _nc2 = st.columns(2)
-                    with _nc1:
-                        r_preset_name_t1 = st.text_input(
-                            "Tier 1 프리셋 이름",
-                            value=f"연구자_{datetime.now().strftime('%y%m%d')}_T1",
-                            key="r_preset_name_t1",
-                        )
-                    with _nc2:
-                        r_preset_name_t2 = st.text_input(
-                            "Tier 2 프리셋 이름",
-                            value=f"연구자_{datetime.now().strftime('%y%m%d')}_T2",
-                            key="r_preset_name_t2",
-                        )
-                    _save_groups = [(r_preset_name_t1, tier1_names), (r_preset_name_t2, tier2_names)]
-                    _r_can_save = bool(r_preset_name_t1 and r_preset_name_t2)
-                else:
-                    r_preset_name = st.text_input(
-                        "프리셋 이름",
-                        value=f"연구자_{datetime.now().strftime('%y%m%d')}",
-                        key="r_preset_name",
-                    )
-                    _save_groups = [(r_preset_name, c) for _, c in _save_groups]
-                    _r_can_save = bool(r_preset_name)
-
-                if st.button("💾 프리셋 저장 → 컨택 서칭", type="primary",
-                             disabled=not _r_can_save, key="save_researcher_preset"):
-                    for _name, _researchers in _save_groups:
-                        if not _researchers:
-                            continue
-                        db.save_preset(
-                            name=_name,
-                            industry=", ".join(all_areas),
-                            titles="Professor, Associate Professor, PI, Lab Director",
-                            locations=researcher_region or "",
-                            companies=", ".join(_researchers),
-                            keywords=rec.get("research_keywords", ""),
-                            max_results=100,
-                            feedback_hash=_get_feedback_hash(),
-                            product_description=researcher_product_desc or "",
-                            target_hint=researcher_areas or "",
-                            target_region=researcher_region or "",
-                            preset_type="researcher",
-                            institutions=", ".join(all_institutions),
-                            research_areas=", ".join(all_areas),
-                        )
-                    _saved = ", ".join(f"'{n}'" for n, r in _save_groups if r)
-                    st.session_state.ai_researcher_result = None
-                    st.session_state.ai_researcher_parsed = None
-                    st.session_state.ai_researcher_verification = None
-                    st.session_state.ai_researcher_verdicts = {}
-                    st.session_state.active_page = "🔍 컨택 서칭"
-                    st.session_state.contact_search_mode = "manual"
-                    st.session_state.prospect_step = "search"
-                    st.success(f"프리셋 {_saved} 저장 완료! 컨택 서칭으로 이동합니다.")
-                    st.rerun()
-
             else:
                 # JSON parsing failed — show raw result
                 st.warning("AI 결과를 JSON으로 파싱하지 못했습니다. 원본 텍스트:")
-                st.text(st.session_state.ai_researcher_result[:3000])
+                st.text(r_result[:3000])
 
             # ── Reset button ──────────────────────────
             st.divider()
             if st.button("🗑️ 결과 초기화", key="reset_researcher"):
-                st.session_state.ai_researcher_result = None
-                st.session_state.ai_researcher_parsed = None
-                st.session_state.ai_researcher_verification = None
-                st.session_state.ai_researcher_verdicts = {}
+                _reset_results("ai_researcher")
                 st.rerun()
 
 # ══════════════════════════════════════════════════════════
@@ -2197,20 +3002,13 @@ elif page == "🔍 컨택 서칭":
     st.title("컨택 서칭")
 
     # ── Mode selector ─────────────────────────────────
-    if "contact_search_mode" not in st.session_state:
-        st.session_state.contact_search_mode = "agent"
-    if "agent2_log" not in st.session_state:
-        st.session_state.agent2_log = []
-    if "agent2_result" not in st.session_state:
-        st.session_state.agent2_result = None
-    if "agent2_credits" not in st.session_state:
-        st.session_state.agent2_credits = None
-    if "agent2_search_id" not in st.session_state:
-        st.session_state.agent2_search_id = None
-    if "prospect_step" not in st.session_state:
-        st.session_state.prospect_step = "search"
-    if "prospect_search_id" not in st.session_state:
-        st.session_state.prospect_search_id = None
+    st.session_state.setdefault("contact_search_mode", "agent")
+    st.session_state.setdefault("agent2_log", [])
+    st.session_state.setdefault("agent2_result", None)
+    st.session_state.setdefault("agent2_credits", None)
+    st.session_state.setdefault("agent2_search_id", None)
+    st.session_state.setdefault("prospect_step", "search")
+    st.session_state.setdefault("prospect_search_id", None)
 
     search_mode = st.radio(
         "검색 모드",
@@ -2231,7 +3029,8 @@ elif page == "🔍 컨택 서칭":
         st.subheader("타겟 정보 입력")
         input_tab1, input_tab2, input_tab3 = st.tabs(["✏️ 직접 입력", "🎯 Agent 1 결과에서", "📋 저장된 프리셋에서"])
 
-        agent2_request = ""
+        # (builder, args) of the last tab with usable input; built only on click
+        _a2_source = None
 
         with input_tab1:
             a2_companies = st.text_area(
@@ -2255,13 +3054,7 @@ elif page == "🔍 컨택 서칭":
                 )
 
             if a2_companies.strip():
-                companies = [c.strip() for c in a2_companies.strip().split("\n") if c.strip()]
-                parts = [f"다음 {len(companies)}개 회사에서 이메일을 찾아줘 (전부 빠짐없이 처리할 것): {', '.join(companies)}"]
-                if a2_titles.strip():
-                    parts.append(f"타겟 직함: {a2_titles}")
-                if a2_region.strip():
-                    parts.append(f"지역: {a2_region}")
-                agent2_request = "\n".join(parts)
+                _a2_source = (_a2_request_from_manual, (a2_companies, a2_titles, a2_region))
 
         with input_tab2:
             if st.session_state.get("ai_target_parsed"):
@@ -2278,39 +3071,19 @@ elif page == "🔍 컨택 서칭":
                 if dm_titles:
                     st.caption(f"추천 직함: {', '.join(dm_titles[:8])}")
 
-                selected_companies = []
-                if use_tier1:
-                    selected_companies.extend([c["name"] for c in tier1])
-                if use_tier2:
-                    selected_companies.extend([c["name"] for c in tier2])
-
-                if selected_companies:
-                    tier_label = []
-                    if use_tier1:
-                        tier_label.append(f"Tier 1 {len(tier1)}개")
-                    if use_tier2:
-                        tier_label.append(f"Tier 2 {len(tier2)}개")
-                    parts = [
-                        f"다음 {len(selected_companies)}개 회사에서 이메일을 찾아줘 ({', '.join(tier_label)}, 전부 빠짐없이 처리할 것):",
-                        ", ".join(selected_companies),
-                    ]
-                    if dm_titles:
-                        parts.append(f"타겟 직함: {', '.join(dm_titles[:5])}")
-                    agent2_request = "\n".join(parts)
+                if (use_tier1 and tier1) or (use_tier2 and tier2):
+                    _a2_source = (_a2_request_from_agent1, (tier1, tier2, use_tier1, use_tier2, dm_titles))
             else:
                 st.info("Agent 1 (타겟 발굴) 결과가 없습니다. 먼저 타겟 발굴을 실행하거나 '직접 입력' 탭을 사용하세요.")
 
         with input_tab3:
-            saved_presets = db.get_presets()
-            if saved_presets:
+            presets_by_label = _presets_by_label()
+            if presets_by_label:
                 current_fb_hash = _get_feedback_hash()
-                _ptype_icon = lambda sp: "🎓" if sp.get("preset_type") == "researcher" else "🏢"
-                preset_names = [f"{_ptype_icon(sp)} {sp['name']}" for sp in saved_presets]
                 selected_preset_label = st.selectbox(
-                    "프리셋 선택", preset_names, key="a2_preset_select"
+                    "프리셋 선택", list(presets_by_label), key="a2_preset_select"
                 )
-                _sel_idx = preset_names.index(selected_preset_label)
-                sel = saved_presets[_sel_idx]
+                sel = presets_by_label[selected_preset_label]
 
                 # Warn if feedback changed since preset was saved
                 if sel.get("feedback_hash") and sel["feedback_hash"] != current_fb_hash:
@@ -2339,28 +3112,9 @@ elif page == "🔍 컨택 서칭":
                 if info_parts:
                     st.markdown(" | ".join(info_parts))
 
-                # Build agent request from preset
-                companies_str = sel.get("companies") or ""
-                if companies_str.strip():
-                    companies_list = [c.strip() for c in companies_str.split(",") if c.strip()]
-                    if _is_researcher_preset:
-                        parts = [f"다음 {len(companies_list)}명의 연구자 이메일을 찾아줘 (전부 빠짐없이 처리할 것): {', '.join(companies_list)}"]
-                    else:
-                        parts = [f"다음 {len(companies_list)}개 회사에서 이메일을 찾아줘 (전부 빠짐없이 처리할 것): {', '.join(companies_list)}"]
-                    if sel.get("titles"):
-                        parts.append(f"타겟 직함: {sel['titles']}")
-                    if sel.get("locations"):
-                        parts.append(f"지역: {sel['locations']}")
-                    if sel.get("keywords"):
-                        parts.append(f"키워드: {sel['keywords']}")
-                    if sel.get("industry"):
-                        _label = "연구 분야" if _is_researcher_preset else "산업"
-                        parts.append(f"{_label}: {sel['industry']}")
-                    if _is_researcher_preset:
-                        if sel.get("institutions"):
-                            parts.append(f"참고 기관: {sel['institutions']}")
-                        parts.append("이 사람들은 학술 연구자입니다. 대학/연구기관 도메인에서 이메일을 찾아주세요.")
-                    agent2_request = "\n".join(parts)
+                # Agent request is built from the preset on click
+                if (sel.get("companies") or "").strip():
+                    _a2_source = (_a2_request_from_preset, (sel,))
                 else:
                     st.warning("이 프리셋에 대상 목록이 없습니다. 대상이 포함된 프리셋을 선택하거나 '직접 입력' 탭을 사용하세요.")
             else:
@@ -2368,9 +3122,12 @@ elif page == "🔍 컨택 서칭":
 
         # ── Run Agent button ──────────────────────────
         st.divider()
-        if st.button("🤖 이메일 찾기 Agent 실행", type="primary", disabled=not agent2_request or st.session_state.get("agent_running")):
-            # Phase 1: save params and rerun to show overlay
-            st.session_state._pending_agent2 = {"request": agent2_request}
+        if st.button("🤖 이메일 찾기 Agent 실행", type="primary", disabled=_a2_source is None or st.session_state.get("agent_running")):
+            # Phase 1: build the request, save params and rerun to show overlay
+            _a2_builder, _a2_args = _a2_source
+            _a2_req, _a2_count = _a2_builder(*_a2_args)
+            st.session_state._pending_agent2 = {"request": _a2_req, "count": _a2_count}
+            _release_heavy_state("agent2_result", "agent2_log", "agent2_credits", "_a2_csv_memo")
             st.session_state.agent_running = True
             st.rerun()
 
@@ -2378,17 +3135,8 @@ elif page == "🔍 컨택 서칭":
         if st.session_state.get("_pending_agent2"):
             _task = st.session_state.pop("_pending_agent2")
             try:
-                from agent import EmailFinderAgent
-
                 _a2_request = _task["request"]
-                # Count companies from request
-                _a2_lines = _a2_request.split("\n")
-                _a2_company_count = 1
-                for _line in _a2_lines:
-                    _commas = _line.count(",")
-                    if _commas >= 2:
-                        _a2_company_count = max(_a2_company_count, _commas + 1)
-                _a2_company_count = max(_a2_company_count, 1)
+                _a2_company_count = max(_task.get("count", 1), 1)
 
                 tracker = AgentProgressTracker("agent2", total_items=_a2_company_count)
 
@@ -2427,73 +3175,21 @@ elif page == "🔍 컨택 서칭":
                     tracker.complete("이메일 검색 완료")
             except Exception as e:
                 st.error(f"이메일 찾기 실패: {e}")
-                import traceback
                 st.code(traceback.format_exc())
             finally:
                 st.session_state.agent_running = False
             st.rerun()
 
         # ── Display results ───────────────────────────
-        if st.session_state.agent2_result:
-            result = st.session_state.agent2_result
-            contacts_raw = result.get("contacts", [])
-            summary = result.get("search_summary", {})
-
-            # Deduplicate by (email, company) — matches DB UNIQUE constraint
-            seen = set()
-            contacts = []
-            for c in contacts_raw:
-                email = (c.get("email") or "").strip().lower()
-                company = (c.get("company") or "").strip().lower()
-                name = (c.get("contact_name") or "").strip().lower()
-                key = (email, company) if email else (name, company)
-                if key not in seen:
-                    seen.add(key)
-                    contacts.append(c)
-
-            dupes_removed = len(contacts_raw) - len(contacts)
-            msg = f"✅ {len(contacts)}명의 연락처 발견"
-            if dupes_removed > 0:
-                msg += f" (중복 {dupes_removed}건 제거)"
-            st.success(msg)
-
-            # Metrics
-            m1, m2, m3, m4 = st.columns(4)
-            m1.metric("총 연락처", len(contacts))
-            m2.metric("이메일 확보", sum(1 for c in contacts if c.get("email")))
-            m3.metric("회사 수", len(set(c.get("company", "") for c in contacts if c.get("company"))))
-            credits = st.session_state.agent2_credits or {}
-            m4.metric("크레딧 사용", f"F:{credits.get('findymail', 0)} H:{credits.get('hunter', 0)}")
-
-            # Contacts table
-            if contacts:
-                import pandas as pd
-                df = pd.DataFrame(contacts)
-                display_cols = [c for c in ["contact_name", "email", "email_confidence", "company", "title", "source", "location"] if c in df.columns]
-                st.dataframe(df[display_cols], use_container_width=True, height=400)
-
-                # Export
-                st.divider()
-                exp1, exp2 = st.columns(2)
-                with exp1:
-                    csv_data = df[display_cols].to_csv(index=False)
-                    st.download_button(
-                        "📥 CSV 다운로드",
-                        csv_data,
-                        f"contacts_{time.strftime('%y%m%d')}.csv",
-                        "text/csv",
-                    )
-                with exp2:
-                    if st.button("📧 콜드메일 캠페인으로 보내기"):
-                        st.session_state.csv_data = csv_data
-                        st.session_state.a3_from_agent2 = st.session_state.get("agent2_search_id")
-                        st.session_state.active_page = "📝 콜드메일"
-                        st.rerun()
+        ss = st.session_state
+        a2_result, a2_log = ss.agent2_result, ss.agent2_log
+        if a2_result:
+            _render_agent2_results(a2_result)
 
         # Agent activity log (full)
-        if st.session_state.agent2_log:
-            full_log = "\n".join(st.session_state.agent2_log)
-            with st.expander(f"Agent 활동 로그 ({len(st.session_state.agent2_log)}건)", expanded=False):
+        if a2_log:
+            full_log = _log_text("agent2_log")
+            with st.expander(f"Agent 활동 로그 ({len(a2_log)}건)", expanded=False):
                 st.code(full_log, language=None)
                 st.download_button(
                     "📥 로그 다운로드",
@@ -2532,11 +3228,8 @@ elif page == "🔍 컨택 서칭":
         st.subheader("① 검색 조건 설정")
 
         # Load saved presets from DB
-        saved_presets = db.get_presets()
         SAVED_PRESETS = {}
-        for sp in saved_presets:
-            _icon = "🎓" if sp.get("preset_type") == "researcher" else "🏢"
-            _display_name = f"{_icon} {sp['name']}"
+        for _display_name, sp in _presets_by_label().items():
             SAVED_PRESETS[_display_name] = {
                 "id": sp["id"],
                 "industry": sp.get("industry") or "",
@@ -2564,6 +3257,7 @@ elif page == "🔍 컨택 서칭":
             if preset in SAVED_PRESETS:
                 if st.button("🗑️ 삭제", key="delete_preset"):
                     db.delete_preset(SAVED_PRESETS[preset]["id"])
+                    _invalidate_presets()
                     st.rerun()
 
         col1, col2 = st.columns(2)
@@ -2627,6 +3321,7 @@ elif page == "🔍 컨택 서칭":
                     max_results=p_max_results,
                     feedback_hash=_get_feedback_hash(),
                 )
+                _invalidate_presets()
                 st.success(f"프리셋 '{new_preset_name}' 저장 완료!")
                 st.rerun()
 
@@ -2643,8 +3338,6 @@ elif page == "🔍 컨택 서칭":
 
         # Search button
         if st.button("🔍 이메일 검색 시작", type="primary", disabled=not FINDYMAIL_API_KEY):
-            from findymail_client import FindymailClient
-
             titles_list = [t.strip() for t in p_titles.split(",") if t.strip()] if p_titles else None
             companies_list = [c.strip() for c in p_companies.split(",") if c.strip()] if p_companies else None
 
@@ -2670,81 +3363,42 @@ elif page == "🔍 컨택 서칭":
                     st.error("회사를 최소 1개 입력해주세요.")
                     st.stop()
 
-                # Build prospect list for Findymail batch search
-                prospects_to_search = []
+                # One lookup per domain: the search takes no title, and companies
+                # that resolve to the same domain share its people
+                targets: dict[str, list[str]] = {}
                 for company in companies_list:
                     # Infer domain from known domains or company name
-                    from hunter_client import _KNOWN_DOMAINS
-                    domain = ""
-                    for key, dom in _KNOWN_DOMAINS.items():
-                        if key in company.lower():
-                            domain = dom
-                            break
-                    if not domain:
-                        # Try company name as domain
-                        domain = company.lower().replace(" ", "") + ".com"
-
-                    if titles_list:
-                        for title in titles_list:
-                            prospects_to_search.append({
-                                "company": company,
-                                "domain": domain,
-                                "title_keyword": title,
-                            })
-                    else:
-                        prospects_to_search.append({
-                            "company": company,
-                            "domain": domain,
-                        })
+                    company_lower = company.lower()
+                    m = _KNOWN_DOMAINS_RE.search(company_lower)
+                    # Fall back to the company name as domain
+                    domain = _KNOWN_DOMAINS[m.group(0)] if m else company_lower.translate(_DROP_WHITESPACE) + ".com"
+                    companies = targets.setdefault(domain, [])
+                    if company not in companies:
+                        companies.append(company)
 
                 progress = st.progress(0, text="Findymail로 이메일 검색 중...")
-                total = len(prospects_to_search)
-
-                for i, prospect in enumerate(prospects_to_search):
-                    company = prospect["company"]
-                    domain = prospect["domain"]
-                    pct = min((i + 1) / max(total, 1), 0.95)
-                    progress.progress(pct, text=f"검색 중: {company} ({i+1}/{total})")
-
-                    try:
-                        # Use Hunter domain search to find people at this company
-                        if HUNTER_API_KEY:
-                            from hunter_client import HunterClient
-                            hunter = HunterClient()
-                            domain_result = hunter.search_domain(domain, limit=5)
-                            emails_data = domain_result.get("data", {}).get("emails", [])
-
-                            for person in emails_data:
-                                email = person.get("value", "")
-                                name = f"{person.get('first_name', '')} {person.get('last_name', '')}".strip()
-                                title = person.get("position", "")
-
-                                if email and name:
-                                    # Verify with Findymail for higher accuracy
-                                    try:
-                                        fm_result = fm.find_email(name, domain)
-                                        verified_email = fm_result.get("email", email)
-                                        is_verified = fm_result.get("verified", False)
-                                    except Exception:
-                                        verified_email = email
-                                        is_verified = False
-
-                                    db.add_prospect(
-                                        search_id=search_id,
-                                        contact_name=name,
-                                        email=verified_email,
-                                        company=company,
-                                        title=title,
-                                        email_confidence="verified" if is_verified else "high",
-                                        source="findymail+hunter",
-                                        source_data=json.dumps(person, ensure_ascii=False),
-                                    )
-                                    total_found += 1
+                total = len(targets)
+                hunter = HunterClient() if HUNTER_API_KEY else None
+
+                # Domains are I/O-bound lookups: run them on a pool, write on this thread
+                with ThreadPoolExecutor(max_workers=_COMPANY_LOOKUP_WORKERS) as pool:
+                    futures = {
+                        pool.submit(_lookup_domain_contacts, hunter, fm, domain): companies
+                        for domain, companies in targets.items()
+                    }
+                    for i, future in enumerate(as_completed(futures)):
+                        company = ", ".join(futures[future])
+                        pct = min((i + 1) / max(total, 1), 0.95)
+                        progress.progress(pct, text=f"검색 중: {company} ({i+1}/{total})")
 
-                    except Exception as e:
-                        logger.warning(f"Search failed for {company}: {e}")
+                        try:
+                            rows = [dict(row, company=c) for c in futures[future] for row in future.result()]
+                            # One transaction per domain instead of a commit per person
+                            total_found += db.add_prospects(search_id, rows)
+                        except Exception as e:
+                            logger.warning(f"Search failed for {company}: {e}")
 
-                    db.update_prospect_search(search_id, total_found=total_found)
+                        db.update_prospect_search(search_id, total_found=total_found)
 
                 progress.progress(1.0, text=f"완료! {total_found}명 발견")
                 db.update_prospect_search(search_id, status="completed",
@@ -2766,8 +3420,7 @@ elif page == "🔍 컨택 서칭":
         st.divider()
         st.subheader("이전 검색 기록")
         # Session state for delete confirmation
-        if "confirm_delete_search" not in st.session_state:
-            st.session_state.confirm_delete_search = None
+        st.session_state.setdefault("confirm_delete_search", None)
 
         prev_searches = db.get_prospect_searches()
         if prev_searches:
@@ -2809,22 +3462,19 @@ elif page == "🔍 컨택 서칭":
             st.warning("검색 결과가 없습니다.")
         else:
             search_info = db.get_prospect_search(search_id)
-            prospects = db.get_prospects(search_id=search_id)
+            df = _search_prospects_df(search_id)
 
             if search_info:
-                st.caption(f"검색: {search_info['name']} | 총 {len(prospects)}명 발견")
-
-            if prospects:
-                import pandas as pd
+                st.caption(f"검색: {search_info['name']} | 총 {len(df)}명 발견")
 
-                email_count = sum(1 for p in prospects if p.get("email"))
-                no_email_count = len(prospects) - email_count
+            if not df.empty:
+                email_count = int(_filled(df, "email").sum())
+                no_email_count = len(df) - email_count
                 m1, m2, m3 = st.columns(3)
-                m1.metric("총 인원", len(prospects))
+                m1.metric("총 인원", len(df))
                 m2.metric("이메일 있음", email_count)
                 m3.metric("이메일 없음", no_email_count)
 
-                df = pd.DataFrame(prospects)
                 display_cols = ["contact_name", "company", "title", "email", "linkedin_url", "location"]
                 display_cols = [c for c in display_cols if c in df.columns]
                 st.dataframe(df[display_cols], width="stretch", hide_index=True)
@@ -2837,7 +3487,7 @@ elif page == "🔍 컨택 서칭":
                 st.session_state.prospect_step = "search"
                 st.rerun()
         with col2:
-            if st.button("➡ 이메일 찾기", type="primary", disabled=not prospects if search_id else True):
+            if st.button("➡ 이메일 찾기", type="primary", disabled=df.empty if search_id else True):
                 st.session_state.prospect_step = "hunter"
                 st.rerun()
 
@@ -2845,10 +3495,11 @@ elif page == "🔍 컨택 서칭":
     elif st.session_state.prospect_step == "hunter":
         st.subheader("③ 이메일 찾기 (Hunter.io)")
         search_id = st.session_state.prospect_search_id
-        prospects = db.get_prospects(search_id=search_id) if search_id else []
+        prospects = _search_prospects(search_id)
+        df = _search_prospects_df(search_id)
 
-        has_email = sum(1 for p in prospects if p.get("email"))
-        missing_email = len(prospects) - has_email
+        has_email = int(_filled(df, "email").sum())
+        missing_email = len(df) - has_email
         m1, m2 = st.columns(2)
         m1.metric("이메일 있음", has_email)
         m2.metric("이메일 없음", missing_email)
@@ -2866,7 +3517,6 @@ elif page == "🔍 컨택 서칭":
                          disabled=not HUNTER_API_KEY or missing_email == 0):
                 with st.spinner(f"Hunter.io에서 {missing_email}명의 이메일 검색 중..."):
                     try:
-                        from hunter_client import HunterClient
                         hunter = HunterClient()
                         missing_prospects = db.get_prospects_missing_email(search_id)
                         results = hunter.batch_find_emails(missing_prospects,
@@ -2889,10 +3539,7 @@ elif page == "🔍 컨택 서칭":
                 st.rerun()
 
         # Show updated prospect table
-        prospects = db.get_prospects(search_id=search_id) if search_id else []
-        if prospects:
-            import pandas as pd
-            df = pd.DataFrame(prospects)
+        if not df.empty:
             display_cols = ["contact_name", "company", "title", "email", "email_confidence", "source"]
             display_cols = [c for c in display_cols if c in df.columns]
             st.dataframe(df[display_cols], width="stretch", hide_index=True)
@@ -2905,9 +3552,10 @@ elif page == "🔍 컨택 서칭":
     elif st.session_state.prospect_step == "research":
         st.subheader("④ 업계 리서치 (ClinicalTrials + PubMed)")
         search_id = st.session_state.prospect_search_id
-        prospects = db.get_prospects(search_id=search_id) if search_id else []
+        prospects = _search_prospects(search_id)
 
-        has_research = sum(1 for p in prospects if p.get("research_context"))
+        has_research = int(_filled(_search_prospects_df(search_id), "research_context").sum())
+        therapeutic_area = None
 
         if has_research > 0:
             st.success(f"{has_research}명에 대한 리서치 데이터 수집 완료")
@@ -2927,21 +3575,23 @@ elif page == "🔍 컨택 서칭":
                 if st.button("🔬 리서치 실행", type="primary"):
                     with st.spinner("ClinicalTrials.gov + PubMed 검색 중..."):
                         try:
-                            from research_client import ResearchClient
-                            research = ResearchClient()
+                            research = _rc()
                             unique_companies = list(set(
                                 p["company"] for p in prospects if p.get("company")
                             ))
-                            for company in unique_companies[:20]:
-                                ctx = research.get_company_research_context(
-                                    company=company,
-                                    therapeutic_area=therapeutic_area if 'therapeutic_area' in dir() else None,
-                                )
-                                for p in prospects:
-                                    if p.get("company", "").lower() == company.lower():
-                                        db.update_prospect(p["id"],
-                                            research_context=json.dumps(ctx, ensure_ascii=False, default=str)
-                                        )
+                            # Network-bound per company; PubMed calls stay paced by the client's shared limiter
+                            with ThreadPoolExecutor(max_workers=research.VERIFY_WORKERS) as pool:
+                                futures = {
+                                    pool.submit(research.get_company_research_context,
+                                                company=company,
+                                                therapeutic_area=therapeutic_area or None): company
+                                    for company in unique_companies[:20]
+                                }
+                                for future in as_completed(futures):
+                                    db.update_prospects_by_company(
+                                        search_id, futures[future],
+                                        research_context=json.dumps(future.result(), ensure_ascii=False, default=str),
+                                    )
                             st.success("리서치 데이터 수집 완료!")
                             st.rerun()
                         except Exception as e:
@@ -2952,18 +3602,13 @@ elif page == "🔍 컨택 서칭":
                 st.rerun()
 
         # Show research summaries per company
-        prospects = db.get_prospects(search_id=search_id) if search_id else []
-        shown_companies = set()
-        for p in prospects:
-            if p.get("research_context") and p["company"] not in shown_companies:
-                shown_companies.add(p["company"])
-                ctx = json.loads(p["research_context"])
-                with st.expander(f"📊 {p['company']}", expanded=False):
-                    st.markdown(ctx.get("summary", ""))
-                    if ctx.get("active_trials"):
-                        st.caption(f"Active trials: {len(ctx['active_trials'])}")
-                    if ctx.get("recent_publications"):
-                        st.caption(f"Recent publications: {len(ctx['recent_publications'])}")
+        for company, ctx in _company_research_contexts(search_id).items():
+            with st.expander(f"📊 {company}", expanded=False):
+                st.markdown(ctx.get("summary", ""))
+                if ctx.get("active_trials"):
+                    st.caption(f"Active trials: {len(ctx['active_trials'])}")
+                if ctx.get("recent_publications"):
+                    st.caption(f"Recent publications: {len(ctx['recent_publications'])}")
 
         if st.button("➡ AI 인리치먼트로", type="primary", key="research_next"):
             st.session_state.prospect_step = "enrich"
@@ -2974,17 +3619,23 @@ elif page == "🔍 컨택 서칭":
         st.subheader("⑤ AI 인리치먼트")
         search_id = st.session_state.prospect_search_id
         search_info = db.get_prospect_search(search_id) if search_id else None
-        prospects = db.get_prospects(search_id=search_id) if search_id else []
+        prospects = _search_prospects(search_id)
+        df = _search_prospects_df(search_id)
 
         # Check if already enriched
-        enriched_count = sum(1 for p in prospects if p.get("status") == "enriched")
+        enriched_count = int(df.reindex(columns=["status"])["status"].eq("enriched").sum())
+        _enrich_error = st.session_state.pop("_enrich_error", None)
         if enriched_count > 0:
             st.success(f"{enriched_count}/{len(prospects)}명 인리치먼트 완료")
+        elif _enrich_error:
+            st.error(f"인리치먼트 실패: {_enrich_error}")
+        elif st.session_state.get("_enrich_job"):
+            # Running on the worker pool; navigating away and back does not restart it
+            _poll_enrich_job()
         else:
-            with st.spinner("Claude가 이메일 추론 + 적합도 평가 중... (1~2분 소요)"):
+            with st.spinner("인리치먼트 준비 중..."):
                 try:
-                    from claude_client import ClaudeClient
-                    claude = ClaudeClient()
+                    claude = _claude()
 
                     search_params = json.loads(search_info["search_params"]) if search_info else {}
 
@@ -2994,14 +3645,10 @@ elif page == "🔍 컨택 서칭":
                     ]
 
                     # Build research_context from prospect data
-                    research_context_data = []
-                    seen_companies = set()
-                    for p in prospects:
-                        if p.get("research_context") and p["company"] not in seen_companies:
-                            seen_companies.add(p["company"])
-                            research_context_data.append(json.loads(p["research_context"]))
-
-                    enriched_text = claude.enrich_prospects(
+                    research_context_data = list(_company_research_contexts(search_id).values())
+
+                    future = _enrich_pool().submit(
+                        claude.enrich_prospects,
                         prospects_json=json.dumps(
                             [{"name": p["contact_name"], "email": p["email"],
                               "company": p["company"], "title": p["title"],
@@ -3014,22 +3661,16 @@ elif page == "🔍 컨택 서칭":
                         existing_emails_for_pattern=existing_emails,
                         research_context=research_context_data if research_context_data else None,
                     )
-
-                    # Apply enrichment
-                    from main import _apply_enrichment
-                    _apply_enrichment(search_id, enriched_text)
-                    db.update_prospect_search(search_id, total_enriched=len(prospects))
+                    st.session_state._enrich_job = {
+                        "future": future, "search_id": search_id, "count": len(prospects),
+                    }
                     st.rerun()
                 except Exception as e:
                     st.error(f"인리치먼트 실패: {e}")
                     logger.error(f"Enrichment failed: {e}")
 
         # Show enriched results
-        prospects = db.get_prospects(search_id=search_id) if search_id else []
-        if prospects:
-            import pandas as pd
-
-            df = pd.DataFrame(prospects)
+        if not df.empty:
             display_cols = ["contact_name", "company", "title", "email", "email_confidence",
                             "location"]
             display_cols = [c for c in display_cols if c in df.columns]
@@ -3064,7 +3705,6 @@ elif page == "🔍 컨택 서칭":
                 if st.button("✅ 이메일 검증 실행 (Hunter.io)"):
                     with st.spinner("이메일 검증 중..."):
                         try:
-                            from hunter_client import HunterClient
                             hunter = HunterClient()
                             emails = [p["email"] for p in unverified if p.get("email")]
                             results = hunter.batch_verify_emails(emails)
@@ -3086,11 +3726,9 @@ elif page == "🔍 컨택 서칭":
                             st.error(f"이메일 검증 실패: {e}")
             else:
                 # Show verification summary
-                all_p = db.get_prospects(search_id=search_id) if search_id else []
-                v_counts: dict = {}
-                for p in all_p:
-                    vs = p.get("verification_status") or "pending"
-                    v_counts[vs] = v_counts.get(vs, 0) + 1
+                df = _search_prospects_df(search_id)
+                vs = df.reindex(columns=["verification_status"])["verification_status"]
+                v_counts = vs.where(_filled(df, "verification_status"), "pending").value_counts().to_dict()
                 if any(k != "pending" for k in v_counts):
                     vcols = st.columns(4)
                     vcols[0].metric("Deliverable", v_counts.get("deliverable", 0))
@@ -3100,16 +3738,12 @@ elif page == "🔍 컨택 서칭":
 
         st.divider()
 
-        prospects = db.get_prospects(search_id=search_id) if search_id else []
-        prospects_with_email = [p for p in prospects if p.get("email")
-                                and p.get("verification_status") != "undeliverable"]
-
-        st.metric("내보내기 대상", f"{len(prospects_with_email)}명 (이메일 있는 건, undeliverable 제외)")
+        df = _search_prospects_df(search_id)
+        df = df[_filled(df, "email") & df.reindex(columns=["verification_status"])["verification_status"].ne("undeliverable")]
 
-        if prospects_with_email:
-            import pandas as pd
+        st.metric("내보내기 대상", f"{len(df)}명 (이메일 있는 건, undeliverable 제외)")
 
-            df = pd.DataFrame(prospects_with_email)
+        if not df.empty:
             display_cols = ["contact_name", "email", "company", "title", "email_confidence", "verification_status"]
             display_cols = [c for c in display_cols if c in df.columns]
             st.dataframe(df[display_cols], width="stretch", hide_index=True)
@@ -3122,7 +3756,8 @@ elif page == "🔍 컨택 서칭":
                 st.session_state.prospect_step = "enrich"
                 st.rerun()
         with col2:
-            csv_content = db.export_prospects_to_csv(search_id) if search_id else ""
+            # Rebuilt only when the search's prospects change, not on every rerun
+            csv_content = _cached_export_csv(search_id, db.get_prospects_version(search_id)) if search_id else ""
             if csv_content.strip():
                 today = datetime.now().strftime("%y%m%d")
                 st.download_button(
@@ -3149,16 +3784,11 @@ elif page == "📝 콜드메일":
     st.title("콜드메일 생성")
 
     # ── Mode selector ─────────────────────────────────
-    if "coldmail_mode" not in st.session_state:
-        st.session_state.coldmail_mode = "agent"
-    if "agent3_log" not in st.session_state:
-        st.session_state.agent3_log = []
-    if "agent3_drafts" not in st.session_state:
-        st.session_state.agent3_drafts = None
-    if "agent3_csv" not in st.session_state:
-        st.session_state.agent3_csv = None
-    if "agent3_campaign_id" not in st.session_state:
-        st.session_state.agent3_campaign_id = None
+    st.session_state.setdefault("coldmail_mode", "agent")
+    st.session_state.setdefault("agent3_log", [])
+    st.session_state.setdefault("agent3_drafts", None)
+    st.session_state.setdefault("agent3_csv", None)
+    st.session_state.setdefault("agent3_campaign_id", None)
 
     # Auto-switch to agent mode when coming from Agent 2
     _from_agent2 = st.session_state.get("a3_from_agent2")
@@ -3206,15 +3836,7 @@ elif page == "📝 콜드메일":
             # CTA type
             a3_cta = st.selectbox(
                 "CTA 유형",
-                [
-                    "자동 선택",
-                    "담당자 추천 요청 (기본)",
-                    "15분 대화 요청 (탐색형)",
-                    "피드백/의견 요청 (Design Partner)",
-                    "자료/인사이트 공유 제안",
-                    "Zoom/Web 미팅 제안",
-                    "직접 입력",
-                ],
+                _CTA_OPTIONS,
                 index=0,
                 key="a3_cta",
             )
@@ -3248,7 +3870,7 @@ elif page == "📝 콜드메일":
         _a2_csv = st.session_state.get("csv_data", "")
         if _from_agent2_sid and _a2_csv and _a2_csv.strip():
             # CSV 데이터에서 로드 (DB search_id 제한 없이 전체 결과)
-            _a2_rows = parse_csv_string(_a2_csv)
+            _a2_rows = _csv_data_rows()
             _a2_with_email = [r for r in _a2_rows if r.get("email")]
             st.success(
                 f"Agent 2 결과 자동 연결됨: "
@@ -3257,7 +3879,6 @@ elif page == "📝 콜드메일":
             a3_csv_text = _a2_csv
 
             if _a2_with_email:
-                import pandas as pd
                 df = pd.DataFrame(_a2_with_email)
                 display_cols = [c for c in ["contact_name", "email", "company", "title"] if c in df.columns]
                 st.dataframe(df[display_cols], use_container_width=True, height=300, hide_index=True)
@@ -3268,7 +3889,7 @@ elif page == "📝 콜드메일":
                 st.rerun()
         elif _from_agent2_sid:
             # CSV 없으면 DB fallback
-            _a2_prospects = db.get_prospects(search_id=_from_agent2_sid)
+            _a2_prospects = _search_prospects(_from_agent2_sid)
             _a2_with_email = [p for p in _a2_prospects if p.get("email")]
             st.success(
                 f"Agent 2 결과 (search_id={_from_agent2_sid}): "
@@ -3277,7 +3898,6 @@ elif page == "📝 콜드메일":
             a3_search_id = _from_agent2_sid
 
             if _a2_with_email:
-                import pandas as pd
                 df = pd.DataFrame(_a2_with_email)
                 display_cols = [c for c in ["contact_name", "email", "company", "title"] if c in df.columns]
                 st.dataframe(df[display_cols], use_container_width=True, height=300, hide_index=True)
@@ -3307,7 +3927,6 @@ elif page == "📝 콜드메일":
                     rows = parse_csv_string(a3_csv_text)
                     if rows:
                         st.success(f"{len(rows)}명 로드됨")
-                        import pandas as pd
                         st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
 
             with a3_src_tab2:
@@ -3326,11 +3945,10 @@ elif page == "📝 콜드메일":
                     )
                     a3_search_id = search_options[selected_search]
 
-                    prospects = db.get_prospects(search_id=a3_search_id)
+                    prospects = _search_prospects(a3_search_id)
                     email_prospects = [p for p in prospects if p.get("email")]
                     st.info(f"총 {len(prospects)}명 중 이메일 있는 연락처: {len(email_prospects)}명")
                     if email_prospects:
-                        import pandas as pd
                         df = pd.DataFrame(email_prospects)
                         display_cols = [c for c in ["contact_name", "email", "company", "title"] if c in df.columns]
                         st.dataframe(df[display_cols], width="stretch", hide_index=True)
@@ -3339,10 +3957,9 @@ elif page == "📝 콜드메일":
 
             with a3_src_tab3:
                 if st.session_state.csv_data:
-                    rows = parse_csv_string(st.session_state.csv_data)
+                    rows = _csv_data_rows()
                     if rows:
                         st.success(f"기존 CSV 데이터: {len(rows)}명")
-                        import pandas as pd
                         st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
                         a3_csv_text = st.session_state.csv_data
                 else:
@@ -3402,7 +4019,7 @@ elif page == "📝 콜드메일":
             if a3_csv_text:
                 _a3_total = max(a3_csv_text.count("\n") - 1, 1)
             elif a3_search_id:
-                _a3_prospects = db.get_prospects(a3_search_id)
+                _a3_prospects = _search_prospects(a3_search_id)
                 _a3_total = len([p for p in _a3_prospects if p.get("email")])
 
             # Build sender profile markdown from active sender
@@ -3430,8 +4047,6 @@ elif page == "📝 콜드메일":
             _task = st.session_state.pop("_pending_agent3")
             tracker = AgentProgressTracker("agent3", total_items=_task["total_items"])
             try:
-                from agent import ColdMailAgent
-
                 agent = ColdMailAgent(
                     language=_task["language"],
                     cta_type=_task["cta_type"],
@@ -3503,7 +4118,6 @@ elif page == "📝 콜드메일":
                 if st.session_state.agent3_campaign_id:
                     if st.button("📤 Google Sheets 업로드"):
                         try:
-                            from agent import ColdMailAgent
                             # Create a minimal agent just for upload
                             agent = ColdMailAgent(language=a3_language_code)
                             agent._campaign_id = st.session_state.agent3_campaign_id
@@ -3523,7 +4137,7 @@ elif page == "📝 콜드메일":
 
         # ── Agent log (full) ──────────────────────────────
         if st.session_state.agent3_log:
-            full_log3 = "\n".join(st.session_state.agent3_log)
+            full_log3 = _log_text("agent3_log")
             with st.expander(f"Agent 활동 로그 ({len(st.session_state.agent3_log)}건)", expanded=False):
                 st.code(full_log3, language=None)
                 st.download_button(
@@ -3672,7 +4286,6 @@ elif page == "📝 콜드메일":
             if rows:
                 st.success(f"{len(rows)}명의 연락처가 로드되었습니다.")
                 # Preview table
-                import pandas as pd
                 df = pd.DataFrame(rows)
                 display_cols = [c for c in ["contact_name", "email", "company", "title"] if c in df.columns]
                 if display_cols:
@@ -3724,8 +4337,7 @@ elif page == "📝 콜드메일":
             # Generate
             with st.spinner("Claude가 메일을 생성 중입니다... (1~2분 소요)"):
                 try:
-                    from claude_client import ClaudeClient
-                    claude = ClaudeClient()
+                    claude = _claude()
                     _manual_profile_id = st.session_state.get("active_profile_id")
                     _manual_feedback = db.get_combined_email_feedback_text(_manual_profile_id)
                     result = claude.generate_coldmail(
@@ -3770,7 +4382,6 @@ elif page == "📝 콜드메일":
             st.success("CSV 블록이 성공적으로 추출되었습니다.")
             rows = parse_csv_string(st.session_state.generated_csv)
             if rows:
-                import pandas as pd
                 df = pd.DataFrame(rows)
                 st.dataframe(df, width="stretch")
         else:
@@ -3801,8 +4412,7 @@ elif page == "📝 콜드메일":
         else:
             with st.spinner("Claude가 메일을 검수 중입니다... (1~2분 소요)"):
                 try:
-                    from claude_client import ClaudeClient
-                    claude = ClaudeClient()
+                    claude = _claude()
                     content = st.session_state.generated_md or ""
                     result = claude.review(content, auto_fix=True)
                     st.session_state.review_result = result
@@ -3895,8 +4505,6 @@ elif page == "📝 콜드메일":
 elif page == "📊 캠페인 현황":
     st.title("캠페인 현황")
 
-    import pandas as pd
-
     # ── 발송 대기 캠페인 (DB draft campaigns) ─────────────
     _draft_campaigns = []
     try:
@@ -3935,7 +4543,6 @@ elif page == "📊 캠페인 현황":
                         if st.button("📤 Google Sheets 업로드", key=f"sheet_upload_{dc_id}"):
                             with st.spinner("업로드 중..."):
                                 try:
-                                    from agent import ColdMailAgent
                                     agent = ColdMailAgent()
                                     agent._campaign_id = dc_id
                                     if csv_path and Path(csv_path).exists():
@@ -3953,7 +4560,6 @@ elif page == "📊 캠페인 현황":
                         if st.button("🚀 GMass 발송", key=f"gmass_send_{dc_id}", type="primary"):
                             st.warning("실제 이메일이 발송됩니다!")
                             try:
-                                from agent import ColdMailAgent
                                 agent = ColdMailAgent()
                                 agent._campaign_id = dc_id
                                 result = agent._send_gmass()
@@ -4248,8 +4854,7 @@ elif page == "💬 답장 작성":
     if st.button("✍️ 답장 생성", type="primary", disabled=not (received_mail and intent)):
         with st.spinner("Claude가 답장을 작성 중입니다..."):
             try:
-                from claude_client import ClaudeClient
-                claude = ClaudeClient()
+                claude = _claude()
 
                 # Build the reply skill prompt
                 skill_text = (DATA_DIR.parent / ".claude" / "skills" / "japan" / "reply" / "SKILL.md").read_text(encoding="utf-8")
@@ -4301,7 +4906,7 @@ elif page == "📚 스킬 목록":
 
     # ── Sender Profile Management ─────────────────────────
     with st.expander("👤 발신자 프로필 관리", expanded=False):
-        sender_profiles = db.get_sender_profiles()
+        sender_profiles = _load_senders()
 
         # Show existing profiles
         if sender_profiles:
@@ -4321,6 +4926,7 @@ elif page == "📚 스킬 목록":
                 with sp_col3:
                     if st.button("삭제", key=f"del_sender_{sp['id']}"):
                         db.delete_sender_profile(sp["id"])
+                        _load_senders.clear()
                         if st.session_state.get("active_sender_id") == sp["id"]:
                             st.session_state.active_sender_id = None
                             st.session_state.active_sender = None
@@ -4334,26 +4940,7 @@ elif page == "📚 스킬 목록":
         sp_md_path = DATA_DIR / "sender_profile.md"
         if sp_md_path.exists():
             if st.button("📥 sender_profile.md에서 가져오기", key="import_sender_md"):
-                md_text = sp_md_path.read_text(encoding="utf-8")
-                # Parse fields
-                field_map = {
-                    "이름 (영문)": "name_en", "이름 (일본어)": "name_ja",
-                    "직함 (영문)": "title_en", "직함 (일본어)": "title_ja",
-                    "회사명 (영문)": "company_en", "회사명 (일본어)": "company_ja",
-                    "이메일": "email", "전화번호": "phone",
-                }
-                parsed = {}
-                for label, key in field_map.items():
-                    m = re.search(rf"\*\*{re.escape(label)}\*\*:\s*(.+)", md_text)
-                    if m:
-                        parsed[key] = m.group(1).strip()
-                # Parse signature blocks
-                sig_blocks = re.findall(r"## 서명 \((.+?)\)\s*\n+```\n(.*?)```", md_text, re.DOTALL)
-                for sig_label, sig_body in sig_blocks:
-                    if "일본어" in sig_label:
-                        parsed["signature_ja"] = sig_body.strip()
-                    elif "영문" in sig_label:
-                        parsed["signature_en"] = sig_body.strip()
+                parsed = parse_sender_profile_md(sp_md_path.read_text(encoding="utf-8"))
                 # Build profile name from company + name
                 pname = f"{parsed.get('name_en', '')} ({parsed.get('company_en', '')})".strip()
                 if not pname or pname == "()":
@@ -4372,6 +4959,7 @@ elif page == "📚 스킬 목록":
                         signature_ja=parsed.get("signature_ja", ""),
                         signature_en=parsed.get("signature_en", ""),
                     )
+                    _load_senders.clear()
                     st.session_state.active_sender_id = new_id
                     st.session_state.active_sender = db.get_sender_profile(new_id)
                     st.success(f"'{pname}' 프로필을 가져와서 저장했습니다!")
@@ -4431,6 +5019,7 @@ elif page == "📚 스킬 목록":
                         signature_en=sp_sig_en.strip(),
                         extra_info=sp_extra.strip(),
                     )
+                    _load_senders.clear()
                     st.session_state.active_sender_id = new_sp_id
                     new_sp = db.get_sender_profile(new_sp_id)
                     st.session_state.active_sender = new_sp
@@ -4473,7 +5062,7 @@ elif page == "📚 스킬 목록":
                 if skill_name.startswith("_"):
                     continue
                 content = skill_path.read_text(encoding="utf-8")
-                desc_match = re.search(r'description:\s*["\'](.+?)["\']', content)
+                desc_match = _SKILL_DESC_RE.search(content)
                 description = desc_match.group(1) if desc_match else ""
                 folder_files[folder_key].append({
                     "type": "skill",
@@ -4604,8 +5193,7 @@ elif page == "📚 스킬 목록":
 
                         # Session state for preview
                         preview_key = f"preview_{selected['folder']}_{selected['name']}"
-                        if preview_key not in st.session_state:
-                            st.session_state[preview_key] = None
+                        st.session_state.setdefault(preview_key, None)
 
                         col_gen, col_clear = st.columns([1, 1])
 
@@ -4613,8 +5201,7 @@ elif page == "📚 스킬 목록":
                             if st.button("🔄 미리보기 생성", type="primary", disabled=not feedback):
                                 with st.spinner("Claude가 수정 중..."):
                                     try:
-                                        from claude_client import ClaudeClient
-                                        claude = ClaudeClient()
+                                        claude = _claude()
                                         modified = claude.edit_skill(content, feedback)
                                         st.session_state[preview_key] = modified
                                         st.rerun()
@@ -3,16 +3,68 @@ Database module - SQLite-based campaign and recipient state management.
 
 Tracks: campaigns, recipients, events (open/reply/bounce), followup stages.
 """
+import logging
 import sqlite3
+import threading
+import weakref
 from datetime import datetime
 from pathlib import Path
 from config import DB_PATH
 
+logger = logging.getLogger(__name__)
+
+_TLS = threading.local()
+# Connections handed back by finished threads. Streamlit runs every rerun on a
+# fresh thread, so without this each rerun would reconnect and redo the PRAGMAs.
+_IDLE: list[sqlite3.Connection] = []
+_IDLE_LOCK = threading.Lock()
+_IDLE_MAX = 4
+
+
+class _ThreadConnection(sqlite3.Connection):
+    """Connection reused for the lifetime of its thread.
+
+    close() is a no-op so the open/use/close pattern used throughout this
+    module keeps working; when the thread exits the handle goes back to the
+    idle pool (or is really closed if the pool is full).
+    """
+
+    def close(self):
+        pass
+
+
+class _Lease:
+    """Thread-local token whose finalizer returns the thread's connection."""
+    __slots__ = ("__weakref__",)
+
+
+def _release_connection(conn: sqlite3.Connection):
+    if conn.in_transaction:
+        conn.rollback()
+    with _IDLE_LOCK:
+        if len(_IDLE) < _IDLE_MAX:
+            _IDLE.append(conn)
+            return
+    sqlite3.Connection.close(conn)
+
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    conn = getattr(_TLS, "conn", None)
+    if conn is None:
+        with _IDLE_LOCK:
+            conn = _IDLE.pop() if _IDLE else None
+        if conn is None:
+            # Only one thread uses a connection at a time; it may be a later thread
+            conn = sqlite3.connect(str(DB_PATH), factory=_ThreadConnection, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        _TLS.conn = conn
+        _TLS.lease = _Lease()
+        weakref.finalize(_TLS.lease, _release_connection, conn)
+    elif conn.in_transaction:
+        # A previous caller failed before commit; don't keep holding the write lock
+        conn.rollback()
     return conn
 
 
@@ -74,6 +126,7 @@ def init_db():
 
         CREATE INDEX IF NOT EXISTS idx_recipients_campaign ON recipients(campaign_id);
         CREATE INDEX IF NOT EXISTS idx_recipients_status ON recipients(status);
+        CREATE INDEX IF NOT EXISTS idx_recipients_email ON recipients(email);
         CREATE INDEX IF NOT EXISTS idx_events_recipient ON events(recipient_id);
         CREATE INDEX IF NOT EXISTS idx_followups_scheduled ON followups(scheduled_at);
 
@@ -112,6 +165,8 @@ def init_db():
         CREATE INDEX IF NOT EXISTS idx_prospects_search ON prospects(search_id);
         CREATE INDEX IF NOT EXISTS idx_prospects_email ON prospects(email);
         CREATE INDEX IF NOT EXISTS idx_prospects_company ON prospects(company);
+        CREATE INDEX IF NOT EXISTS idx_prospects_search_company_ci
+            ON prospects(search_id, lower(company));
         CREATE UNIQUE INDEX IF NOT EXISTS idx_prospects_dedup ON prospects(email, company)
             WHERE email IS NOT NULL AND email != '';
 
@@ -129,6 +184,12 @@ def init_db():
         CREATE INDEX IF NOT EXISTS idx_verifications_prospect ON email_verifications(prospect_id);
         CREATE INDEX IF NOT EXISTS idx_verifications_email ON email_verifications(email);
 
+        CREATE TABLE IF NOT EXISTS hunter_domain_cache (
+            domain          TEXT PRIMARY KEY,
+            payload         TEXT NOT NULL,
+            fetched_at      TEXT DEFAULT (datetime('now'))
+        );
+
         CREATE TABLE IF NOT EXISTS search_presets (
             id              INTEGER PRIMARY KEY AUTOINCREMENT,
             name            TEXT NOT NULL UNIQUE,
@@ -242,12 +303,22 @@ def init_db():
         ("search_presets", "preset_type", "TEXT DEFAULT 'company'"),
         ("search_presets", "institutions", "TEXT"),
         ("search_presets", "research_areas", "TEXT"),
+        ("search_presets", "company_count", "INTEGER"),
     ]
     for table, column, col_type in _migration_columns:
         try:
             conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
         except sqlite3.OperationalError:
             pass  # column already exists
+    # Backfill company_count for presets saved before the column existed
+    uncounted = conn.execute(
+        "SELECT id, companies FROM search_presets WHERE company_count IS NULL"
+    ).fetchall()
+    if uncounted:
+        conn.executemany(
+            "UPDATE search_presets SET company_count = ? WHERE id = ?",
+            [(_count_companies(r["companies"]), r["id"]) for r in uncounted],
+        )
     conn.commit()
     conn.close()
 
@@ -418,6 +489,48 @@ def delete_campaign_profile(profile_id: int):
 
 # ── Search Presets CRUD ──────────────────────────────────
 
+_UPSERT_PRESET_SQL = """
+    INSERT INTO search_presets
+        (name, industry, titles, locations, companies, company_count, keywords,
+         max_results, feedback_hash, product_description, target_hint, target_region,
+         preset_type, institutions, research_areas)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        industry=excluded.industry, titles=excluded.titles,
+        locations=excluded.locations, companies=excluded.companies,
+        company_count=excluded.company_count,
+        keywords=excluded.keywords, max_results=excluded.max_results,
+        feedback_hash=excluded.feedback_hash,
+        product_description=excluded.product_description,
+        target_hint=excluded.target_hint,
+        target_region=excluded.target_region,
+        preset_type=excluded.preset_type,
+        institutions=excluded.institutions,
+        research_areas=excluded.research_areas,
+        updated_at=datetime('now')
+"""
+
+
+def _count_companies(companies: str | None) -> int:
+    """Number of non-blank names in a comma-separated companies string."""
+    return sum(1 for c in (companies or "").split(",") if c.strip())
+
+
+def _preset_row(name: str, industry: str = "", titles: str = "",
+                locations: str = "", companies: str = "",
+                keywords: str = "", max_results: int = 100,
+                feedback_hash: str = "",
+                product_description: str = "",
+                target_hint: str = "",
+                target_region: str = "",
+                preset_type: str = "company",
+                institutions: str = "",
+                research_areas: str = "") -> tuple:
+    return (name, industry, titles, locations, companies, _count_companies(companies), keywords,
+            max_results, feedback_hash, product_description, target_hint, target_region,
+            preset_type, institutions, research_areas)
+
+
 def save_preset(name: str, industry: str = "", titles: str = "",
                 locations: str = "", companies: str = "",
                 keywords: str = "", max_results: int = 100,
@@ -429,33 +542,26 @@ def save_preset(name: str, industry: str = "", titles: str = "",
                 institutions: str = "",
                 research_areas: str = "") -> int:
     conn = get_connection()
-    cur = conn.execute("""
-        INSERT INTO search_presets
-            (name, industry, titles, locations, companies, keywords,
-             max_results, feedback_hash, product_description, target_hint, target_region,
-             preset_type, institutions, research_areas)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(name) DO UPDATE SET
-            industry=excluded.industry, titles=excluded.titles,
-            locations=excluded.locations, companies=excluded.companies,
-            keywords=excluded.keywords, max_results=excluded.max_results,
-            feedback_hash=excluded.feedback_hash,
-            product_description=excluded.product_description,
-            target_hint=excluded.target_hint,
-            target_region=excluded.target_region,
-            preset_type=excluded.preset_type,
-            institutions=excluded.institutions,
-            research_areas=excluded.research_areas,
-            updated_at=datetime('now')
-    """, (name, industry, titles, locations, companies, keywords,
-          max_results, feedback_hash, product_description, target_hint, target_region,
-          preset_type, institutions, research_areas))
+    cur = conn.execute(_UPSERT_PRESET_SQL, _preset_row(
+        name, industry, titles, locations, companies, keywords,
+        max_results, feedback_hash, product_description, target_hint, target_region,
+        preset_type, institutions, research_areas))
     conn.commit()
     preset_id = cur.lastrowid
     conn.close()
     return preset_id
 
 
+def save_presets(presets: list[dict]):
+    """Upsert several presets (save_preset keyword dicts) in one transaction."""
+    if not presets:
+        return
+    conn = get_connection()
+    conn.executemany(_UPSERT_PRESET_SQL, [_preset_row(**p) for p in presets])
+    conn.commit()
+    conn.close()
+
+
 def get_presets() -> list[dict]:
     conn = get_connection()
     rows = conn.execute("SELECT * FROM search_presets ORDER BY name").fetchall()
@@ -490,6 +596,25 @@ def add_target_feedback(
     return fid
 
 
+def add_target_feedback_scopes(
+    feedback: str,
+    profile_ids: list[int | None],
+    product_summary: str = "",
+):
+    """Add the same feedback entry to several scopes (None → global) in one transaction."""
+    if not profile_ids:
+        return
+    text = feedback.strip()
+    conn = get_connection()
+    conn.executemany(
+        """INSERT INTO target_feedback (profile_id, feedback, product_summary)
+           VALUES (?, ?, ?)""",
+        [(pid, text, product_summary) for pid in profile_ids],
+    )
+    conn.commit()
+    conn.close()
+
+
 def get_target_feedback(profile_id: int | None = None) -> list[dict]:
     """Get feedback entries for a specific profile (or global if None)."""
     conn = get_connection()
@@ -850,6 +975,23 @@ def delete_prospect_search(search_id: int):
 
 # ── Prospect CRUD ────────────────────────────────────────
 
+_INSERT_PROSPECT_SQL = """
+    INSERT OR IGNORE INTO prospects
+        (search_id, contact_name, email, company, title, linkedin_url,
+         location, fit_score, fit_reason, email_confidence, source, source_data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _prospect_row(search_id: int, contact_name: str, email: str, company: str,
+                  title: str, linkedin_url: str = "", location: str = "",
+                  email_confidence: str = "unknown", source: str = "apollo",
+                  source_data: str = "",
+                  fit_score: float = 0, fit_reason: str = "") -> tuple:
+    return (search_id, contact_name, email, company, title, linkedin_url,
+            location, fit_score, fit_reason, email_confidence, source, source_data)
+
+
 def add_prospect(search_id: int, contact_name: str, email: str, company: str,
                  title: str, linkedin_url: str = "", location: str = "",
                  email_confidence: str = "unknown", source: str = "apollo",
@@ -858,14 +1000,9 @@ def add_prospect(search_id: int, contact_name: str, email: str, company: str,
     """Add a prospect, skipping if duplicate email+company exists."""
     conn = get_connection()
     try:
-        cur = conn.execute(
-            """INSERT OR IGNORE INTO prospects
-               (search_id, contact_name, email, company, title, linkedin_url,
-                location, fit_score, fit_reason, email_confidence, source, source_data)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (search_id, contact_name, email, company, title, linkedin_url,
-             location, fit_score, fit_reason, email_confidence, source, source_data),
-        )
+        cur = conn.execute(_INSERT_PROSPECT_SQL, _prospect_row(
+            search_id, contact_name, email, company, title, linkedin_url,
+            location, email_confidence, source, source_data, fit_score, fit_reason))
         conn.commit()
         pid = cur.lastrowid if cur.rowcount > 0 else None
     except Exception:
@@ -874,6 +1011,28 @@ def add_prospect(search_id: int, contact_name: str, email: str, company: str,
     return pid
 
 
+def add_prospects(search_id: int, prospects: list[dict]) -> int:
+    """Add several prospects (add_prospect keyword dicts) in one transaction.
+
+    Duplicates are skipped as in add_prospect. Returns the number of rows inserted.
+    """
+    if not prospects:
+        return 0
+    conn = get_connection()
+    before = conn.total_changes
+    try:
+        conn.executemany(_INSERT_PROSPECT_SQL,
+                         [_prospect_row(search_id, **p) for p in prospects])
+        conn.commit()
+        added = conn.total_changes - before
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"Bulk insert of {len(prospects)} prospects for search {search_id} failed: {e}")
+        added = 0
+    conn.close()
+    return added
+
+
 def get_prospects(search_id: int | None = None, status: str | None = None,
                   min_fit_score: float | None = None) -> list[dict]:
     conn = get_connection()
@@ -891,6 +1050,21 @@ def get_prospects(search_id: int | None = None, status: str | None = None,
     return [dict(r) for r in rows]
 
 
+def get_prospects_version(search_id: int) -> tuple:
+    """Cheap change marker for a search's prospects: (count, max id, last update).
+
+    Every insert raises the id, every delete lowers the count and every update
+    path stamps updated_at, so the tuple changes whenever get_prospects would.
+    """
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT COUNT(*), MAX(id), MAX(updated_at) FROM prospects WHERE search_id = ?",
+        (search_id,),
+    ).fetchone()
+    conn.close()
+    return tuple(row)
+
+
 def update_prospect(prospect_id: int, **kwargs):
     conn = get_connection()
     kwargs["updated_at"] = datetime.now().isoformat()
@@ -904,6 +1078,20 @@ def update_prospect(prospect_id: int, **kwargs):
     conn.close()
 
 
+def update_prospects_by_company(search_id: int, company: str, **kwargs):
+    """Set the same fields on every prospect of a search at company (case-insensitive)."""
+    conn = get_connection()
+    kwargs["updated_at"] = datetime.now().isoformat()
+    sets = ", ".join(f"{k} = ?" for k in kwargs)
+    vals = list(kwargs.values()) + [search_id, company]
+    conn.execute(
+        f"UPDATE prospects SET {sets} WHERE search_id = ? AND lower(company) = lower(?)",
+        vals,
+    )
+    conn.commit()
+    conn.close()
+
+
 def get_prospects_missing_email(search_id: int) -> list[dict]:
     """Get prospects that have no email (for Hunter.io lookup)."""
     conn = get_connection()
@@ -947,6 +1135,35 @@ def add_email_verification(prospect_id: int, email: str, status: str,
     return vid
 
 
+HUNTER_DOMAIN_TTL_DAYS = 7
+
+
+def get_cached_hunter_domain(domain: str) -> dict | None:
+    """Hunter search_domain response for domain if fetched within the TTL, else None."""
+    import json as _json
+    conn = get_connection()
+    row = conn.execute(
+        """SELECT payload FROM hunter_domain_cache
+           WHERE domain = ? AND fetched_at > datetime('now', ?)""",
+        (domain.lower(), f"-{HUNTER_DOMAIN_TTL_DAYS} days"),
+    ).fetchone()
+    conn.close()
+    return _json.loads(row["payload"]) if row else None
+
+
+def put_cached_hunter_domain(domain: str, payload: dict):
+    """Store (or refresh) a Hunter search_domain response for domain."""
+    import json as _json
+    conn = get_connection()
+    conn.execute(
+        """INSERT OR REPLACE INTO hunter_domain_cache (domain, payload, fetched_at)
+           VALUES (?, ?, datetime('now'))""",
+        (domain.lower(), _json.dumps(payload, ensure_ascii=False)),
+    )
+    conn.commit()
+    conn.close()
+
+
 def export_prospects_to_csv(search_id: int, min_fit_score: float = 0) -> str:
     """Export prospects as CSV string ready for /coldmail pipeline."""
     import io
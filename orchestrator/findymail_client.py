@@ -34,6 +34,9 @@ class FindymailClient:
         self.api_key = api_key or FINDYMAIL_API_KEY
         if not self.api_key:
             raise ValueError("FINDYMAIL_API_KEY not set. Add it to .env")
+        # Keep-alive across calls (and batch threads) instead of a new TLS handshake each time
+        self._session = requests.Session()
+        self._session.headers.update(self._headers())
 
     def _headers(self) -> dict:
         return {
@@ -47,10 +50,9 @@ class FindymailClient:
         delay = self.INITIAL_DELAY
         for attempt in range(self.MAX_RETRIES):
             try:
-                resp = requests.post(
+                resp = self._session.post(
                     f"{self.BASE_URL}{path}",
                     json=data,
-                    headers=self._headers(),
                     timeout=30,
                 )
                 if resp.status_code == 429:
@@ -74,9 +76,8 @@ class FindymailClient:
 
     def _get(self, path: str) -> dict:
         """GET request (for credits check)."""
-        resp = requests.get(
+        resp = self._session.get(
             f"{self.BASE_URL}{path}",
-            headers=self._headers(),
             timeout=15,
         )
         resp.raise_for_status()
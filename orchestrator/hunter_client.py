@@ -6,6 +6,7 @@ All endpoints: GET https://api.hunter.io/v2/...
 Auth: api_key query param.
 """
 import logging
+import re
 import time
 import requests
 from config import HUNTER_API_KEY
@@ -232,6 +233,10 @@ _KNOWN_DOMAINS = {
     "biogen": "biogen.com",
     "vertex": "vrtx.com",
 }
+# One scan for any known key in a lowercased company name (longest keys first)
+_KNOWN_DOMAINS_RE = re.compile(
+    "|".join(map(re.escape, sorted(_KNOWN_DOMAINS, key=len, reverse=True)))
+)
 
 
 def _build_domain_map(prospects: list[dict]) -> dict[str, str]:
@@ -303,8 +308,5 @@ def _infer_domain(company: str, source_data: str | None = None,
             pass
 
     # 3) Hardcoded known domains
-    for key, domain in _KNOWN_DOMAINS.items():
-        if key in company_lower:
-            return domain
-
-    return ""
+    m = _KNOWN_DOMAINS_RE.search(company_lower)
+    return _KNOWN_DOMAINS[m.group(0)] if m else ""
@@ -357,10 +357,10 @@ def prospect_search(
     db.update_prospect_search(search_id, total_found=len(all_people))
 
     # Store raw results in DB
+    rows = []
     for person in all_people:
         normalized = ApolloClient.normalize_person(person)
-        db.add_prospect(
-            search_id=search_id,
+        rows.append(dict(
             contact_name=normalized["contact_name"],
             email=normalized.get("email", ""),
             company=normalized.get("company", ""),
@@ -370,7 +370,8 @@ def prospect_search(
             email_confidence="verified" if normalized.get("email") else "unknown",
             source="apollo",
             source_data=json.dumps(person, ensure_ascii=False, default=str),
-        )
+        ))
+    db.add_prospects(search_id, rows)
 
     # ── Phase 2: Hunter.io email lookup ────────────────
     if hunter_lookup and HUNTER_API_KEY and all_people:
@@ -422,14 +423,10 @@ def prospect_search(
             if ctx.get("active_trials") or ctx.get("recent_publications"):
                 research_context_data.append(ctx)
                 # Store on each prospect record for that company
-                prospects_at_company = [
-                    p for p in db.get_prospects(search_id=search_id)
-                    if p.get("company", "").lower() == company.lower()
-                ]
-                for p in prospects_at_company:
-                    db.update_prospect(p["id"],
-                        research_context=json.dumps(ctx, ensure_ascii=False, default=str)
-                    )
+                db.update_prospects_by_company(
+                    search_id, company,
+                    research_context=json.dumps(ctx, ensure_ascii=False, default=str),
+                )
 
         logger.info(f"  Research data collected for {len(research_context_data)}/{len(unique_companies)} companies")
         db.update_prospect_search(search_id, research_completed=1)
@@ -9,7 +9,10 @@ Provides supplementary data for Claude enrichment:
 No API keys required. Rate limits: ClinicalTrials not restricted, PubMed 3 req/sec.
 """
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
 
 logger = logging.getLogger(__name__)
@@ -18,6 +21,12 @@ logger = logging.getLogger(__name__)
 class ResearchClient:
     CT_BASE_URL = "https://clinicaltrials.gov/api/v2"
     PUBMED_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+    VERIFY_WORKERS = 4  # concurrent verifications; PubMed calls are paced by _pubmed_get
+    PUBMED_MIN_INTERVAL = 0.34  # seconds between PubMed requests (3 req/sec without an API key)
+
+    # Shared by every instance and thread, so parallel workers can't exceed the limit
+    _pubmed_lock = threading.Lock()
+    _pubmed_next = 0.0
 
     def __init__(self):
         pass
@@ -35,6 +44,17 @@ class ResearchClient:
             return resp.json()
         raise Exception(f"Research API failed after {max_retries} retries")
 
+    def _pubmed_get(self, path: str, params: dict) -> dict:
+        """_get against PubMed E-utilities, spaced PUBMED_MIN_INTERVAL apart process-wide."""
+        cls = ResearchClient
+        with cls._pubmed_lock:
+            now = time.monotonic()
+            slot = max(now, cls._pubmed_next)
+            cls._pubmed_next = slot + self.PUBMED_MIN_INTERVAL
+        if slot > now:
+            time.sleep(slot - now)
+        return self._get(f"{self.PUBMED_BASE_URL}{path}", params)
+
     # ── ClinicalTrials.gov v2 ────────────────────────────
 
     def search_trials(
@@ -120,14 +140,13 @@ class ResearchClient:
         term = " AND ".join(term_parts)
 
         try:
-            result = self._get(f"{self.PUBMED_BASE_URL}/esearch.fcgi", {
+            result = self._pubmed_get("/esearch.fcgi", {
                 "db": "pubmed",
                 "term": term,
                 "retmax": max_results,
                 "retmode": "json",
                 "sort": "date",
             })
-            time.sleep(0.4)  # 3 req/sec limit
             return result.get("esearchresult", {}).get("idlist", [])
         except Exception as e:
             logger.warning(f"PubMed search failed: {e}")
@@ -139,12 +158,11 @@ class ResearchClient:
             return []
 
         try:
-            result = self._get(f"{self.PUBMED_BASE_URL}/esummary.fcgi", {
+            result = self._pubmed_get("/esummary.fcgi", {
                 "db": "pubmed",
                 "id": ",".join(pmids[:50]),
                 "retmode": "json",
             })
-            time.sleep(0.4)
 
             summaries = []
             uid_list = result.get("result", {}).get("uids", [])
@@ -450,6 +468,22 @@ class ResearchClient:
             "status": status,
         }
 
+    def iter_verify_companies(self, companies: list[dict], max_workers: int = VERIFY_WORKERS):
+        """Verify companies concurrently, yielding (index, result) as each one finishes.
+
+        Results are {**company, "verification": {...}}; index is the position in
+        `companies`, since completion order differs from input order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self.verify_company, c.get("name", ""),
+                            c.get("evidence", ""), c.get("reason", "")): i
+                for i, c in enumerate(companies)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                yield i, {**companies[i], "verification": future.result()}
+
     def verify_companies_batch(
         self,
         companies: list[dict],
@@ -459,27 +493,16 @@ class ResearchClient:
 
         Args:
             companies: list of {name, reason, evidence} dicts from AI output
-            progress_callback: optional callable(current, total, company_name)
+            progress_callback: optional callable(completed, total, company_name)
 
         Returns: list of verification results with original + verification data
         """
-        results = []
         total = len(companies)
-        for i, company in enumerate(companies):
-            name = company.get("name", "")
+        results = [None] * total
+        for done, (i, result) in enumerate(self.iter_verify_companies(companies), 1):
+            results[i] = result
             if progress_callback:
-                progress_callback(i, total, name)
-
-            verification = self.verify_company(
-                name, company.get("evidence", ""), company.get("reason", "")
-            )
-            results.append({
-                **company,
-                "verification": verification,
-            })
-
-        if progress_callback:
-            progress_callback(total, total, "완료")
+                progress_callback(done, total, result.get("name", ""))
 
         return results
 
@@ -521,14 +544,13 @@ class ResearchClient:
         publications = []
         pub_topics = []
         try:
-            result = self._get(f"{self.PUBMED_BASE_URL}/esearch.fcgi", {
+            result = self._pubmed_get("/esearch.fcgi", {
                 "db": "pubmed",
                 "term": pubmed_term,
                 "retmax": 10,
                 "retmode": "json",
                 "sort": "date",
             })
-            time.sleep(0.4)
             pmids = result.get("esearchresult", {}).get("idlist", [])
             if pmids:
                 publications = self.fetch_pubmed_summaries(pmids)
@@ -585,6 +607,18 @@ class ResearchClient:
             "status": status,
         }
 
+    def iter_verify_researchers(self, researchers: list[dict], max_workers: int = VERIFY_WORKERS):
+        """Verify researchers concurrently, yielding (index, result) as each one finishes."""
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self.verify_researcher, r.get("name", ""), r.get("institution", ""),
+                            r.get("research_area", ""), r.get("evidence", "")): i
+                for i, r in enumerate(researchers)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                yield i, {**researchers[i], "verification": future.result()}
+
     def verify_researchers_batch(
         self,
         researchers: list[dict],
@@ -594,29 +628,15 @@ class ResearchClient:
 
         Args:
             researchers: list of {name, institution, research_area, evidence, ...}
-            progress_callback: optional callable(current, total, researcher_name)
+            progress_callback: optional callable(completed, total, researcher_name)
 
         Returns: list of researcher dicts with verification data added
         """
-        results = []
         total = len(researchers)
-        for i, researcher in enumerate(researchers):
-            name = researcher.get("name", "")
+        results = [None] * total
+        for done, (i, result) in enumerate(self.iter_verify_researchers(researchers), 1):
+            results[i] = result
             if progress_callback:
-                progress_callback(i, total, name)
-
-            verification = self.verify_researcher(
-                name,
-                researcher.get("institution", ""),
-                researcher.get("research_area", ""),
-                researcher.get("evidence", ""),
-            )
-            results.append({
-                **researcher,
-                "verification": verification,
-            })
-
-        if progress_callback:
-            progress_callback(total, total, "완료")
+                progress_callback(done, total, result.get("name", ""))
 
         return results